@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Async Read-Only API for Flavi Dairy Forecasting AI
+Serves the read endpoints of the main app from an aiohttp application backed
+by an asyncpg connection pool, so one process handles many concurrent
+I/O-bound reads (ERP polling) instead of one request per sync worker:
+
+    GET /api/skus
+    GET /api/sales/<sku_id>
+    GET /api/inventory/<sku_id>
+
+Requests are authenticated with the main app's Flask session cookie (log in
+through ``/login`` as usual); the JSON matches the sync endpoints. SQLite
+databases are served through a thread for development only.
+
+Usage:
+    python async_api.py --port 8001
+    gunicorn async_api:app_factory --worker-class aiohttp.GunicornWebWorker --workers 2
+
+Compare against the sync path with ``load_test.py --mix api`` (see there).
+"""
+
+import os
+import re
+import sys
+import json
+import asyncio
+import sqlite3
+import argparse
+import logging
+from datetime import date, datetime
+from decimal import Decimal
+
+from aiohttp import web
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from config import Config
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+SKUS_SQL = """
+    SELECT id, sku_id, name, category, processing_time_hours, packaging_time_hours,
+           storage_requirement_cubic_meters, min_threshold
+      FROM sku
+     ORDER BY sku_id
+"""
+
+SALES_SQL = """
+    SELECT id, sku_id, customer_id, quantity_sold, amount, date
+      FROM sales
+     WHERE sku_id = :sku_id
+     ORDER BY date
+"""
+
+# End-of-day stock history from the inventory ledger, one row per day with
+# movements: every SKU's movements (opening balance included) sum to its
+# level, joined to the settings in effect that day
+INVENTORY_SQL = """
+    SELECT d.sku_id,
+           SUM(d.quantity) OVER (ORDER BY d.date) AS current_level,
+           s.production_batch_size, s.shelf_life_days, s.storage_capacity_units,
+           d.date
+      FROM (SELECT sku_id, movement_date AS date, SUM(quantity) AS quantity
+              FROM inventory_movements
+             WHERE sku_id = :sku_id
+             GROUP BY sku_id, movement_date) d
+      LEFT JOIN inventory_settings s
+        ON s.sku_id = d.sku_id
+       AND s.effective_date = (SELECT MAX(effective_date) FROM inventory_settings
+                                WHERE sku_id = d.sku_id AND effective_date <= d.date)
+     ORDER BY d.date
+"""
+
+_NAMED_PARAM = re.compile(r'(?<![:\w]):(\w+)')
+
+DATABASE_KEY = web.AppKey('database', object)
+SESSION_READER_KEY = web.AppKey('session_reader', object)
+
+
+class PostgresDatabase:
+    """Queries through an asyncpg pool (``:name`` parameters become ``$n``)."""
+
+    def __init__(self, url, min_size, max_size):
+        # asyncpg takes a plain libpq URL, without the SQLAlchemy driver suffix
+        self.dsn = re.sub(r'^postgres(ql)?(\+\w+)?://', 'postgresql://', url)
+        self.min_size = min_size
+        self.max_size = max_size
+        self.pool = None
+
+    async def open(self):
+        import asyncpg
+
+        self.pool = await asyncpg.create_pool(self.dsn, min_size=self.min_size, max_size=self.max_size,
+                                              command_timeout=30)
+
+    async def close(self):
+        if self.pool is not None:
+            await self.pool.close()
+
+    async def fetch(self, sql, params=None):
+        names = []
+
+        def number(match):
+            names.append(match.group(1))
+            return f'${len(names)}'
+
+        query = _NAMED_PARAM.sub(number, sql)
+        async with self.pool.acquire() as conn:
+            rows = await conn.fetch(query, *[(params or {})[name] for name in names])
+        return [dict(row) for row in rows]
+
+
+class SQLiteDatabase:
+    """Development fallback: each query runs on a worker thread with its own connection."""
+
+    def __init__(self, path):
+        self.path = path
+
+    async def open(self):
+        pass
+
+    async def close(self):
+        pass
+
+    def _fetch(self, sql, params):
+        conn = sqlite3.connect(self.path)
+        try:
+            conn.row_factory = sqlite3.Row
+            return [dict(row) for row in conn.execute(sql, params or {})]
+        finally:
+            conn.close()
+
+    async def fetch(self, sql, params=None):
+        return await asyncio.to_thread(self._fetch, sql, params)
+
+
+def create_database(url=None):
+    """Database backend for ``url`` (default: ``SQLALCHEMY_DATABASE_URI``)."""
+    url = url or Config.SQLALCHEMY_DATABASE_URI
+    if url.startswith('sqlite:///'):
+        return SQLiteDatabase(url[len('sqlite:///'):])
+    if url.startswith('postgres'):
+        return PostgresDatabase(url, Config.ASYNC_API_POOL_MIN_SIZE, Config.ASYNC_API_POOL_MAX_SIZE)
+    raise ValueError(f"Unsupported database for the async API: {url.split(':', 1)[0]}")
+
+
+def _session_reader():
+    """Return a function decoding the main app's signed session cookie (None if invalid)."""
+    from flask import Flask
+    from flask.sessions import SecureCookieSessionInterface
+
+    flask_app = Flask(__name__)
+    flask_app.config.from_object(Config)
+    serializer = SecureCookieSessionInterface().get_signing_serializer(flask_app)
+    cookie_name = flask_app.config['SESSION_COOKIE_NAME']
+    max_age = int(flask_app.permanent_session_lifetime.total_seconds())
+
+    def read(cookies):
+        cookie = cookies.get(cookie_name)
+        if not cookie:
+            return None
+        try:
+            return serializer.loads(cookie, max_age=max_age)
+        except Exception:
+            return None
+
+    return read
+
+
+def _json_default(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _json_response(data):
+    return web.json_response(data, dumps=lambda obj: json.dumps(obj, default=_json_default))
+
+
+@web.middleware
+async def require_login(request, handler):
+    """Reject requests without a valid Flask-Login session cookie."""
+    session = request.app[SESSION_READER_KEY](request.cookies)
+    if not session or not session.get('_user_id'):
+        return web.json_response({'error': 'authentication required'}, status=401)
+    return await handler(request)
+
+
+async def list_skus(request):
+    """GET /api/skus"""
+    return _json_response(await request.app[DATABASE_KEY].fetch(SKUS_SQL))
+
+
+async def sales_for_sku(request):
+    """GET /api/sales/<sku_id>"""
+    rows = await request.app[DATABASE_KEY].fetch(SALES_SQL, {'sku_id': request.match_info['sku_id']})
+    return _json_response(rows)
+
+
+async def inventory_for_sku(request):
+    """GET /api/inventory/<sku_id>"""
+    rows = await request.app[DATABASE_KEY].fetch(INVENTORY_SQL, {'sku_id': request.match_info['sku_id']})
+    return _json_response(rows)
+
+
+async def _open_database(app):
+    await app[DATABASE_KEY].open()
+    yield
+    await app[DATABASE_KEY].close()
+
+
+def create_app(database_url=None):
+    """Build the aiohttp application; the pool opens on start-up."""
+    app = web.Application(middlewares=[require_login])
+    app[DATABASE_KEY] = create_database(database_url)
+    app[SESSION_READER_KEY] = _session_reader()
+    app.cleanup_ctx.append(_open_database)
+    app.router.add_get('/api/skus', list_skus)
+    app.router.add_get('/api/sales/{sku_id}', sales_for_sku)
+    app.router.add_get('/api/inventory/{sku_id}', inventory_for_sku)
+    return app
+
+
+async def app_factory():
+    """Entry point for ``gunicorn --worker-class aiohttp.GunicornWebWorker``."""
+    return create_app()
+
+
+def main():
+    """Main function to handle command line arguments."""
+    parser = argparse.ArgumentParser(description='Flavi Dairy async read-only API')
+    parser.add_argument('--host', default='127.0.0.1', help='Bind address')
+    parser.add_argument('--port', type=int, default=Config.ASYNC_API_PORT, help='Port to listen on')
+    parser.add_argument('--database-url', help='Database URL (default: SQLALCHEMY_DATABASE_URI)')
+
+    args = parser.parse_args()
+
+    print("⚡ Async Read-Only API")
+    print("=" * 50)
+    try:
+        app = create_app(args.database_url)
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    print(f"🌐 Serving /api/skus, /api/sales/<sku_id>, /api/inventory/<sku_id> on http://{args.host}:{args.port}")
+    web.run_app(app, host=args.host, port=args.port, print=None)
+
+
+if __name__ == '__main__':
+    main()
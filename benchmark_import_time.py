@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Import Time Benchmark for Flavi Dairy Forecasting AI
+Measures how long it takes to import the web entry point and the modules
+registered at app start-up, using ``python -X importtime`` in a fresh
+interpreter per run, and checks them against the agreed budget.
+
+``run`` is measured on its own (what a worker or ``flask`` command pays in
+total). The start-up modules are measured on top of the Flask/SQLAlchemy
+stack that ``run`` has already loaded, so their figure is their own extra
+cost. A module fails the check when its median import time is over budget
+or when it pulls in a heavy data/ML library (numpy, pandas, matplotlib, ...)
+that should only be imported by the code path that needs it.
+
+Usage:
+    python benchmark_import_time.py
+    python benchmark_import_time.py --module run --runs 10 --top 15
+"""
+
+import os
+import re
+import sys
+import argparse
+import statistics
+import subprocess
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# Median import time budget per module, in milliseconds
+IMPORT_BUDGETS_MS = {
+    'run': 800,              # total for every web worker and every ``flask`` command
+    'request_metrics': 100,  # the rest: extra cost on top of BASELINE_IMPORTS
+    'slow_query_log': 100,
+    'current_stock': 100,
+    'dashboard_metrics': 100,
+    'user_loader_cache': 100,
+    'csv_export': 100,
+    'chart_data': 100,
+    'table_partitioning': 100,
+    'inventory_ledger': 100,
+    'customer_order_stats': 100,
+}
+
+# Loaded by ``run`` before any start-up module; not counted against those modules
+BASELINE_IMPORTS = ('flask', 'flask_login', 'flask_sqlalchemy', 'sqlalchemy', 'sqlalchemy.orm')
+STANDALONE_MODULES = ('run',)
+
+# Never imported at start-up; load them inside the functions that use them
+HEAVY_MODULES = ('numpy', 'pandas', 'pyarrow', 'scipy', 'matplotlib', 'sklearn', 'statsmodels', 'prophet')
+
+_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$')
+
+
+def import_profile(module_name, preload=()):
+    """Import ``module_name`` in a fresh interpreter and parse ``-X importtime``.
+
+    ``preload`` modules are imported first and excluded from the figures.
+    Returns ``(total_ms, entries)`` where ``entries`` is a list of
+    ``(name, self_ms, cumulative_ms, depth)`` for the target's imports.
+    """
+    code = ''.join(f'import {name}; ' for name in preload) + f'import {module_name}'
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=PROJECT_ROOT, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else 'import failed')
+
+    entries = []
+    total_ms = None
+    for line in result.stderr.splitlines():
+        match = _LINE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, name = match.groups()
+        depth = len(indent) // 2
+        entries.append((name, int(self_us) / 1000, int(cumulative_us) / 1000, depth))
+        if depth == 0 and name == module_name:
+            total_ms = int(cumulative_us) / 1000
+            break
+        if depth == 0:
+            # A finished preload import: drop its tree
+            entries = []
+    return total_ms, entries
+
+
+def benchmark_module(module_name, runs=5):
+    """Median import time of ``module_name`` over ``runs`` cold interpreters.
+
+    One extra run first makes sure bytecode caches are written, so
+    compilation is not counted. Returns ``(median_ms, heavy_modules, entries)``.
+    """
+    preload = () if module_name in STANDALONE_MODULES else BASELINE_IMPORTS
+    import_profile(module_name, preload)
+    totals = []
+    entries = []
+    for _ in range(runs):
+        total_ms, entries = import_profile(module_name, preload)
+        totals.append(total_ms)
+    imported = {name.split('.')[0] for name, _, _, _ in entries}
+    heavy = sorted(imported.intersection(HEAVY_MODULES))
+    return statistics.median(totals), heavy, entries
+
+
+def top_packages(entries, count=10):
+    """Top-level packages by cumulative import time (where each was first imported)."""
+    packages = [(name, cumulative) for name, _, cumulative, depth in entries if '.' not in name and depth > 0]
+    return sorted(packages, key=lambda item: item[1], reverse=True)[:count]
+
+
+def main():
+    """Main function to handle command line arguments."""
+    parser = argparse.ArgumentParser(description='Benchmark module import times against the budget')
+    parser.add_argument('--module', action='append', help='Module to measure (default: all budgeted modules)')
+    parser.add_argument('--runs', type=int, default=5, help='Fresh interpreters per module')
+    parser.add_argument('--budget-ms', type=float, help='Override the budget for every module')
+    parser.add_argument('--top', type=int, default=0, help='Show the N slowest packages imported by each module')
+
+    args = parser.parse_args()
+    modules = args.module or list(IMPORT_BUDGETS_MS)
+
+    print("⏱️  Import Time Benchmark")
+    print("=" * 70)
+    print(f"{'Module':<24}{'Median ms':>12}{'Budget ms':>12}  Result")
+    print("-" * 70)
+
+    failures = 0
+    for module_name in modules:
+        budget = args.budget_ms or IMPORT_BUDGETS_MS.get(module_name)
+        try:
+            median_ms, heavy, entries = benchmark_module(module_name, args.runs)
+        except RuntimeError as e:
+            print(f"{module_name:<24}{'-':>12}{_fmt(budget):>12}  ❌ {e}")
+            failures += 1
+            continue
+
+        problems = []
+        if budget and median_ms > budget:
+            problems.append('over budget')
+        if heavy:
+            problems.append(f"imports {', '.join(heavy)}")
+        failures += bool(problems)
+        result = '❌ ' + '; '.join(problems) if problems else '✅'
+        print(f"{module_name:<24}{median_ms:>12.0f}{_fmt(budget):>12}  {result}")
+
+        for name, cumulative in top_packages(entries, args.top):
+            print(f"    {name:<28}{cumulative:>10.1f} ms")
+
+    print("-" * 70)
+    if failures:
+        print(f"❌ {failures} module(s) failed the import budget")
+        sys.exit(1)
+    print("✅ All modules within budget")
+
+
+def _fmt(value):
+    return '-' if value is None else f"{value:.0f}"
+
+
+if __name__ == '__main__':
+    main()
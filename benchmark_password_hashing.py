@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Password Hashing Benchmark for Flavi Dairy Forecasting AI
+Reports how many logins per second per core each hashing configuration allows,
+to pick a PASSWORD_HASH_METHOD that keeps a morning login burst within budget.
+
+Usage:
+    python benchmark_password_hashing.py
+    python benchmark_password_hashing.py --method scrypt:32768:8:1 --method pbkdf2:sha256:600000
+"""
+
+import os
+import sys
+import time
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+from werkzeug.security import check_password_hash
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from config import Config
+from password_hashing import hash_password
+
+
+def benchmark_method(method, seconds=3.0, threads=1):
+    """Verify one hash repeatedly on ``threads`` threads; return verifications per second."""
+    password_hash = hash_password('customer123', method=method)
+    deadline = time.perf_counter() + seconds
+
+    def worker():
+        count = 0
+        while time.perf_counter() < deadline:
+            check_password_hash(password_hash, 'customer123')
+            count += 1
+        return count
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        total = sum(executor.map(lambda _: worker(), range(threads)))
+    return total / (time.perf_counter() - start)
+
+
+def main():
+    """Main function to handle command line arguments."""
+    parser = argparse.ArgumentParser(description='Benchmark password verification throughput')
+    parser.add_argument('--method', action='append',
+                        help=f'Werkzeug hash method (default: {Config.PASSWORD_HASH_METHOD}); repeatable')
+    parser.add_argument('--seconds', type=float, default=3.0, help='Duration of each run')
+    parser.add_argument('--threads', type=int, default=Config.PASSWORD_VERIFY_THREADS,
+                        help='Threads for the parallel run (default: PASSWORD_VERIFY_THREADS)')
+
+    args = parser.parse_args()
+    methods = args.method or [Config.PASSWORD_HASH_METHOD]
+
+    print("🔐 Password Hashing Benchmark")
+    print("=" * 60)
+    print(f"CPU cores: {os.cpu_count()}, parallel threads: {args.threads}")
+    print()
+
+    for method in methods:
+        single = benchmark_method(method, args.seconds, threads=1)
+        parallel = benchmark_method(method, args.seconds, threads=args.threads)
+        cores_used = min(args.threads, os.cpu_count() or 1)
+
+        print(f"🔹 {method}")
+        print(f"   Latency per login: {1000 / single:.1f} ms")
+        print(f"   Logins/sec (1 core): {single:.1f}")
+        print(f"   Logins/sec ({args.threads} threads): {parallel:.1f}")
+        print(f"   Logins/sec per core: {parallel / cores_used:.1f}")
+        print()
+
+
+if __name__ == '__main__':
+    main()
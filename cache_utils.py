@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+In-Process Caching for Flavi Dairy Forecasting AI
+A small thread-safe TTL + LRU cache shared by the service modules.
+
+Each worker process has its own cache, so entries invalidated in one worker
+stay valid in the others until their TTL runs out. Keep TTLs short for data
+that other workers may change.
+"""
+
+import time
+import threading
+from collections import OrderedDict
+
+_MISSING = object()
+
+
+class TTLCache:
+    """Thread-safe cache with per-entry expiry and least-recently-used eviction."""
+
+    def __init__(self, ttl_seconds, max_entries=1024):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        """Return the cached value, or ``default`` if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is _MISSING:
+                return default
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return default
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl_seconds=None):
+        """Store ``value`` for ``ttl_seconds`` (default: the cache TTL)."""
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_or_load(self, key, loader):
+        """Return the cached value, calling ``loader()`` and caching it on a miss."""
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = loader()
+            self.set(key, value)
+        return value
+
+    def invalidate(self, key):
+        """Drop one entry if present."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        """Drop every entry."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+
+def invalidate_on_commit(table_names, callback, key=None):
+    """Call ``callback(keys)`` after a commit that wrote rows to ``table_names``.
+
+    ``key(obj)`` is evaluated at flush time for every new, changed or deleted
+    ORM instance of those tables (default: its table name), and the collected
+    keys are passed to ``callback`` once the transaction has committed. Rolled
+    back transactions are ignored. Bulk SQL statements bypass the ORM and are
+    not seen here; caches still expire through their TTL.
+    """
+    from sqlalchemy import event
+    from sqlalchemy.orm import Session
+
+    table_names = set(table_names)
+    key = key or (lambda obj: obj.__tablename__)
+    info_key = ('pending_invalidations', id(callback))
+
+    def after_flush(session, flush_context):
+        touched = [
+            obj for obj in list(session.new) + list(session.dirty) + list(session.deleted)
+            if getattr(obj, '__tablename__', None) in table_names
+        ]
+        if touched:
+            session.info.setdefault(info_key, set()).update(key(obj) for obj in touched)
+
+    def after_commit(session):
+        keys = session.info.pop(info_key, None)
+        if keys:
+            callback(keys)
+
+    def after_soft_rollback(session, previous_transaction):
+        session.info.pop(info_key, None)
+
+    event.listen(Session, 'after_flush', after_flush)
+    event.listen(Session, 'after_commit', after_commit)
+    event.listen(Session, 'after_soft_rollback', after_soft_rollback)
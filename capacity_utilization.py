@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+Storage Capacity Utilization for Flavi Dairy Forecasting AI
+Maintains ``capacity_utilization_daily``, a compact table with one row per
+day and category (plus an ``ALL`` total) holding the storage volume in use,
+the available capacity (both in m³) and the utilization percentage.
+
+Volume is the end-of-day stock from the inventory ledger times
+``SKU.storage_requirement_cubic_meters``, capacity is the
+``storage_capacity_units`` in effect that day times the same factor. Each
+sync only re-aggregates days from the last stored day onwards. Future days
+are projected from demand forecasts with the reorder policy of
+``inventory_optimization`` and stored with ``projected = 1``.
+
+Usage:
+    python capacity_utilization.py                  # incremental sync + 30-day projection
+    python capacity_utilization.py --full --project-days 60
+"""
+
+import os
+import sys
+import argparse
+import logging
+from datetime import date, datetime, timedelta
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import Boolean, Column, Date, Float, MetaData, String, Table, func, select, text
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from config import Config
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+TOTAL_CATEGORY = 'ALL'
+MAX_CHART_POINTS = 400
+
+metadata = MetaData()
+
+utilization_table = Table(
+    'capacity_utilization_daily', metadata,
+    Column('date', Date, primary_key=True),
+    Column('category', String(50), primary_key=True),
+    Column('used_m3', Float, nullable=False),
+    Column('capacity_m3', Float, nullable=False),
+    Column('utilization_pct', Float),
+    Column('projected', Boolean, nullable=False, default=False),
+)
+
+# Category and volume per unit of every SKU
+SKU_VOLUME_SQL = """
+    SELECT sku_id,
+           COALESCE(category, 'Uncategorized') AS category,
+           storage_requirement_cubic_meters AS volume
+      FROM sku
+"""
+
+
+def _with_totals(frame):
+    """Add an ``ALL`` row per day and the utilization percentage."""
+    totals = frame.groupby('date', as_index=False)[['used_m3', 'capacity_m3']].sum()
+    totals['category'] = TOTAL_CATEGORY
+    frame = pd.concat([frame, totals], ignore_index=True)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        pct = frame['used_m3'] / frame['capacity_m3'] * 100
+    frame['utilization_pct'] = pct.replace([np.inf, -np.inf], np.nan).round(2)
+    return frame
+
+
+def _replace_rows(conn, frame, projected, start):
+    """Replace stored rows of one kind (actual or projected) from ``start`` on."""
+    table = utilization_table.c
+    conn.execute(utilization_table.delete().where(table.projected == projected, table.date >= start))
+    if projected is False:
+        # Actual data supersedes any projection for the same days
+        conn.execute(utilization_table.delete().where(table.projected.is_(True), table.date <= frame['date'].max()))
+    frame = frame.assign(projected=projected)
+    rows = frame.astype(object).where(frame.notna(), None).to_dict('records')
+    if rows:
+        conn.execute(utilization_table.insert(), rows)
+    return len(rows)
+
+
+def sync_utilization(engine, full=False):
+    """Aggregate new inventory days into ``capacity_utilization_daily``.
+
+    Re-aggregates from the last stored actual day (it may have been partial)
+    up to today unless ``full`` is set. Returns the number of rows written.
+    """
+    from inventory_ledger import daily_inventory
+
+    metadata.create_all(engine, tables=[utilization_table])
+    table = utilization_table.c
+
+    with engine.connect() as conn:
+        start = None
+        if not full:
+            start = conn.execute(select(func.max(table.date)).where(table.projected.is_(False))).scalar()
+        skus = pd.read_sql_query(text(SKU_VOLUME_SQL), conn)
+    start = _to_date(start) if start else date(1900, 1, 1)
+
+    stock = daily_inventory(engine, start, datetime.now().date()).merge(skus, on='sku_id')
+    if stock.empty:
+        return 0
+    frame = pd.DataFrame({
+        'date': stock['date'].dt.date,
+        'category': stock['category'],
+        'used_m3': stock['current_level'] * stock['volume'],
+        'capacity_m3': stock['storage_capacity_units'] * stock['volume'],
+    }).groupby(['date', 'category'], as_index=False).sum()
+
+    with engine.begin() as conn:
+        written = _replace_rows(conn, _with_totals(frame), False, start)
+
+    logger.info(f"Capacity utilization: {written} daily rows from {start}")
+    return written
+
+
+def project_utilization(engine, days=30, forecast=None):
+    """Project utilization ``days`` ahead and store it as projected rows.
+
+    ``forecast`` maps SKU id to a daily demand forecast (a number or a
+    sequence of at least ``days`` values); SKUs without one use their recent
+    mean demand. Stock falls by the forecast and is replenished by one
+    economic batch whenever it reaches the reorder point.
+    """
+    from inventory_optimization import build_recommendations
+
+    plan = build_recommendations(engine)
+    if plan.empty:
+        return 0
+
+    with engine.connect() as conn:
+        skus = pd.read_sql_query(text(
+            "SELECT sku_id, COALESCE(category, 'Uncategorized') AS category, "
+            "storage_requirement_cubic_meters AS volume, c.storage_capacity_units "
+            "FROM sku JOIN current_stock c USING (sku_id)"
+        ), conn)
+    plan = plan.merge(skus, on='sku_id')
+
+    demand = np.repeat(plan['mean_daily_demand'].to_numpy()[:, None], days, axis=1)
+    for row, sku_id in enumerate(plan['sku_id']):
+        values = (forecast or {}).get(sku_id)
+        if values is not None:
+            values = np.atleast_1d(np.asarray(values, dtype=np.float64))
+            demand[row] = values[:days] if values.size > 1 else values[0]
+
+    # Step the reorder policy one day at a time for all SKUs together
+    level = plan['current_level'].to_numpy(dtype=np.float64)
+    reorder_point = plan['reorder_point'].to_numpy()
+    batch_quantity = plan['batch_quantity'].to_numpy()
+    levels = np.empty((len(plan), days))
+    for day in range(days):
+        level = np.maximum(level - demand[:, day], 0.0)
+        level = np.where(level <= reorder_point, level + batch_quantity, level)
+        levels[:, day] = level
+
+    volume = plan['volume'].fillna(0).to_numpy()
+    used = levels * volume[:, None]
+    capacity = np.nan_to_num(plan['storage_capacity_units'].to_numpy(dtype=np.float64)) * volume
+
+    first_day = datetime.now().date() + timedelta(days=1)
+    frame = pd.DataFrame({
+        'date': np.tile([first_day + timedelta(days=d) for d in range(days)], len(plan)),
+        'category': np.repeat(plan['category'].to_numpy(), days),
+        'used_m3': used.ravel(),
+        'capacity_m3': np.repeat(capacity, days),
+    }).groupby(['date', 'category'], as_index=False).sum()
+
+    with engine.begin() as conn:
+        metadata.create_all(conn, tables=[utilization_table])
+        # Drop every earlier projection, including days that are now in the past
+        conn.execute(utilization_table.delete().where(utilization_table.c.projected.is_(True)))
+        written = _replace_rows(conn, _with_totals(frame), True, first_day)
+    logger.info(f"Capacity utilization: {written} projected rows for {days} days")
+    return written
+
+
+def get_utilization_series(session, start_date=None, end_date=None, category=TOTAL_CATEGORY,
+                           max_points=MAX_CHART_POINTS):
+    """Utilization series for charts, as a list of dicts ordered by date.
+
+    Ranges with more than ``max_points`` days are averaged into weekly (or
+    monthly) buckets, so a multi-year chart stays a few hundred points.
+    """
+    table = utilization_table.c
+    query = select(table.date, table.used_m3, table.capacity_m3, table.utilization_pct, table.projected) \
+        .where(table.category == category).order_by(table.date)
+    if start_date:
+        query = query.where(table.date >= start_date)
+    if end_date:
+        query = query.where(table.date <= end_date)
+
+    frame = pd.DataFrame(session.execute(query).mappings().all(),
+                         columns=['date', 'used_m3', 'capacity_m3', 'utilization_pct', 'projected'])
+    if frame.empty:
+        return []
+
+    if len(frame) > max_points:
+        frame['date'] = pd.to_datetime(frame['date'])
+        rule = 'W-MON' if len(frame) / 7 <= max_points else 'MS'
+        frame = (
+            frame.set_index('date')
+            .groupby('projected')
+            .resample(rule, label='left', closed='left')[['used_m3', 'capacity_m3', 'utilization_pct']]
+            .mean()
+            .dropna(how='all')
+            .reset_index()
+            .sort_values('date')
+        )
+        frame['date'] = frame['date'].dt.date
+
+    frame['projected'] = frame['projected'].astype(bool)
+    columns = ['date', 'used_m3', 'capacity_m3', 'utilization_pct', 'projected']
+    return frame[columns].round(3).to_dict('records')
+
+
+def _to_date(value):
+    if isinstance(value, str):
+        return date.fromisoformat(value[:10])
+    return value.date() if isinstance(value, datetime) else value
+
+
+def main():
+    """Main function to handle command line arguments."""
+    parser = argparse.ArgumentParser(description='Flavi Dairy storage capacity utilization')
+    parser.add_argument('--full', action='store_true', help='Rebuild the whole series')
+    parser.add_argument('--project-days', type=int, default=30,
+                        help=f'Days to project ahead (0 to skip, max {Config.MAX_FORECAST_DAYS})')
+
+    args = parser.parse_args()
+
+    from app import create_app, db
+
+    app = create_app()
+    with app.app_context():
+        print("🏭 Capacity Utilization")
+        print("=" * 50)
+        try:
+            written = sync_utilization(db.engine, full=args.full)
+            print(f"✅ {written} daily rows updated")
+            if args.project_days:
+                projected = project_utilization(db.engine, days=min(args.project_days, Config.MAX_FORECAST_DAYS))
+                print(f"✅ {projected} projected rows written")
+        except Exception as e:
+            print(f"❌ Error updating capacity utilization: {e}")
+            sys.exit(1)
+
+        for row in get_utilization_series(db.session)[-10:]:
+            marker = ' (projected)' if row['projected'] else ''
+            print(f"  {row['date']}: {row['used_m3']:.2f} / {row['capacity_m3']:.2f} m³ "
+                  f"({row['utilization_pct']}%){marker}")
+
+
+if __name__ == '__main__':
+    main()
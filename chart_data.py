@@ -0,0 +1,351 @@
+#!/usr/bin/env python3
+"""
+Chart Data for Flavi Dairy Forecasting AI
+Serves long-range chart series already reduced to a target number of points,
+so multi-year views send a few hundred points per series to Chart.js instead
+of every daily value.
+
+Two reductions are available:
+
+- ``lttb``    Largest-Triangle-Three-Buckets; keeps real points chosen to
+              preserve the visual shape (peaks, dips, trend changes)
+- ``bucket``  equal-width buckets with ``min``, ``max`` and ``mean`` for
+              band/range charts
+
+Series are built from daily sales totals aggregated in the database, end-of-day
+stock from the inventory ledger and the ``capacity_utilization_daily`` rollup; several of them,
+plus an optional demand forecast, come back in one response from
+``/api/charts/<sku_id>``. ``capacity`` holds measured utilization only;
+rows projected by ``capacity_utilization`` are the separate
+``capacity_projected`` series, which may run past the end date. Without the
+rollup table both are empty. NumPy and pandas are imported on first use, so
+registering the blueprint does not slow down worker start-up.
+
+Usage:
+    python chart_data.py MILK-001 --points 300 --mode bucket
+"""
+
+import os
+import sys
+import json
+import math
+import argparse
+import logging
+from datetime import datetime, timedelta
+
+from flask import Blueprint, abort, jsonify, request
+from flask_login import login_required
+from sqlalchemy import inspect, text
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from config import Config
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DEFAULT_POINTS = 500
+MAX_POINTS = 5000
+DEFAULT_SERIES = ('sales', 'inventory')
+SERIES = ('sales', 'inventory', 'capacity', 'capacity_projected', 'forecast')
+MODES = ('lttb', 'bucket')
+ALL_SKUS = 'all'
+
+# Daily totals; the SKU filter is dropped for the all-SKU view
+DAILY_SERIES_SQL = {
+    'sales': """
+        SELECT DATE(date) AS day, SUM(quantity_sold) AS value
+          FROM sales
+         WHERE date >= :start AND date < :end {sku_filter}
+         GROUP BY DATE(date)
+    """,
+}
+
+bp = Blueprint('charts', __name__)
+
+
+def lttb(x, y, threshold):
+    """Indices of the ``threshold`` points kept by Largest-Triangle-Three-Buckets.
+
+    The first and last points are always kept; every bucket in between
+    contributes the point forming the largest triangle with the point kept
+    from the previous bucket and the average of the next bucket.
+    """
+    import numpy as np
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    # Bucket i holds interior points edges[i]:edges[i+1]; the last "next bucket" is the final point
+    edges = (np.arange(threshold - 1) * (n - 2) / (threshold - 2)).astype(np.intp) + 1
+    edges[-1] = n - 1
+    bounds = np.append(edges, n)
+    x_sum = np.concatenate(([0.0], np.cumsum(x)))
+    y_sum = np.concatenate(([0.0], np.cumsum(y)))
+    counts = np.diff(bounds)
+    x_mean = (x_sum[bounds[1:]] - x_sum[bounds[:-1]]) / counts
+    y_mean = (y_sum[bounds[1:]] - y_sum[bounds[:-1]]) / counts
+
+    selected = np.empty(threshold, dtype=np.intp)
+    selected[0], selected[-1] = 0, n - 1
+    previous = 0
+    for bucket in range(threshold - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        ax, ay = x[previous], y[previous]
+        # Twice the triangle area; the constant factor does not change the argmax
+        area = np.abs((ax - x_mean[bucket + 1]) * (y[start:end] - ay)
+                      - (ax - x[start:end]) * (y_mean[bucket + 1] - ay))
+        previous = start + int(np.argmax(area))
+        selected[bucket + 1] = previous
+    return selected
+
+
+def bucket_aggregate(values, points):
+    """Split ``values`` into ``points`` equal-width buckets.
+
+    Returns ``(starts, minimum, maximum, mean)`` where ``starts`` are the
+    index of each bucket's first value. NaNs are ignored; all-NaN buckets
+    come back as NaN.
+    """
+    import numpy as np
+
+    values = np.asarray(values, dtype=np.float64)
+    n = len(values)
+    points = max(1, min(points, n))
+    starts = np.unique((np.arange(points) * n / points).astype(np.intp))
+
+    present = ~np.isnan(values)
+    counts = np.add.reduceat(present.astype(np.int64), starts)
+    sums = np.add.reduceat(np.where(present, values, 0.0), starts)
+    minimum = np.minimum.reduceat(np.where(present, values, np.inf), starts)
+    maximum = np.maximum.reduceat(np.where(present, values, -np.inf), starts)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean = sums / counts
+    empty = counts == 0
+    minimum[empty] = maximum[empty] = np.nan
+    return starts, minimum, maximum, mean
+
+
+def downsample(series, points, mode='lttb'):
+    """Reduce a daily ``pd.Series`` (DatetimeIndex) to at most ``points`` entries.
+
+    ``lttb`` returns ``[[date, value], ...]``; ``bucket`` returns
+    ``[{'date', 'min', 'max', 'mean'}, ...]`` with the first date of each bucket.
+    """
+    import numpy as np
+
+    series = series.dropna() if mode == 'lttb' else series
+    if series.empty:
+        return []
+    dates = series.index.strftime('%Y-%m-%d')
+    values = series.to_numpy(dtype=np.float64)
+
+    if mode == 'lttb':
+        keep = lttb(series.index.to_numpy(dtype='datetime64[D]').astype(np.int64), values, points)
+        return [[dates[i], round(float(values[i]), 3)] for i in keep]
+
+    starts, minimum, maximum, mean = bucket_aggregate(values, points)
+    return [
+        {'date': dates[start], 'min': _round(low), 'max': _round(high), 'mean': _round(average)}
+        for start, low, high, average in zip(starts, minimum, maximum, mean)
+    ]
+
+
+def _round(value):
+    return None if math.isnan(value) else round(float(value), 3)
+
+
+def load_daily_series(conn, name, sku_id, start_date, end_date):
+    """One daily series as a ``pd.Series`` indexed by every day of the range.
+
+    Days without sales count as zero; days before a SKU's first inventory
+    movement and days without a utilization row are NaN (unknown, not empty). ``capacity_projected`` only
+    spans the days that have projections, and both capacity series are empty
+    if the rollup table has not been created.
+    """
+    import numpy as np
+    import pandas as pd
+
+    days = pd.date_range(start_date, end_date, freq='D')
+    params = {'start': start_date, 'end': end_date + timedelta(days=1)}
+
+    if name == 'inventory':
+        from inventory_ledger import daily_inventory
+
+        if not inspect(conn).has_table('inventory_movements'):
+            return pd.Series(np.nan, index=days)
+        stock = daily_inventory(conn.engine, start_date, end_date, None if sku_id == ALL_SKUS else [sku_id])
+        return stock.groupby('date')['current_level'].sum().reindex(days)
+
+    if name in ('capacity', 'capacity_projected'):
+        if not inspect(conn).has_table('capacity_utilization_daily'):
+            return pd.Series(dtype=np.float64)
+        params['projected'] = name == 'capacity_projected'
+        sql = ("SELECT date AS day, utilization_pct AS value FROM capacity_utilization_daily "
+               "WHERE category = :category AND projected = :projected AND date >= :start AND date < :end")
+        params['category'] = 'ALL'
+        if sku_id != ALL_SKUS:
+            sql = ("SELECT date AS day, utilization_pct AS value FROM capacity_utilization_daily d "
+                   "JOIN sku s ON COALESCE(s.category, 'Uncategorized') = d.category "
+                   "WHERE s.sku_id = :sku_id AND d.projected = :projected AND date >= :start AND date < :end")
+            params.pop('category')
+    else:
+        sku_filter = '' if sku_id == ALL_SKUS else 'AND sku_id = :sku_id'
+        sql = DAILY_SERIES_SQL[name].format(sku_filter=sku_filter)
+    if sku_id != ALL_SKUS:
+        params['sku_id'] = sku_id
+
+    frame = pd.read_sql_query(text(sql), conn, params=params)
+    values = pd.Series(frame['value'].to_numpy(dtype=np.float64), index=pd.to_datetime(frame['day']))
+    values = values.groupby(level=0).sum(min_count=1).reindex(days)
+    if name == 'capacity_projected':
+        known = values.dropna()
+        return values[known.index.min():known.index.max()] if not known.empty else known
+    return values.fillna(0.0) if name == 'sales' else values
+
+
+def forecast_series(conn, sku_id, horizon):
+    """Demand forecast for ``horizon`` days after the last sale of ``sku_id``.
+
+    The model is trained on the last ``Config.TRAINING_DATA_DAYS`` of sales up
+    to the last sale, whatever range the chart shows, so every viewer shares
+    one training window. It forecasts ``Config.MAX_FORECAST_DAYS`` once and is
+    kept in the model registry; other horizons and other workers load it
+    instead of refitting.
+    """
+    import numpy as np
+    import pandas as pd
+    from app.forecasting.advanced_forecasting import forecast_with_features
+    from model_registry import get_registry
+
+    if horizon > Config.MAX_FORECAST_DAYS:
+        raise ValueError(f"Forecast horizon is limited to {Config.MAX_FORECAST_DAYS} days")
+
+    def fit(history):
+        return forecast_with_features(history, periods=Config.MAX_FORECAST_DAYS)
+
+    sql = 'SELECT MAX(date) FROM sales' + ('' if sku_id == ALL_SKUS else ' WHERE sku_id = :sku_id')
+    last_sale = conn.execute(text(sql), {'sku_id': sku_id}).scalar()
+    if last_sale is None:
+        return pd.Series(dtype=np.float64)
+    last_day = pd.Timestamp(last_sale).date()
+    sales = load_daily_series(conn, 'sales', sku_id, last_day - timedelta(days=Config.TRAINING_DATA_DAYS - 1), last_day)
+
+    history = pd.DataFrame({'date': sales.index, 'demand': sales.to_numpy()})
+    forecast, _ = get_registry().get_or_fit(sku_id, history, fit, model_type='forecast_with_features')
+    forecast = forecast[pd.to_datetime(forecast['ds']) > sales.index.max()].head(horizon)
+    return pd.Series(forecast['yhat'].to_numpy(dtype=np.float64), index=pd.to_datetime(forecast['ds']))
+
+
+def get_chart_data(conn, sku_id, start_date, end_date, points=DEFAULT_POINTS, mode='lttb',
+                   series=DEFAULT_SERIES, horizon=None):
+    """Downsampled chart series for one SKU (or ``'all'``) in a single payload.
+
+    ``series`` is any of ``SERIES``; the forecast continues the sales history
+    after the last sale and the projected utilization continues past
+    ``end_date``, both for ``horizon`` days (``Config.FORECAST_HORIZON_DAYS``
+    by default).
+    """
+    if mode not in MODES:
+        raise ValueError(f"Unknown mode: {mode}")
+    horizon = horizon or Config.FORECAST_HORIZON_DAYS
+    unknown = set(series) - set(SERIES)
+    if unknown:
+        raise ValueError(f"Unknown series: {', '.join(sorted(unknown))}")
+    points = max(3, min(int(points), MAX_POINTS))
+
+    payload = {
+        'sku_id': sku_id,
+        'start': start_date.isoformat(),
+        'end': end_date.isoformat(),
+        'mode': mode,
+        'points': points,
+        'series': {},
+    }
+    loaded = {}
+    for name in series:
+        if name == 'forecast':
+            values = forecast_series(conn, sku_id, horizon)
+        elif name == 'capacity_projected':
+            values = load_daily_series(conn, name, sku_id, start_date, end_date + timedelta(days=horizon))
+        else:
+            values = loaded.get(name)
+            if values is None:
+                values = loaded[name] = load_daily_series(conn, name, sku_id, start_date, end_date)
+        payload['series'][name] = {'raw_points': int(values.notna().sum()), 'data': downsample(values, points, mode)}
+    return payload
+
+
+def _parse_date(value, default):
+    """Parse a ``YYYY-MM-DD`` string, or return ``default`` for empty values."""
+    if not value:
+        return default
+    return datetime.strptime(value, '%Y-%m-%d').date()
+
+
+@bp.route('/api/charts/<sku_id>')
+@login_required
+def chart_data(sku_id):
+    """``?start=&end=&points=500&mode=lttb|bucket&series=sales,inventory,capacity,capacity_projected,forecast``"""
+    from app import db
+
+    try:
+        end_date = _parse_date(request.args.get('end'), datetime.now().date())
+        start_date = _parse_date(request.args.get('start'), end_date - timedelta(days=Config.TRAINING_DATA_DAYS))
+        series = [name for name in request.args.get('series', ','.join(DEFAULT_SERIES)).split(',') if name]
+        payload = get_chart_data(
+            db.session.connection(), sku_id, start_date, end_date,
+            points=request.args.get('points', DEFAULT_POINTS, type=int),
+            mode=request.args.get('mode', 'lttb'),
+            series=series,
+        )
+    except ValueError as e:
+        abort(400, description=str(e))
+    return jsonify(payload)
+
+
+def init_app(app):
+    """Register the chart data endpoint with the Flask app."""
+    app.register_blueprint(bp)
+
+
+def main():
+    """Main function to handle command line arguments."""
+    parser = argparse.ArgumentParser(description='Flavi Dairy downsampled chart data')
+    parser.add_argument('sku_id', nargs='?', default=ALL_SKUS, help=f"SKU id (default: {ALL_SKUS})")
+    parser.add_argument('--start', help='Start date (YYYY-MM-DD)')
+    parser.add_argument('--end', help='End date (YYYY-MM-DD), default today')
+    parser.add_argument('--points', type=int, default=DEFAULT_POINTS, help='Target points per series')
+    parser.add_argument('--mode', choices=MODES, default='lttb', help='Downsampling method')
+    parser.add_argument('--series', default=','.join(DEFAULT_SERIES), help='Comma-separated series')
+
+    args = parser.parse_args()
+
+    from app import create_app, db
+
+    app = create_app()
+    with app.app_context():
+        print("📈 Chart Data")
+        print("=" * 50)
+        try:
+            end_date = _parse_date(args.end, datetime.now().date())
+            start_date = _parse_date(args.start, end_date - timedelta(days=Config.TRAINING_DATA_DAYS))
+            with db.engine.connect() as conn:
+                payload = get_chart_data(conn, args.sku_id, start_date, end_date, args.points, args.mode,
+                                         args.series.split(','))
+        except Exception as e:
+            print(f"❌ Error: {e}")
+            sys.exit(1)
+
+        for name, values in payload['series'].items():
+            print(f"  {name}: {values['raw_points']} daily values -> {len(values['data'])} points")
+        print(f"📦 Payload: {len(json.dumps(payload)) / 1024:.1f} KB")
+
+
+if __name__ == '__main__':
+    main()
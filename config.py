@@ -18,11 +18,50 @@ class Config:
     # ML Model Settings
     FORECAST_HORIZON_DAYS = 30
     TRAINING_DATA_DAYS = 365  # Use 1 year of data for training
+    HISTORY_STORE_PATH = os.environ.get('HISTORY_STORE_PATH') or os.path.join(basedir, 'instance', 'history')
+    
+    # Monthly partitions of sales/order (PostgreSQL) and their Parquet archive
+    PARTITION_MONTHS_AHEAD = int(os.environ.get('PARTITION_MONTHS_AHEAD', 3))
+    PARTITION_RETENTION_MONTHS = int(os.environ.get('PARTITION_RETENTION_MONTHS', 24))
+    ARCHIVE_STORE_PATH = os.environ.get('ARCHIVE_STORE_PATH') or os.path.join(basedir, 'instance', 'archive')
+
+    # Fitted forecast models (see model_registry.py)
+    MODEL_REGISTRY_PATH = os.environ.get('MODEL_REGISTRY_PATH') or os.path.join(basedir, 'instance', 'models')
+    MODEL_CACHE_MAX_MB = int(os.environ.get('MODEL_CACHE_MAX_MB', 256))
+    MODEL_REGISTRY_KEEP_VERSIONS = int(os.environ.get('MODEL_REGISTRY_KEEP_VERSIONS', 5))
     
     # Application Settings
     ITEMS_PER_PAGE = 20
     MAX_FORECAST_DAYS = 90  # Maximum number of days to forecast
     
+    # Inventory optimization
+    INVENTORY_SERVICE_LEVEL = float(os.environ.get('INVENTORY_SERVICE_LEVEL', 0.95))
+    PRODUCTION_SETUP_COST = float(os.environ.get('PRODUCTION_SETUP_COST', 500))  # per production run
+    HOLDING_COST_PER_UNIT_DAY = float(os.environ.get('HOLDING_COST_PER_UNIT_DAY', 0.05))
+    PLANNING_REVIEW_PERIOD_DAYS = 1
+    STOCKOUT_COST_PER_UNIT = float(os.environ.get('STOCKOUT_COST_PER_UNIT', 10))
+    PRODUCTION_LINE_HOURS_PER_DAY = float(os.environ.get('PRODUCTION_LINE_HOURS_PER_DAY', 16))
+    DASHBOARD_CACHE_TTL_SECONDS = int(os.environ.get('DASHBOARD_CACHE_TTL_SECONDS', 30))
+    DASHBOARD_METRICS_USE_MATVIEW = os.environ.get('DASHBOARD_METRICS_USE_MATVIEW') == '1'
+    USER_CACHE_TTL_SECONDS = int(os.environ.get('USER_CACHE_TTL_SECONDS', 60))
+    USER_CACHE_MAX_ENTRIES = 10000
+    
+    # Password hashing (Werkzeug method string, e.g. 'scrypt:32768:8:1' or 'pbkdf2:sha256:600000')
+    PASSWORD_HASH_METHOD = os.environ.get('PASSWORD_HASH_METHOD') or 'scrypt'
+    PASSWORD_VERIFY_THREADS = int(os.environ.get('PASSWORD_VERIFY_THREADS', os.cpu_count() or 2))
+    PASSWORD_VERIFY_TIMEOUT_SECONDS = float(os.environ.get('PASSWORD_VERIFY_TIMEOUT_SECONDS', 5))
+    
+    # Slow query log
+    SLOW_QUERY_THRESHOLD_MS = float(os.environ.get('SLOW_QUERY_THRESHOLD_MS', 200))
+    SLOW_QUERY_EXPLAIN_ANALYZE = os.environ.get('SLOW_QUERY_EXPLAIN_ANALYZE') == '1'
+    SLOW_QUERY_LOG_PATH = os.environ.get('SLOW_QUERY_LOG_PATH') or os.path.join(basedir, 'instance', 'slow_queries.log')
+    SLOW_QUERY_BUFFER_SIZE = 500
+    
+    # Async read-only API (async_api.py)
+    ASYNC_API_PORT = int(os.environ.get('ASYNC_API_PORT', 8001))
+    ASYNC_API_POOL_MIN_SIZE = int(os.environ.get('ASYNC_API_POOL_MIN_SIZE', 2))
+    ASYNC_API_POOL_MAX_SIZE = int(os.environ.get('ASYNC_API_POOL_MAX_SIZE', 20))
+    
     # Flask-Mail configuration
     MAIL_SERVER = 'localhost'
     MAIL_PORT = 8025
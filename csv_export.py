@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+Streaming CSV Export for Flavi Dairy Forecasting AI
+Exports tables to CSV in chunks, without loading the whole table into memory.
+
+- PostgreSQL: ``COPY (SELECT ...) TO STDOUT WITH CSV HEADER`` streamed through a pipe
+- Other databases: a server-side cursor read ``CHUNK_ROWS`` rows at a time
+
+Supports date-range and column filters and optional gzip, both from the
+command line and as a chunked HTTP download (``/export/<table>.csv``). Only
+the tables in ``EXPORT_TABLES`` can be exported, and credential columns are
+never written.
+"""
+
+import os
+import io
+import re
+import csv
+import sys
+import zlib
+import argparse
+import threading
+from datetime import datetime, timedelta
+
+from flask import Blueprint, Response, abort, request, stream_with_context
+from flask_login import current_user, login_required
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# Column used for date-range filters on each exportable table
+DATE_COLUMNS = {
+    'sales': 'date',
+    'inventory': 'date',
+    'order': 'created_at',
+}
+EXPORT_TABLES = tuple(DATE_COLUMNS)
+
+# Left out of every export, should an exportable table ever gain them
+CREDENTIAL_COLUMNS = ('password_hash', 'password')
+
+CHUNK_ROWS = 5000
+CHUNK_BYTES = 64 * 1024
+
+_NAMED_PARAM = re.compile(r'(?<![:\w]):(\w+)')
+
+bp = Blueprint('export', __name__)
+
+
+def _table_columns(engine, table_name):
+    """Return the exportable column names, or raise ``ValueError`` if the table cannot be exported."""
+    from sqlalchemy import inspect
+
+    if table_name not in EXPORT_TABLES:
+        raise ValueError(f"Table {table_name} cannot be exported (choose from {', '.join(EXPORT_TABLES)})")
+    inspector = inspect(engine)
+    if not inspector.has_table(table_name):
+        raise ValueError(f"Unknown table: {table_name}")
+    return [col['name'] for col in inspector.get_columns(table_name) if col['name'] not in CREDENTIAL_COLUMNS]
+
+
+def build_export_query(engine, table_name, columns=None, start_date=None, end_date=None):
+    """Build the SELECT for an export and its bind parameters.
+
+    The table must be in ``EXPORT_TABLES`` and column names are checked
+    against the catalog, so only the date bounds are user-supplied values and
+    they are always bound.
+    """
+    available = _table_columns(engine, table_name)
+    columns = list(columns or available)
+    unknown = [c for c in columns if c not in available]
+    if unknown:
+        raise ValueError(f"Unknown column(s) for {table_name}: {', '.join(unknown)}")
+
+    quote = engine.dialect.identifier_preparer.quote
+    sql = f"SELECT {', '.join(quote(c) for c in columns)} FROM {quote(table_name)}"
+
+    conditions = []
+    params = {}
+    if start_date or end_date:
+        date_column = DATE_COLUMNS.get(table_name)
+        if not date_column:
+            raise ValueError(f"Table {table_name} has no date column to filter on")
+        if start_date:
+            conditions.append(f"{quote(date_column)} >= :start_date")
+            params['start_date'] = start_date.isoformat()
+        if end_date:
+            # Inclusive end day, also for timestamp columns such as created_at
+            conditions.append(f"{quote(date_column)} < :end_date")
+            params['end_date'] = (end_date + timedelta(days=1)).isoformat()
+    if conditions:
+        sql += " WHERE " + " AND ".join(conditions)
+
+    return sql, params, columns
+
+
+def _iter_copy(engine, sql, params):
+    """Yield CSV bytes from PostgreSQL ``COPY ... TO STDOUT``."""
+    raw_conn = engine.raw_connection()
+    try:
+        with raw_conn.cursor() as cursor:
+            select = cursor.mogrify(_NAMED_PARAM.sub(r'%(\1)s', sql), params).decode()
+
+        read_fd, write_fd = os.pipe()
+        reader = os.fdopen(read_fd, 'rb')
+        writer = os.fdopen(write_fd, 'wb')
+        errors = []
+
+        def produce():
+            try:
+                with raw_conn.cursor() as cursor:
+                    cursor.copy_expert(f"COPY ({select}) TO STDOUT WITH (FORMAT csv, HEADER true)", writer)
+            except Exception as e:
+                errors.append(e)
+            finally:
+                writer.close()
+
+        producer = threading.Thread(target=produce, daemon=True)
+        producer.start()
+        try:
+            while True:
+                chunk = reader.read(CHUNK_BYTES)
+                if not chunk:
+                    break
+                yield chunk
+        finally:
+            reader.close()
+            producer.join()
+
+        if errors:
+            raise errors[0]
+    finally:
+        raw_conn.close()
+
+
+def _iter_cursor(engine, sql, params, columns):
+    """Yield CSV bytes from a server-side cursor, ``CHUNK_ROWS`` at a time."""
+    from sqlalchemy import text
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+
+    with engine.connect() as conn:
+        result = conn.execution_options(stream_results=True).execute(text(sql), params)
+        while True:
+            rows = result.fetchmany(CHUNK_ROWS)
+            if not rows:
+                break
+            writer.writerows(rows)
+            yield buffer.getvalue().encode('utf-8')
+            buffer.seek(0)
+            buffer.truncate()
+
+    remaining = buffer.getvalue()
+    if remaining:
+        yield remaining.encode('utf-8')
+
+
+def iter_csv_export(engine, table_name, columns=None, start_date=None, end_date=None, compress=False):
+    """Yield an export of ``table_name`` as CSV byte chunks (gzip if ``compress``).
+
+    The query is validated before the first chunk is produced, so bad table or
+    column names raise ``ValueError`` immediately.
+    """
+    sql, params, columns = build_export_query(engine, table_name, columns, start_date, end_date)
+
+    def generate():
+        if engine.dialect.name == 'postgresql':
+            chunks = _iter_copy(engine, sql, params)
+        else:
+            chunks = _iter_cursor(engine, sql, params, columns)
+
+        if not compress:
+            yield from chunks
+            return
+
+        compressor = zlib.compressobj(wbits=31)  # gzip container
+        for chunk in chunks:
+            data = compressor.compress(chunk)
+            if data:
+                yield data
+        yield compressor.flush()
+
+    return generate()
+
+
+def export_to_file(engine, table_name, path=None, columns=None, start_date=None, end_date=None, compress=False):
+    """Stream an export to ``path`` and return ``(path, bytes_written)``."""
+    if not path:
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        path = f"{table_name}_export_{timestamp}.csv" + ('.gz' if compress else '')
+
+    size = 0
+    with open(path, 'wb') as f:
+        for chunk in iter_csv_export(engine, table_name, columns, start_date, end_date, compress):
+            f.write(chunk)
+            size += len(chunk)
+    return path, size
+
+
+def _parse_date(value):
+    """Parse a ``YYYY-MM-DD`` string, or return None for empty values."""
+    if not value:
+        return None
+    return datetime.strptime(value, '%Y-%m-%d').date()
+
+
+@bp.route('/export/<table_name>.csv')
+@login_required
+def export_csv(table_name):
+    """Chunked CSV download: ``?start=YYYY-MM-DD&end=YYYY-MM-DD&columns=a,b&gzip=1``."""
+    from app import db
+
+    if getattr(current_user, 'role', None) != 'admin':
+        abort(403)
+
+    try:
+        start_date = _parse_date(request.args.get('start'))
+        end_date = _parse_date(request.args.get('end'))
+        columns = [c for c in request.args.get('columns', '').split(',') if c] or None
+        compress = request.args.get('gzip') in ('1', 'true', 'yes')
+        chunks = iter_csv_export(db.engine, table_name, columns, start_date, end_date, compress)
+    except ValueError as e:
+        abort(400, description=str(e))
+
+    filename = f"{table_name}_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+    headers = {'Content-Disposition': f'attachment; filename="{filename}"'}
+    if compress:
+        headers['Content-Encoding'] = 'gzip'
+
+    return Response(stream_with_context(chunks), mimetype='text/csv', headers=headers)
+
+
+def init_app(app):
+    """Register the export endpoint with the Flask app."""
+    app.register_blueprint(bp)
+
+
+def main():
+    """Main function to handle command line arguments."""
+    parser = argparse.ArgumentParser(description='Flavi Dairy streaming CSV export')
+    parser.add_argument('table', choices=EXPORT_TABLES, help='Table to export')
+    parser.add_argument('--start', help='Start date (YYYY-MM-DD), inclusive')
+    parser.add_argument('--end', help='End date (YYYY-MM-DD), inclusive')
+    parser.add_argument('--columns', help='Comma-separated list of columns to export')
+    parser.add_argument('--gzip', action='store_true', help='Compress the output with gzip')
+    parser.add_argument('--output', help='Output file (default: <table>_export_<timestamp>.csv)')
+
+    args = parser.parse_args()
+
+    from sqlalchemy import create_engine
+    from config import Config
+
+    print(f"📄 EXPORTING {args.table.upper()} TO CSV")
+    print("=" * 50)
+
+    engine = create_engine(Config.SQLALCHEMY_DATABASE_URI)
+    try:
+        columns = args.columns.split(',') if args.columns else None
+        path, size = export_to_file(
+            engine, args.table, args.output, columns,
+            _parse_date(args.start), _parse_date(args.end), args.gzip
+        )
+        print(f"✅ Exported {args.table} to {path} ({size / 1024:.1f} KB)")
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"❌ Error exporting {args.table}: {e}")
+        sys.exit(1)
+    finally:
+        engine.dispose()
+
+
+if __name__ == '__main__':
+    main()
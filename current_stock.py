@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+Current Stock for Flavi Dairy Forecasting AI
+Keeps a ``current_stock`` table with the latest inventory snapshot of every
+SKU, updated in the same transaction as each inventory insert, edit or
+delete, so "latest level per SKU" no longer scans the growing daily
+``inventory`` history.
+
+Threshold breaches are evaluated at write time as well: a ``low_stock``
+(below ``SKU.min_threshold``) or ``over_capacity`` (above
+``storage_capacity_units``) alert is opened in ``stock_alerts`` when a SKU
+crosses the line and resolved when it recovers.
+
+Writes made with raw SQL bypass the ORM hooks; run
+``python current_stock.py --rebuild`` after bulk loads. ``create_tables``
+(run by ``init_app``) fills an empty ``current_stock`` from the inventory
+history, so readers use the table directly.
+"""
+
+import os
+import sys
+import argparse
+import logging
+from datetime import datetime
+
+from sqlalchemy import (Column, Date, DateTime, Float, Index, Integer, MetaData, String, Table,
+                        event, inspect, select, text)
+from sqlalchemy.orm import Session
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+metadata = MetaData()
+
+current_stock_table = Table(
+    'current_stock', metadata,
+    Column('sku_id', String(50), primary_key=True),
+    Column('inventory_id', Integer),
+    Column('current_level', Float, nullable=False),
+    Column('production_batch_size', Float),
+    Column('shelf_life_days', Integer),
+    Column('storage_capacity_units', Float),
+    Column('as_of', Date),
+    Column('updated_at', DateTime, nullable=False),
+)
+
+stock_alerts_table = Table(
+    'stock_alerts', metadata,
+    Column('id', Integer, primary_key=True),
+    Column('sku_id', String(50), nullable=False),
+    Column('alert_type', String(20), nullable=False),
+    Column('current_level', Float, nullable=False),
+    Column('threshold', Float, nullable=False),
+    Column('created_at', DateTime, nullable=False),
+    Column('resolved_at', DateTime),
+    Index('ix_stock_alerts_open', 'resolved_at', 'sku_id'),
+)
+
+# Latest snapshot of one SKU; uses ix_inventory_sku_date so cost does not grow with history
+LATEST_INVENTORY_SQL = """
+    SELECT id, current_level, production_batch_size, shelf_life_days, storage_capacity_units, date
+      FROM inventory
+     WHERE sku_id = :sku_id
+     ORDER BY date DESC, id DESC
+     LIMIT 1
+"""
+
+UPSERT_SQL = """
+    INSERT INTO current_stock (sku_id, inventory_id, current_level, production_batch_size,
+                               shelf_life_days, storage_capacity_units, as_of, updated_at)
+    VALUES (:sku_id, :inventory_id, :current_level, :production_batch_size,
+            :shelf_life_days, :storage_capacity_units, :as_of, :updated_at)
+    ON CONFLICT (sku_id) DO UPDATE SET
+        inventory_id = excluded.inventory_id,
+        current_level = excluded.current_level,
+        production_batch_size = excluded.production_batch_size,
+        shelf_life_days = excluded.shelf_life_days,
+        storage_capacity_units = excluded.storage_capacity_units,
+        as_of = excluded.as_of,
+        updated_at = excluded.updated_at
+"""
+
+
+def _create_schema(conn):
+    metadata.create_all(conn)
+    conn.execute(text('CREATE INDEX IF NOT EXISTS ix_inventory_sku_date ON inventory (sku_id, date)'))
+
+
+def create_tables(engine):
+    """Create ``current_stock``, ``stock_alerts`` and the inventory lookup index.
+
+    An empty ``current_stock`` is filled from the inventory history, so it
+    covers every SKU before the ORM hook updates it one SKU at a time.
+    """
+    with engine.begin() as conn:
+        _create_schema(conn)
+        if conn.execute(select(current_stock_table.c.sku_id).limit(1)).first() is None:
+            _refresh_all(conn)
+
+
+def refresh_skus(conn, sku_ids):
+    """Recompute ``current_stock`` rows and alerts for ``sku_ids`` on ``conn``."""
+    now = datetime.now()
+    for sku_id in sku_ids:
+        row = conn.execute(text(LATEST_INVENTORY_SQL), {'sku_id': sku_id}).mappings().first()
+        if row is None:
+            conn.execute(current_stock_table.delete().where(current_stock_table.c.sku_id == sku_id))
+            continue
+        conn.execute(text(UPSERT_SQL), {
+            'sku_id': sku_id,
+            'inventory_id': row['id'],
+            'current_level': row['current_level'],
+            'production_batch_size': row['production_batch_size'],
+            'shelf_life_days': row['shelf_life_days'],
+            'storage_capacity_units': row['storage_capacity_units'],
+            'as_of': row['date'],
+            'updated_at': now,
+        })
+    evaluate_alerts(conn, sku_ids, now)
+
+
+def evaluate_alerts(conn, sku_ids, now=None):
+    """Open or resolve alerts for ``sku_ids`` from their current stock and thresholds."""
+    now = now or datetime.now()
+    alerts = stock_alerts_table.c
+    for sku_id in sku_ids:
+        stock = conn.execute(text(
+            'SELECT c.current_level, c.storage_capacity_units, s.min_threshold '
+            'FROM current_stock c JOIN sku s ON s.sku_id = c.sku_id WHERE c.sku_id = :sku_id'
+        ), {'sku_id': sku_id}).mappings().first()
+
+        breaches = {}
+        if stock is not None:
+            level = stock['current_level']
+            if stock['min_threshold'] is not None and level < stock['min_threshold']:
+                breaches['low_stock'] = stock['min_threshold']
+            if stock['storage_capacity_units'] is not None and level > stock['storage_capacity_units']:
+                breaches['over_capacity'] = stock['storage_capacity_units']
+
+        open_types = set(conn.execute(
+            stock_alerts_table.select().with_only_columns(alerts.alert_type)
+            .where(alerts.sku_id == sku_id, alerts.resolved_at.is_(None))
+        ).scalars())
+
+        for alert_type, threshold in breaches.items():
+            if alert_type not in open_types:
+                conn.execute(stock_alerts_table.insert().values(
+                    sku_id=sku_id, alert_type=alert_type, current_level=stock['current_level'],
+                    threshold=threshold, created_at=now,
+                ))
+                logger.info(f"⚠️  {alert_type} alert opened for {sku_id}")
+        resolved = open_types - set(breaches)
+        if resolved:
+            conn.execute(stock_alerts_table.update().where(
+                alerts.sku_id == sku_id, alerts.alert_type.in_(resolved), alerts.resolved_at.is_(None)
+            ).values(resolved_at=now))
+
+
+def _refresh_all(conn):
+    """Refresh every SKU in the inventory history or in ``current_stock``; returns the inventory SKU count."""
+    sku_ids = [row[0] for row in conn.execute(text('SELECT DISTINCT sku_id FROM inventory'))]
+    stale = conn.execute(current_stock_table.select().with_only_columns(current_stock_table.c.sku_id)).scalars()
+    refresh_skus(conn, sorted(set(sku_ids) | set(stale)))
+    return len(sku_ids)
+
+
+def rebuild_current_stock(engine):
+    """Rebuild ``current_stock`` and alerts from the full inventory history."""
+    with engine.begin() as conn:
+        _create_schema(conn)
+        return _refresh_all(conn)
+
+
+def get_current_stock(session=None):
+    """Current level of every SKU with its thresholds; one row per SKU."""
+    session = session or _default_session()
+    rows = session.execute(text(
+        'SELECT c.sku_id, s.name, c.current_level, s.min_threshold, c.storage_capacity_units, c.as_of '
+        'FROM current_stock c JOIN sku s ON s.sku_id = c.sku_id ORDER BY c.sku_id'
+    )).mappings().all()
+    return [dict(row) for row in rows]
+
+
+def get_low_stock(session=None):
+    """SKUs whose current level is below their minimum threshold."""
+    return [row for row in get_current_stock(session)
+            if row['min_threshold'] is not None and row['current_level'] < row['min_threshold']]
+
+
+def get_open_alerts(session=None):
+    """Unresolved stock alerts, newest first."""
+    session = session or _default_session()
+    alerts = stock_alerts_table.c
+    rows = session.execute(
+        stock_alerts_table.select().where(alerts.resolved_at.is_(None)).order_by(alerts.created_at.desc())
+    ).mappings().all()
+    return [dict(row) for row in rows]
+
+
+def _default_session():
+    from app import db
+
+    return db.session
+
+
+def _after_flush(session, flush_context):
+    """Refresh current stock for SKUs whose inventory (or thresholds) changed in this flush."""
+    inventory_skus, threshold_skus = set(), set()
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        table_name = getattr(obj, '__tablename__', None)
+        if table_name == 'inventory':
+            # An edit that moves a row to another SKU changes both SKUs
+            history = inspect(obj).attrs.sku_id.history
+            inventory_skus.update(sku_id for sku_id in (obj.sku_id, *history.deleted) if sku_id)
+        elif table_name == 'sku' and obj.sku_id:
+            threshold_skus.add(obj.sku_id)
+
+    if inventory_skus or threshold_skus:
+        conn = session.connection()
+        if inventory_skus:
+            refresh_skus(conn, sorted(inventory_skus))
+        if threshold_skus - inventory_skus:
+            evaluate_alerts(conn, sorted(threshold_skus - inventory_skus))
+
+
+def init_app(app):
+    """Create (and, if empty, fill) the tables and keep them updated on every ORM flush."""
+    with app.app_context():
+        create_tables(app.extensions['sqlalchemy'].engine)
+    if not event.contains(Session, 'after_flush', _after_flush):
+        event.listen(Session, 'after_flush', _after_flush)
+
+
+def main():
+    """Main function to handle command line arguments."""
+    parser = argparse.ArgumentParser(description='Flavi Dairy current stock and alerts')
+    parser.add_argument('--rebuild', action='store_true', help='Rebuild current_stock from inventory history')
+
+    args = parser.parse_args()
+
+    from app import create_app, db
+
+    app = create_app()
+    with app.app_context():
+        try:
+            if args.rebuild:
+                count = rebuild_current_stock(db.engine)
+                print(f"✅ Rebuilt current stock for {count} SKUs")
+
+            print("\n📦 Current Stock:")
+            for row in get_current_stock(db.session):
+                flag = " ⚠️" if row['min_threshold'] is not None and row['current_level'] < row['min_threshold'] else ""
+                print(f"  {row['sku_id']}: {row['current_level']:.1f} (min {row['min_threshold']}){flag}")
+
+            alerts = get_open_alerts(db.session)
+            print(f"\n🚨 Open alerts: {len(alerts)}")
+            for alert in alerts:
+                print(f"  {alert['sku_id']}: {alert['alert_type']} at {alert['current_level']:.1f} "
+                      f"(threshold {alert['threshold']:.1f}) since {alert['created_at']}")
+        except Exception as e:
+            print(f"❌ Error: {e}")
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Customer Order Statistics for Flavi Dairy Forecasting AI
+Builds the customer dashboard numbers with SQL aggregation instead of loading
+every order of the customer into Python.
+
+- one ``GROUP BY status`` query for the order counts
+- one ``ORDER BY created_at DESC LIMIT 5`` query for the recent orders,
+  served by the ``ix_order_customer_created`` index
+
+Results are cached per customer until that customer's next order is committed.
+"""
+
+import os
+import sys
+
+from sqlalchemy import func, text
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from cache_utils import TTLCache, invalidate_on_commit
+
+RECENT_ORDERS_LIMIT = 5
+
+# Safety net for writes that bypass the ORM (bulk SQL, other workers)
+STATS_CACHE_TTL_SECONDS = 300
+
+_cache = TTLCache(ttl_seconds=STATS_CACHE_TTL_SECONDS, max_entries=10000)
+
+
+def get_order_counts(customer_id):
+    """Return total/completed/pending/cancelled order counts for a customer."""
+    from app import db
+    from app.models.order import Order
+
+    rows = (
+        db.session.query(Order.status, func.count(Order.id))
+        .filter(Order.customer_id == customer_id)
+        .group_by(Order.status)
+        .all()
+    )
+    by_status = dict(rows)
+    return {
+        'total_orders': sum(by_status.values()),
+        'completed_orders': by_status.get('completed', 0),
+        'pending_orders': by_status.get('pending', 0),
+        'cancelled_orders': by_status.get('cancelled', 0),
+    }
+
+
+def get_recent_orders(customer_id, limit=RECENT_ORDERS_LIMIT):
+    """Return the customer's most recent orders, newest first."""
+    from app.models.order import Order
+
+    return (
+        Order.query
+        .filter(Order.customer_id == customer_id)
+        .order_by(Order.created_at.desc())
+        .limit(limit)
+        .all()
+    )
+
+
+def get_customer_dashboard_stats(customer_id):
+    """Return ``(stats, recent_orders)`` for the customer dashboard, cached per customer.
+
+    ``recent_orders`` are plain dicts so cached entries do not hold on to
+    session-bound ORM objects.
+    """
+    def load():
+        recent = [
+            {
+                'id': order.id,
+                'sku_id': order.sku_id,
+                'quantity': order.quantity,
+                'status': order.status,
+                'created_at': order.created_at,
+            }
+            for order in get_recent_orders(customer_id)
+        ]
+        return get_order_counts(customer_id), recent
+
+    return _cache.get_or_load(customer_id, load)
+
+
+def invalidate_customer_stats(customer_ids):
+    """Drop cached stats for the given customers."""
+    for customer_id in customer_ids:
+        _cache.invalidate(customer_id)
+
+
+def create_indexes(engine):
+    """Create the index used by the recent-orders query (safe to re-run)."""
+    with engine.begin() as conn:
+        conn.execute(text(
+            'CREATE INDEX IF NOT EXISTS ix_order_customer_created '
+            'ON "order" (customer_id, created_at DESC)'
+        ))
+
+
+def init_app(app):
+    """Invalidate a customer's cached stats whenever one of their orders is committed."""
+    invalidate_on_commit(('order',), invalidate_customer_stats, key=lambda order: order.customer_id)
+
+
+if __name__ == '__main__':
+    from app import create_app, db
+
+    app = create_app()
+    with app.app_context():
+        create_indexes(db.engine)
+        print("✅ Created index ix_order_customer_created on order (customer_id, created_at DESC)")
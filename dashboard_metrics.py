@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Admin Dashboard Metrics for Flavi Dairy Forecasting AI
+Computes every headline number on the admin ``/dashboard`` in one aggregate
+query and caches the result for a short TTL.
+
+On PostgreSQL the numbers can instead come from the ``dashboard_metrics_mv``
+materialized view (set ``DASHBOARD_METRICS_USE_MATVIEW=1``), refreshed
+concurrently by ``python dashboard_metrics.py --refresh`` from cron.
+"""
+
+import os
+import sys
+import argparse
+import logging
+
+from sqlalchemy import text
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from config import Config
+from cache_utils import TTLCache, invalidate_on_commit
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+MATVIEW_NAME = 'dashboard_metrics_mv'
+
+# Tables whose writes change the dashboard numbers
+METRIC_TABLES = ('sales', 'order', 'sku', 'customer', 'inventory')
+
+# Low stock = current stock of a SKU below its minimum threshold (see current_stock.py)
+METRICS_SQL = """
+    SELECT
+        (SELECT COALESCE(SUM(amount), 0) FROM sales) AS total_sales_amount,
+        (SELECT COUNT(*) FROM "order") AS total_orders,
+        (SELECT COUNT(*) FROM sku) AS active_skus,
+        (SELECT COUNT(*) FROM customer) AS customer_count,
+        (SELECT COUNT(*)
+           FROM current_stock c
+           JOIN sku s ON s.sku_id = c.sku_id
+          WHERE c.current_level < s.min_threshold) AS low_stock_alerts
+"""
+
+_cache = TTLCache(ttl_seconds=Config.DASHBOARD_CACHE_TTL_SECONDS, max_entries=1)
+
+
+def _query_metrics(session):
+    """Run the aggregate query (or read the materialized view)."""
+    use_matview = Config.DASHBOARD_METRICS_USE_MATVIEW and session.bind.dialect.name == 'postgresql'
+    sql = f"SELECT * FROM {MATVIEW_NAME}" if use_matview else METRICS_SQL
+    row = session.execute(text(sql)).mappings().one()
+    return {
+        'total_sales_amount': float(row['total_sales_amount'] or 0),
+        'total_orders': int(row['total_orders']),
+        'active_skus': int(row['active_skus']),
+        'customer_count': int(row['customer_count']),
+        'low_stock_alerts': int(row['low_stock_alerts']),
+    }
+
+
+def get_dashboard_metrics(session=None):
+    """Return the admin dashboard headline metrics as a dict.
+
+    Served from the in-process cache when fresh; otherwise one query is run.
+    """
+    if session is None:
+        from app import db
+        session = db.session
+    return _cache.get_or_load('metrics', lambda: _query_metrics(session))
+
+
+def invalidate_dashboard_metrics(*_):
+    """Drop the cached metrics so the next page load recomputes them."""
+    _cache.invalidate('metrics')
+
+
+def init_app(app):
+    """Invalidate the cached metrics whenever a committed write touches them."""
+    invalidate_on_commit(METRIC_TABLES, invalidate_dashboard_metrics)
+
+
+def create_materialized_view(engine):
+    """Create the PostgreSQL materialized view and the unique index needed to refresh it concurrently.
+
+    The view reads ``current_stock``, so that table is created (and
+    backfilled from the snapshots) first.
+    """
+    from current_stock import create_tables
+
+    create_tables(engine)
+    with engine.begin() as conn:
+        conn.execute(text(f"CREATE MATERIALIZED VIEW IF NOT EXISTS {MATVIEW_NAME} AS SELECT 1 AS id, m.* FROM ({METRICS_SQL}) m"))
+        conn.execute(text(f"CREATE UNIQUE INDEX IF NOT EXISTS {MATVIEW_NAME}_id ON {MATVIEW_NAME} (id)"))
+
+
+def refresh_materialized_view(engine):
+    """Refresh the materialized view without blocking dashboard reads."""
+    with engine.connect() as conn:
+        conn.execution_options(isolation_level='AUTOCOMMIT').execute(
+            text(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {MATVIEW_NAME}")
+        )
+
+
+def main():
+    """Main function to handle command line arguments."""
+    parser = argparse.ArgumentParser(description='Flavi Dairy admin dashboard metrics')
+    parser.add_argument('--create-view', action='store_true', help='Create the PostgreSQL materialized view')
+    parser.add_argument('--refresh', action='store_true', help='Refresh the PostgreSQL materialized view')
+
+    args = parser.parse_args()
+
+    from app import create_app, db
+
+    app = create_app()
+    with app.app_context():
+        try:
+            if args.create_view:
+                create_materialized_view(db.engine)
+                print(f"✅ Created materialized view {MATVIEW_NAME}")
+            if args.refresh:
+                refresh_materialized_view(db.engine)
+                print(f"✅ Refreshed materialized view {MATVIEW_NAME}")
+
+            print("\n📊 Dashboard Metrics:")
+            for name, value in get_dashboard_metrics(db.session).items():
+                print(f"  {name}: {value}")
+        except Exception as e:
+            print(f"❌ Error: {e}")
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
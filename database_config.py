@@ -6,10 +6,12 @@ Handles database connections, migrations, and configuration for both SQLite and
 
 import os
 import sys
-from sqlalchemy import create_engine, text
+import time
+import threading
+from sqlalchemy import create_engine, event, text
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.pool import QueuePool
 from flask_sqlalchemy import SQLAlchemy
-from flask_migrate import Migrate
 import logging
 from datetime import datetime
 
@@ -17,6 +19,42 @@ from datetime import datetime
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+class TimedQueuePool(QueuePool):
+    """QueuePool that reports how long each checkout blocked for a connection.
+    
+    ``on_wait(seconds)`` covers the whole ``_do_get``: waiting for a pooled
+    connection to be returned plus opening a new one when the pool grows.
+    """
+    
+    on_wait = None
+    _timing = threading.local()
+    
+    def _do_get(self):
+        # QueuePool._do_get retries by calling itself; only time the outer call
+        if getattr(self._timing, 'active', False):
+            return super()._do_get()
+        self._timing.active = True
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            self._timing.active = False
+            self.on_wait(time.perf_counter() - start)
+
+def pop_start_on_error(engine, info_key):
+    """Drop the statement start time kept in ``conn.info[info_key]`` on errors.
+    
+    Timers push a start time in ``before_cursor_execute`` and pop it in
+    ``after_cursor_execute``, which never runs for a failed statement.
+    """
+    def handle_error(context):
+        conn = context.connection
+        starts = conn.info.get(info_key) if conn is not None else None
+        if starts:
+            starts.pop()
+    
+    event.listen(engine, 'handle_error', handle_error)
+
 class DatabaseManager:
     """Manages database connections and operations."""
     
@@ -40,7 +78,9 @@ class DatabaseManager:
             # Configure database URI
             self._configure_database_uri(app)
             
-            # Initialize SQLAlchemy and Migrate
+            # Initialize SQLAlchemy and Migrate (alembic is only loaded here)
+            from flask_migrate import Migrate
+
             self.db = SQLAlchemy(app)
             self.migrate = Migrate(app, self.db)
             
@@ -156,6 +196,54 @@ class DatabaseManager:
             logger.error(f"❌ Error getting connection info: {str(e)}")
             return None
     
+    def instrument_pool(self, engine, on_checkout=None, on_connect=None, on_wait=None):
+        """Report connection-pool activity.
+        
+        ``on_wait(seconds)`` is called with the time each checkout blocked
+        (see ``TimedQueuePool``), ``on_connect(seconds)`` with the time taken
+        to open each new database connection, and ``on_checkout(status)``
+        after every checkout with the pool occupancy from ``get_pool_status``.
+        Everything survives ``engine.dispose()``.
+        """
+        if on_wait is not None:
+            if type(engine.pool) is QueuePool:
+                # A per-engine subclass keeps the callback through pool.recreate()
+                timed = type('TimedQueuePool', (TimedQueuePool,), {'on_wait': staticmethod(on_wait)})
+                engine.pool.__class__ = timed
+            else:
+                logger.info(f"Checkout wait not measured for {type(engine.pool).__name__}")
+        
+        if on_connect is not None:
+            def start_connect(dialect, connection_record, cargs, cparams):
+                connection_record.info['connect_start'] = time.perf_counter()
+            
+            def connected(dbapi_connection, connection_record):
+                start = connection_record.info.pop('connect_start', None)
+                if start is not None:
+                    on_connect(time.perf_counter() - start)
+            
+            event.listen(engine, 'do_connect', start_connect)
+            event.listen(engine, 'connect', connected)
+        
+        if on_checkout is not None:
+            def checked_out(dbapi_connection, connection_record, connection_proxy):
+                on_checkout(self.get_pool_status(engine))
+            
+            event.listen(engine, 'checkout', checked_out)
+    
+    def get_pool_status(self, engine=None):
+        """Get connection pool occupancy (size, checked out, idle, overflow)."""
+        if engine is None:
+            with self.app.app_context():
+                engine = self.db.engine
+        pool = engine.pool
+        status = {}
+        for name in ('size', 'checkedout', 'checkedin', 'overflow'):
+            method = getattr(pool, name, None)
+            if callable(method):
+                status[name] = method()
+        return status
+    
     def backup_database(self, backup_path=None):
         """Create a backup of the database."""
         try:
@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""
+Shared Database Access for Flavi Dairy Forecasting AI
+Used by the database viewer scripts so a run reuses one pooled connection per
+process instead of opening a new connection in every function.
+
+Queries use psycopg2-style placeholders (``%s`` / ``%(name)s``); they are
+translated for SQLite automatically.
+"""
+
+import os
+import re
+import sys
+import atexit
+import sqlite3
+import threading
+import logging
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Connections kept per process and database URL
+POOL_MAX_CONNECTIONS = int(os.environ.get('DB_POOL_MAX_CONNECTIONS', 1))
+
+# Dedicated connections used by table_overview(exact=True)
+EXACT_COUNT_WORKERS = 4
+
+_pools = {}
+_pools_lock = threading.Lock()
+_env_loaded = False
+
+_NAMED_PLACEHOLDER = re.compile(r'%\((\w+)\)s')
+
+
+def get_database_url():
+    """Return DATABASE_URL, loading the .env file the first time."""
+    global _env_loaded
+    if not _env_loaded:
+        from dotenv import load_dotenv
+        load_dotenv()
+        _env_loaded = True
+    return os.environ.get('DATABASE_URL')
+
+
+def is_sqlite(database_url):
+    """True if the URL points at a SQLite database."""
+    return database_url.startswith('sqlite')
+
+
+def quote_identifier(name):
+    """Quote a table or column name (works for PostgreSQL and SQLite)."""
+    return '"' + name.replace('"', '""') + '"'
+
+
+class _SQLitePool:
+    """Single shared SQLite connection with the same interface as a psycopg2 pool."""
+
+    def __init__(self, path):
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.lock = threading.Lock()
+
+    def getconn(self):
+        self.lock.acquire()
+        return self.conn
+
+    def putconn(self, conn):
+        self.lock.release()
+
+    def closeall(self):
+        self.conn.close()
+
+
+def get_pool(database_url=None):
+    """Return the process-wide pool for ``database_url`` (default: DATABASE_URL)."""
+    database_url = database_url or get_database_url()
+    if not database_url:
+        raise RuntimeError("DATABASE_URL not found in .env file")
+
+    with _pools_lock:
+        pool = _pools.get(database_url)
+        if pool is None:
+            if is_sqlite(database_url):
+                path = database_url.split(':///', 1)[-1]
+                if not os.path.exists(path):
+                    raise RuntimeError(f"Database file not found: {path}")
+                pool = _SQLitePool(path)
+            else:
+                from psycopg2.pool import ThreadedConnectionPool
+                pool = ThreadedConnectionPool(1, POOL_MAX_CONNECTIONS, database_url)
+            _pools[database_url] = pool
+            logger.debug(f"Opened connection pool for {database_url.split('@')[-1]}")
+    return pool
+
+
+@contextmanager
+def get_cursor(database_url=None):
+    """Borrow a pooled connection and yield a cursor returning dict-like rows."""
+    database_url = database_url or get_database_url()
+    pool = get_pool(database_url)
+    conn = pool.getconn()
+    try:
+        if is_sqlite(database_url):
+            cursor = conn.cursor()
+        else:
+            from psycopg2.extras import RealDictCursor
+            cursor = conn.cursor(cursor_factory=RealDictCursor)
+        try:
+            yield cursor
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            cursor.close()
+    finally:
+        pool.putconn(conn)
+
+
+def _prepare(sql, database_url):
+    """Translate psycopg2 placeholders for SQLite."""
+    if is_sqlite(database_url):
+        sql = _NAMED_PLACEHOLDER.sub(r':\1', sql).replace('%s', '?')
+    return sql
+
+
+def fetch_all(sql, params=None, database_url=None):
+    """Run a parameterized query and return all rows as dicts."""
+    database_url = database_url or get_database_url()
+    with get_cursor(database_url) as cursor:
+        cursor.execute(_prepare(sql, database_url), params or ())
+        return [dict(row) for row in cursor.fetchall()]
+
+
+def fetch_one(sql, params=None, database_url=None):
+    """Run a parameterized query and return the first row as a dict (or None)."""
+    database_url = database_url or get_database_url()
+    with get_cursor(database_url) as cursor:
+        cursor.execute(_prepare(sql, database_url), params or ())
+        row = cursor.fetchone()
+        return dict(row) if row is not None else None
+
+
+def list_tables(database_url=None):
+    """Return the names of all user tables, sorted."""
+    database_url = database_url or get_database_url()
+    if is_sqlite(database_url):
+        rows = fetch_all(
+            "SELECT name AS table_name FROM sqlite_master "
+            "WHERE type = 'table' AND name NOT LIKE 'sqlite_%' ORDER BY name",
+            database_url=database_url,
+        )
+    else:
+        rows = fetch_all(
+            "SELECT table_name FROM information_schema.tables "
+            "WHERE table_schema = 'public' AND table_type = 'BASE TABLE' ORDER BY table_name",
+            database_url=database_url,
+        )
+    return [row['table_name'] for row in rows]
+
+
+def table_columns(table_name, database_url=None):
+    """Return ``[{'column_name', 'data_type'}]`` for a table, in column order."""
+    database_url = database_url or get_database_url()
+    if is_sqlite(database_url):
+        rows = fetch_all(f"PRAGMA table_info({quote_identifier(table_name)})", database_url=database_url)
+        return [{'column_name': row['name'], 'data_type': row['type']} for row in rows]
+    return fetch_all(
+        "SELECT column_name, data_type FROM information_schema.columns "
+        "WHERE table_schema = 'public' AND table_name = %(table_name)s ORDER BY ordinal_position",
+        {'table_name': table_name},
+        database_url=database_url,
+    )
+
+
+def format_size(num_bytes):
+    """Human readable size, or ``'n/a'`` when unknown."""
+    if num_bytes is None:
+        return 'n/a'
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if num_bytes < 1024 or unit == 'GB':
+            return f"{num_bytes:.0f} {unit}" if unit == 'B' else f"{num_bytes:.1f} {unit}"
+        num_bytes /= 1024
+
+
+def format_records(table):
+    """Record count from ``table_overview``, prefixed with ``~`` when estimated."""
+    if table['records'] is None:
+        return 'unknown'
+    return f"{'~' if table['estimated'] else ''}{table['records']}"
+
+
+def _postgresql_estimates(database_url):
+    """Row estimates and sizes for every table from the PostgreSQL catalog."""
+    # reltuples is -1 for tables that were never vacuumed/analyzed (PostgreSQL 14+)
+    return fetch_all("""
+        SELECT c.relname AS table_name,
+               (CASE WHEN c.reltuples < 0 THEN COALESCE(s.n_live_tup, 0)
+                     ELSE c.reltuples END)::bigint AS records,
+               pg_table_size(c.oid) AS table_bytes,
+               pg_indexes_size(c.oid) AS index_bytes
+        FROM pg_class c
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        LEFT JOIN pg_stat_user_tables s ON s.relid = c.oid
+        WHERE n.nspname = 'public' AND c.relkind IN ('r', 'p')
+        ORDER BY c.relname
+    """, database_url=database_url)
+
+
+def _sqlite_estimates(database_url):
+    """Row estimates and sizes for every table from ``sqlite_stat1`` and ``dbstat``.
+
+    Tables that were never analyzed fall back to ``MAX(rowid)``, which SQLite
+    answers from the end of the table b-tree without scanning it.
+    """
+    tables = list_tables(database_url)
+
+    stats = {}
+    if fetch_one("SELECT 1 AS found FROM sqlite_master WHERE name = 'sqlite_stat1'", database_url=database_url):
+        for row in fetch_all("SELECT tbl, stat FROM sqlite_stat1", database_url=database_url):
+            stats.setdefault(row['tbl'], int(row['stat'].split()[0]))
+
+    sizes = {}
+    try:
+        for row in fetch_all(
+                "SELECT m.tbl_name AS table_name, m.type, SUM(d.pgsize) AS bytes "
+                "FROM dbstat d JOIN sqlite_master m ON m.name = d.name "
+                "GROUP BY m.tbl_name, m.type", database_url=database_url):
+            key = 'index_bytes' if row['type'] == 'index' else 'table_bytes'
+            sizes.setdefault(row['table_name'], {})[key] = row['bytes']
+    except Exception:
+        # dbstat is an optional compile-time extension
+        pass
+
+    overview = []
+    for table_name in tables:
+        records = stats.get(table_name)
+        if records is None:
+            try:
+                row = fetch_one(f"SELECT MAX(rowid) AS records FROM {quote_identifier(table_name)}",
+                                database_url=database_url)
+                records = row['records'] or 0
+            except Exception:
+                # WITHOUT ROWID tables have no cheap estimate
+                records = None
+        table_sizes = sizes.get(table_name, {})
+        overview.append({
+            'table_name': table_name,
+            'records': records,
+            'table_bytes': table_sizes.get('table_bytes'),
+            'index_bytes': table_sizes.get('index_bytes', 0 if table_sizes else None),
+        })
+    return overview
+
+
+def _exact_count(database_url, table_name):
+    """Count a table on its own connection so several counts can run at once."""
+    sql = f"SELECT COUNT(*) FROM {quote_identifier(table_name)}"
+    if is_sqlite(database_url):
+        conn = sqlite3.connect(database_url.split(':///', 1)[-1])
+    else:
+        import psycopg2
+        conn = psycopg2.connect(database_url)
+    try:
+        cursor = conn.cursor()
+        cursor.execute(sql)
+        return cursor.fetchone()[0]
+    finally:
+        conn.close()
+
+
+def table_overview(database_url=None, exact=False):
+    """Return ``[{'table_name', 'records', 'table_bytes', 'index_bytes', 'estimated'}]``.
+
+    By default row counts are planner estimates (``pg_class.reltuples`` /
+    ``pg_stat_user_tables`` on PostgreSQL, ``sqlite_stat1`` on SQLite) and no
+    table is scanned. With ``exact=True`` true ``COUNT(*)`` values are taken,
+    running up to ``EXACT_COUNT_WORKERS`` counts in parallel.
+    """
+    database_url = database_url or get_database_url()
+    if is_sqlite(database_url):
+        overview = _sqlite_estimates(database_url)
+    else:
+        overview = _postgresql_estimates(database_url)
+
+    for table in overview:
+        table['estimated'] = not exact
+
+    if exact and overview:
+        workers = min(len(overview), EXACT_COUNT_WORKERS)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            counts = executor.map(lambda t: _exact_count(database_url, t['table_name']), overview)
+            for table, count in zip(overview, counts):
+                table['records'] = count
+
+    return overview
+
+
+def close_all():
+    """Close every pooled connection (registered to run at exit)."""
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.closeall()
+        _pools.clear()
+
+
+atexit.register(close_all)
@@ -0,0 +1,53 @@
+"""
+Gunicorn Configuration for Flavi Dairy Forecasting AI
+Used by ``serve.py`` and ``gunicorn -c gunicorn.conf.py run:app``. Every
+setting can be overridden from the environment or the gunicorn command line.
+"""
+
+import os
+import multiprocessing
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:8000')
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'sync')
+threads = int(os.environ.get('GUNICORN_THREADS', 1))
+
+# Load the app once in the master; workers share it copy-on-write
+preload_app = os.environ.get('GUNICORN_PRELOAD', '1') == '1'
+
+# Recycle workers to cap slow memory growth; jitter keeps them from restarting together
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 1000))
+max_requests_jitter = int(os.environ.get('GUNICORN_MAX_REQUESTS_JITTER', 100))
+
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 60))
+graceful_timeout = int(os.environ.get('GUNICORN_GRACEFUL_TIMEOUT', 30))
+keepalive = int(os.environ.get('GUNICORN_KEEPALIVE', 5))
+
+accesslog = os.environ.get('GUNICORN_ACCESS_LOG', '-')
+errorlog = '-'
+loglevel = os.environ.get('GUNICORN_LOG_LEVEL', 'info')
+
+
+def when_ready(server):
+    """Master is up (and the app preloaded): warm up what workers will share."""
+    if server.cfg.preload_app:
+        from serve import warm_up_shared
+
+        warm_up_shared(server.app.wsgi())
+
+
+def post_fork(server, worker):
+    """Forget database connections copied from the master."""
+    if server.cfg.preload_app:
+        from serve import after_fork
+
+        after_fork(server.app.wsgi())
+
+
+def post_worker_init(worker):
+    """Prime this worker's caches before it accepts its first request."""
+    from serve import warm_up_worker
+
+    app = worker.wsgi
+    if hasattr(app, 'test_client'):
+        warm_up_worker(app)
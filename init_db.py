@@ -18,6 +18,8 @@ from app.models.customer import Customer
 from app.models.sku import SKU
 from app.models.sales import Sales
 from app.models.inventory import Inventory
+from password_hashing import hash_passwords_parallel
+from inventory_ledger import movements_table, seed_sample_inventory
 
 def init_database():
     """Initialize the database with all tables and sample data."""
@@ -53,13 +55,15 @@ def init_database():
             }
         ]
         
-        for admin_data in admin_users:
+        # Hash all passwords in parallel
+        password_hashes = hash_passwords_parallel([admin_data['password'] for admin_data in admin_users])
+        for admin_data, password_hash in zip(admin_users, password_hashes):
             admin = User(
                 username=admin_data['username'],
                 email=admin_data['email'],
                 role=admin_data['role']
             )
-            admin.set_password(admin_data['password'])
+            admin.password_hash = password_hash
             db.session.add(admin)
         
         print("👥 Admin users created")
@@ -93,12 +97,13 @@ def init_database():
             }
         ]
         
-        for customer_data in customers:
+        password_hashes = hash_passwords_parallel([customer_data['password'] for customer_data in customers])
+        for customer_data, password_hash in zip(customers, password_hashes):
             customer = Customer(
                 username=customer_data['username'],
                 email=customer_data['email']
             )
-            customer.set_password(customer_data['password'])
+            customer.password_hash = password_hash
             db.session.add(customer)
         
         print("👤 Customers created")
@@ -182,26 +187,17 @@ def init_database():
         # Commit all the basic data first
         db.session.commit()
         
-        # Create sample inventory records
-        print("📦 Creating inventory records...")
-        for sku in SKU.query.all():
-            # Create inventory records for the last 30 days
-            for i in range(30):
-                date = datetime.now().date() - timedelta(days=i)
-                
-                # Generate realistic inventory levels
-                base_level = random.uniform(50, 200)
-                current_level = max(0, base_level + random.uniform(-20, 20))
-                
-                inventory = Inventory(
-                    sku_id=sku.sku_id,
-                    current_level=current_level,
-                    production_batch_size=random.uniform(100, 500),
-                    shelf_life_days=random.randint(7, 30),
-                    storage_capacity_units=random.uniform(500, 1000),
-                    date=date
-                )
-                db.session.add(inventory)
+        # Inventory history for the last 30 days goes into the movement ledger;
+        # the inventory table only keeps the current row per SKU
+        print("📦 Creating inventory ledger...")
+        today = datetime.now().date()
+        current_stock = seed_sample_inventory(
+            db.session.connection(), [sku.sku_id for sku in SKU.query.all()],
+            today - timedelta(days=29), today
+        )
+        for sku_id, current in current_stock.items():
+            inventory = Inventory(sku_id=sku_id, date=today, **current)
+            db.session.add(inventory)
         
         # Create sample sales records
         print("💰 Creating sales records...")
@@ -241,6 +237,7 @@ def init_database():
         print(f"   👤 Customers: {Customer.query.count()}")
         print(f"   🏷️  SKUs: {SKU.query.count()}")
         print(f"   📦 Inventory Records: {Inventory.query.count()}")
+        print(f"   📒 Inventory Movements: {db.session.query(movements_table).count()}")
         print(f"   💰 Sales Records: {Sales.query.count()}")
         
         print("\n🔑 Default Login Credentials:")
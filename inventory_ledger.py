@@ -0,0 +1,508 @@
+#!/usr/bin/env python3
+"""
+Inventory Ledger for Flavi Dairy Forecasting AI
+Stores inventory as a movement ledger instead of a full snapshot row per SKU
+per day:
+
+- ``inventory_movements``   signed quantities by type (production, sale,
+                            spoilage, adjustment)
+- ``inventory_checkpoints`` the stock level of each SKU at the end of a day,
+                            written periodically
+- ``inventory_settings``    batch size, shelf life and storage capacity,
+                            written only when they change
+
+The stock on any date is the latest checkpoint on or before it plus the
+movements since, so an as-of query reads at most one checkpoint interval of
+movements per SKU. Daily series are rebuilt with running sums;
+``daily_inventory`` gives them in the shape of the old daily snapshots for
+the history readers (charts, capacity utilization, the history store and the
+async API).
+
+``inventory`` keeps one current row per SKU for the pages that show it; the
+seed scripts fill the ledger with ``seed_sample_inventory``. ``init_app``
+mirrors inventory rows written through the ORM into the ledger (the level
+change becomes an ``adjustment``, settings are recorded when they change),
+and builds the ledger from existing snapshots the first time it runs.
+
+Usage:
+    python inventory_ledger.py --migrate            # convert inventory snapshots
+    python inventory_ledger.py --checkpoint         # checkpoint today
+    python inventory_ledger.py --as-of 2025-01-31
+"""
+
+import os
+import sys
+import random
+import argparse
+import logging
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import (Column, Date, DateTime, Float, Index, Integer, MetaData, String, Table,
+                        bindparam, event, func, inspect, select, text)
+from sqlalchemy.orm import Session
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+MOVEMENT_TYPES = ('production', 'sale', 'spoilage', 'adjustment')
+CHECKPOINT_INTERVAL_DAYS = 7
+
+metadata = MetaData()
+
+movements_table = Table(
+    'inventory_movements', metadata,
+    Column('id', Integer, primary_key=True),
+    Column('sku_id', String(50), nullable=False),
+    Column('movement_date', Date, nullable=False),
+    Column('movement_type', String(20), nullable=False),
+    Column('quantity', Float, nullable=False),
+    Column('reference', String(100)),
+    Column('created_at', DateTime, nullable=False),
+    Index('ix_inventory_movements_sku_date', 'sku_id', 'movement_date'),
+)
+
+checkpoints_table = Table(
+    'inventory_checkpoints', metadata,
+    Column('sku_id', String(50), primary_key=True),
+    Column('date', Date, primary_key=True),
+    Column('level', Float, nullable=False),
+    Column('created_at', DateTime, nullable=False),
+)
+
+settings_table = Table(
+    'inventory_settings', metadata,
+    Column('sku_id', String(50), primary_key=True),
+    Column('effective_date', Date, primary_key=True),
+    Column('production_batch_size', Float),
+    Column('shelf_life_days', Integer),
+    Column('storage_capacity_units', Float),
+)
+
+SETTING_COLUMNS = ('production_batch_size', 'shelf_life_days', 'storage_capacity_units')
+
+# Latest checkpoint on or before :as_of plus every later movement up to :as_of;
+# {sku_filter} optionally restricts both to :sku_ids
+STOCK_AS_OF_SQL = """
+    WITH latest AS (
+        SELECT sku_id, MAX(date) AS date
+          FROM inventory_checkpoints
+         WHERE date <= :as_of {sku_filter}
+         GROUP BY sku_id
+    ),
+    base AS (
+        SELECT c.sku_id, c.date, c.level
+          FROM inventory_checkpoints c
+          JOIN latest l ON l.sku_id = c.sku_id AND l.date = c.date
+    )
+    SELECT sku_id, SUM(amount) AS level
+      FROM (
+            SELECT sku_id, level AS amount FROM base
+            UNION ALL
+            SELECT m.sku_id, m.quantity
+              FROM inventory_movements m
+              LEFT JOIN base b ON b.sku_id = m.sku_id
+             WHERE m.movement_date <= :as_of {movement_sku_filter}
+               AND (b.date IS NULL OR m.movement_date > b.date)
+           ) t
+     GROUP BY sku_id
+"""
+
+
+def create_tables(engine):
+    """Create the ledger tables (safe to re-run); ``engine`` may also be a connection."""
+    metadata.create_all(engine)
+
+
+def _signed(movement_type, quantity):
+    """Production adds stock, sales and spoilage remove it, adjustments keep their sign."""
+    if movement_type not in MOVEMENT_TYPES:
+        raise ValueError(f"Unknown movement type: {movement_type}")
+    if movement_type == 'production':
+        return abs(quantity)
+    if movement_type in ('sale', 'spoilage'):
+        return -abs(quantity)
+    return quantity
+
+
+def record_movement(conn, sku_id, movement_type, quantity, movement_date=None, reference=None):
+    """Append one movement to the ledger on ``conn``.
+
+    Checkpoints of the SKU on or after ``movement_date`` already summed the
+    movements before them, so a back-dated movement is added to them as well.
+    """
+    movement_date = movement_date or datetime.now().date()
+    quantity = _signed(movement_type, quantity)
+    conn.execute(movements_table.insert().values(
+        sku_id=sku_id,
+        movement_date=movement_date,
+        movement_type=movement_type,
+        quantity=quantity,
+        reference=reference,
+        created_at=datetime.now(),
+    ))
+    checkpoints = checkpoints_table.c
+    conn.execute(checkpoints_table.update().where(
+        checkpoints.sku_id == sku_id, checkpoints.date >= movement_date,
+    ).values(level=checkpoints.level + quantity))
+
+
+def set_settings(conn, sku_id, effective_date=None, **values):
+    """Record new batch size / shelf life / storage capacity if any of them changed."""
+    effective_date = effective_date or datetime.now().date()
+    current = settings_as_of(conn, effective_date, [sku_id]).get(sku_id, {})
+    merged = {name: values.get(name, current.get(name)) for name in SETTING_COLUMNS}
+    if current and all(merged[name] == current.get(name) for name in SETTING_COLUMNS):
+        return False
+    conn.execute(settings_table.delete().where(
+        settings_table.c.sku_id == sku_id, settings_table.c.effective_date == effective_date,
+    ))
+    conn.execute(settings_table.insert().values(sku_id=sku_id, effective_date=effective_date, **merged))
+    return True
+
+
+def stock_as_of(conn, as_of=None, sku_ids=None):
+    """Return ``{sku_id: level}`` at the end of ``as_of`` (default: today)."""
+    as_of = as_of or datetime.now().date()
+    if sku_ids is None:
+        query = text(STOCK_AS_OF_SQL.format(sku_filter='', movement_sku_filter=''))
+        rows = conn.execute(query, {'as_of': as_of}).all()
+        return {sku_id: float(level or 0) for sku_id, level in rows}
+
+    sku_ids = list(sku_ids)
+    if not sku_ids:
+        return {}
+    query = text(STOCK_AS_OF_SQL.format(
+        sku_filter='AND sku_id IN :sku_ids', movement_sku_filter='AND m.sku_id IN :sku_ids',
+    )).bindparams(bindparam('sku_ids', expanding=True))
+    rows = conn.execute(query, {'as_of': as_of, 'sku_ids': sku_ids}).all()
+    levels = {sku_id: float(level or 0) for sku_id, level in rows}
+    return {sku_id: levels.get(sku_id, 0.0) for sku_id in sku_ids}
+
+
+def settings_as_of(conn, as_of=None, sku_ids=None):
+    """Return ``{sku_id: {setting: value}}`` in effect on ``as_of``."""
+    as_of = as_of or datetime.now().date()
+    settings = settings_table.c
+    latest = (
+        select(settings.sku_id, func.max(settings.effective_date).label('effective_date'))
+        .where(settings.effective_date <= as_of)
+        .group_by(settings.sku_id)
+    )
+    if sku_ids is not None:
+        latest = latest.where(settings.sku_id.in_(list(sku_ids)))
+    latest = latest.subquery()
+    rows = conn.execute(
+        select(settings_table).join(
+            latest, (latest.c.sku_id == settings.sku_id) & (latest.c.effective_date == settings.effective_date)
+        )
+    ).mappings().all()
+    return {row['sku_id']: {name: row[name] for name in SETTING_COLUMNS} for row in rows}
+
+
+def create_checkpoints(engine, as_of=None):
+    """Checkpoint every SKU's level at the end of ``as_of`` (default: yesterday)."""
+    as_of = as_of or datetime.now().date() - timedelta(days=1)
+    with engine.begin() as conn:
+        levels = stock_as_of(conn, as_of)
+        _write_checkpoint(conn, as_of, levels)
+    logger.info(f"Checkpointed {len(levels)} SKUs at {as_of}")
+    return len(levels)
+
+
+def _write_checkpoint(conn, as_of, levels):
+    """Replace the checkpoint rows of ``as_of`` with ``{sku_id: level}``."""
+    conn.execute(checkpoints_table.delete().where(
+        checkpoints_table.c.date == as_of, checkpoints_table.c.sku_id.in_(list(levels)),
+    ))
+    if levels:
+        now = datetime.now()
+        conn.execute(checkpoints_table.insert(), [
+            {'sku_id': sku_id, 'date': as_of, 'level': level, 'created_at': now}
+            for sku_id, level in levels.items()
+        ])
+
+
+def seed_sample_inventory(conn, sku_ids, start_date, end_date, rng=random):
+    """Fill the ledger with sample history for ``sku_ids`` on ``conn``.
+
+    Each SKU gets settings once, an opening balance, a sale every day, a
+    production batch whenever stock falls below two days of demand and the
+    odd spoilage, with checkpoints every ``CHECKPOINT_INTERVAL_DAYS``.
+    Returns ``{sku_id: {'current_level': ..., <settings>}}`` at ``end_date``
+    so the caller can write the current ``inventory`` row.
+    """
+    create_tables(conn)
+    days = (end_date - start_date).days + 1
+    state = {}
+    levels = {}
+    for sku_id in sku_ids:
+        settings = {
+            'production_batch_size': round(rng.uniform(100, 500), 1),
+            'shelf_life_days': rng.randint(7, 30),
+            'storage_capacity_units': round(rng.uniform(500, 1000), 1),
+        }
+        set_settings(conn, sku_id, start_date, **settings)
+        daily_demand = rng.uniform(20, 60)
+        level = round(rng.uniform(50, 200), 1)
+        record_movement(conn, sku_id, 'adjustment', level, start_date, reference='opening balance')
+
+        for offset in range(days):
+            day = start_date + timedelta(days=offset)
+            if level < 2 * daily_demand and level + settings['production_batch_size'] <= settings['storage_capacity_units']:
+                record_movement(conn, sku_id, 'production', settings['production_batch_size'], day)
+                level += settings['production_batch_size']
+            sold = round(min(max(rng.gauss(daily_demand, daily_demand * 0.2), 0), level), 1)
+            if sold:
+                record_movement(conn, sku_id, 'sale', sold, day)
+                level -= sold
+            if rng.random() < 0.1 and level > 0:
+                spoiled = round(level * rng.uniform(0, 0.05), 1)
+                if spoiled:
+                    record_movement(conn, sku_id, 'spoilage', spoiled, day)
+                    level -= spoiled
+            level = round(level, 1)
+            if offset % CHECKPOINT_INTERVAL_DAYS == 0:
+                levels.setdefault(day, {})[sku_id] = level
+        state[sku_id] = {'current_level': level, **settings}
+
+    for day, day_levels in levels.items():
+        _write_checkpoint(conn, day, day_levels)
+    return state
+
+
+def daily_stock_series(engine, sku_ids, start_date, end_date):
+    """End-of-day stock per SKU for every day in the range, as a DataFrame.
+
+    Columns: ``sku_id``, ``date``, ``level`` and the day's ``production``,
+    ``sale``, ``spoilage`` and ``adjustment`` totals. Built from the opening
+    level plus a running sum of daily movement totals.
+    """
+    import numpy as np
+    import pandas as pd
+    from typed_loader import load_table
+
+    sku_ids = list(sku_ids)
+    with engine.connect() as conn:
+        opening = stock_as_of(conn, start_date - timedelta(days=1), sku_ids)
+
+    moves = load_table(
+        engine, 'inventory_movements', columns=['sku_id', 'movement_date', 'movement_type', 'quantity'],
+        where='movement_date >= :start AND movement_date <= :end',
+        params={'start': start_date, 'end': end_date},
+    )
+    moves = moves[moves['sku_id'].astype(str).isin(sku_ids)]
+
+    days = pd.date_range(start_date, end_date, freq='D')
+    index = pd.MultiIndex.from_product([sku_ids, days], names=['sku_id', 'date'])
+    daily = (
+        moves.assign(sku_id=moves['sku_id'].astype(str), movement_type=moves['movement_type'].astype(str),
+                     date=pd.to_datetime(moves['movement_date']).dt.normalize())
+        .pivot_table(index=['sku_id', 'date'], columns='movement_type', values='quantity', aggfunc='sum')
+        .reindex(index=index, columns=list(MOVEMENT_TYPES))
+        .fillna(0.0)
+    )
+
+    net = daily.sum(axis=1).to_numpy().reshape(len(sku_ids), len(days))
+    base = np.array([opening[sku_id] for sku_id in sku_ids])[:, None]
+    daily['level'] = (base + np.cumsum(net, axis=1)).ravel()
+    return daily.reset_index()
+
+
+def daily_inventory(engine, start_date, end_date, sku_ids=None):
+    """End-of-day stock and settings per SKU and day, shaped like the old ``inventory`` snapshots.
+
+    Columns: ``sku_id``, ``date``, ``current_level``, ``production_batch_size``,
+    ``shelf_life_days`` and ``storage_capacity_units``. ``sku_ids`` defaults to
+    every SKU in the ledger; days before a SKU's first movement are left out.
+    """
+    import pandas as pd
+
+    columns = ['sku_id', 'date', 'current_level', *SETTING_COLUMNS]
+    moves, settings = movements_table.c, settings_table.c
+    first_query = select(moves.sku_id, func.min(moves.movement_date)).group_by(moves.sku_id)
+    settings_query = select(settings_table).where(settings.effective_date <= end_date)
+    if sku_ids is not None:
+        sku_ids = [str(sku_id) for sku_id in sku_ids]
+        first_query = first_query.where(moves.sku_id.in_(sku_ids))
+        settings_query = settings_query.where(settings.sku_id.in_(sku_ids))
+    with engine.connect() as conn:
+        first = {str(sku_id): pd.Timestamp(day) for sku_id, day in conn.execute(first_query)}
+        changes = pd.DataFrame(conn.execute(settings_query).mappings().all(),
+                               columns=['sku_id', 'effective_date', *SETTING_COLUMNS])
+    if not first:
+        return pd.DataFrame(columns=columns)
+    start_date = max(pd.Timestamp(start_date), min(first.values())).date()
+    if start_date > end_date:
+        return pd.DataFrame(columns=columns)
+
+    stock = daily_stock_series(engine, sorted(first), start_date, end_date)
+    stock = stock[stock['date'] >= stock['sku_id'].map(first)]
+    stock = stock.rename(columns={'level': 'current_level'})[['sku_id', 'date', 'current_level']]
+    changes = changes.assign(sku_id=changes['sku_id'].astype(str),
+                             effective_date=pd.to_datetime(changes['effective_date'])) \
+        .astype({name: 'float64' for name in SETTING_COLUMNS})
+    merged = pd.merge_asof(
+        stock.sort_values('date'), changes.sort_values('effective_date'),
+        left_on='date', right_on='effective_date', by='sku_id', direction='backward',
+    )
+    return merged[columns].sort_values(['sku_id', 'date']).reset_index(drop=True)
+
+
+def migrate_from_snapshots(engine, checkpoint_interval_days=CHECKPOINT_INTERVAL_DAYS):
+    """Convert the daily ``inventory`` snapshot table into ledger rows.
+
+    Level changes become ``adjustment`` movements (the first snapshot of a
+    SKU is its opening balance), the level every ``checkpoint_interval_days``
+    becomes a checkpoint, and settings are kept only where they change.
+    Existing ledger rows are replaced. Returns row counts per table.
+    """
+    import pandas as pd
+    from typed_loader import load_table
+
+    create_tables(engine)
+    snapshots = load_table(
+        engine, 'inventory',
+        columns=['sku_id', 'current_level', 'production_batch_size', 'shelf_life_days',
+                 'storage_capacity_units', 'date'],
+        order_by='sku_id, date, id',
+    )
+    snapshots['sku_id'] = snapshots['sku_id'].astype(str)
+    snapshots['date'] = pd.to_datetime(snapshots['date']).dt.date
+    # Several snapshots on one day: the last one wins
+    snapshots = snapshots.drop_duplicates(['sku_id', 'date'], keep='last').reset_index(drop=True)
+
+    grouped = snapshots.groupby('sku_id', sort=False)
+    first_date = grouped['date'].transform('min')
+    day_number = (pd.to_datetime(snapshots['date']) - pd.to_datetime(first_date)).dt.days
+    checkpoints = snapshots[day_number % checkpoint_interval_days == 0]
+
+    # The first snapshot is the opening balance, so movements alone sum to the level
+    change = grouped['current_level'].diff().fillna(snapshots['current_level'])
+    movements = snapshots[change != 0].assign(quantity=change[change != 0])
+
+    previous = grouped[list(SETTING_COLUMNS)].shift()
+    current = snapshots[list(SETTING_COLUMNS)]
+    settings_changed = (previous.ne(current) & ~(previous.isna() & current.isna())).any(axis=1)
+    settings = snapshots[settings_changed]
+
+    now = datetime.now()
+    with engine.begin() as conn:
+        for table in (movements_table, checkpoints_table, settings_table):
+            conn.execute(table.delete())
+        if len(checkpoints):
+            conn.execute(checkpoints_table.insert(), [
+                {'sku_id': row.sku_id, 'date': row.date, 'level': float(row.current_level), 'created_at': now}
+                for row in checkpoints.itertuples()
+            ])
+        if len(movements):
+            conn.execute(movements_table.insert(), [
+                {'sku_id': row.sku_id, 'movement_date': row.date, 'movement_type': 'adjustment',
+                 'quantity': float(row.quantity), 'reference': 'inventory snapshot', 'created_at': now}
+                for row in movements.itertuples()
+            ])
+        if len(settings):
+            conn.execute(settings_table.insert(), [
+                {'sku_id': row.sku_id, 'effective_date': row.date,
+                 'production_batch_size': _optional(row.production_batch_size, float),
+                 'shelf_life_days': _optional(row.shelf_life_days, int),
+                 'storage_capacity_units': _optional(row.storage_capacity_units, float)}
+                for row in settings.itertuples()
+            ])
+
+    counts = {
+        'inventory': len(snapshots),
+        'inventory_checkpoints': len(checkpoints),
+        'inventory_movements': len(movements),
+        'inventory_settings': len(settings),
+    }
+    logger.info(f"Migrated inventory snapshots: {counts}")
+    return counts
+
+
+def _optional(value, cast):
+    import pandas as pd
+
+    return None if pd.isna(value) else cast(value)
+
+
+def _after_flush(session, flush_context):
+    """Mirror inventory rows written through the ORM into the ledger."""
+    rows = [obj for obj in list(session.new) + list(session.dirty)
+            if getattr(obj, '__tablename__', None) == 'inventory' and obj.sku_id is not None]
+    if not rows:
+        return
+
+    conn = session.connection()
+    for obj in rows:
+        attrs = inspect(obj).attrs
+        if obj not in session.new and not any(
+                attrs[name].history.has_changes() for name in ('current_level', *SETTING_COLUMNS) if name in attrs):
+            continue
+        sku_id = str(obj.sku_id)
+        as_of = obj.date or datetime.now().date()
+        if obj.current_level is not None:
+            change = float(obj.current_level) - stock_as_of(conn, as_of, [sku_id])[sku_id]
+            if abs(change) > 1e-9:
+                record_movement(conn, sku_id, 'adjustment', change, as_of, reference=f'inventory {obj.id}')
+        settings = {name: getattr(obj, name) for name in SETTING_COLUMNS if getattr(obj, name, None) is not None}
+        if settings:
+            set_settings(conn, sku_id, as_of, **settings)
+
+
+def init_app(app):
+    """Create the ledger, build it from snapshots if empty, and mirror ORM inventory writes."""
+    with app.app_context():
+        engine = app.extensions['sqlalchemy'].engine
+        create_tables(engine)
+        with engine.connect() as conn:
+            empty = conn.execute(select(movements_table.c.id).limit(1)).first() is None
+            has_snapshots = inspect(conn).has_table('inventory') and \
+                conn.execute(text('SELECT 1 FROM inventory LIMIT 1')).first() is not None
+        if empty and has_snapshots:
+            migrate_from_snapshots(engine)
+    if not event.contains(Session, 'after_flush', _after_flush):
+        event.listen(Session, 'after_flush', _after_flush)
+
+
+def main():
+    """Main function to handle command line arguments."""
+    parser = argparse.ArgumentParser(description='Flavi Dairy inventory ledger')
+    parser.add_argument('--migrate', action='store_true', help='Convert inventory snapshots into the ledger')
+    parser.add_argument('--checkpoint', metavar='DATE', nargs='?', const='',
+                        help='Checkpoint levels at the end of DATE (default: yesterday)')
+    parser.add_argument('--as-of', metavar='DATE', help='Show stock at the end of DATE (YYYY-MM-DD)')
+
+    args = parser.parse_args()
+
+    from app import create_app, db
+
+    app = create_app()
+    with app.app_context():
+        print("📒 Inventory Ledger")
+        print("=" * 50)
+        try:
+            create_tables(db.engine)
+            if args.migrate:
+                for table_name, count in migrate_from_snapshots(db.engine).items():
+                    print(f"  {table_name}: {count} rows")
+            if args.checkpoint is not None:
+                checkpoint_date = date.fromisoformat(args.checkpoint) if args.checkpoint else None
+                print(f"✅ Checkpointed {create_checkpoints(db.engine, checkpoint_date)} SKUs")
+
+            as_of = date.fromisoformat(args.as_of) if args.as_of else datetime.now().date()
+            with db.engine.connect() as conn:
+                levels = stock_as_of(conn, as_of)
+            print(f"\n📦 Stock as of {as_of}:")
+            for sku_id, level in sorted(levels.items()):
+                print(f"  {sku_id}: {level:.1f}")
+        except Exception as e:
+            print(f"❌ Error: {e}")
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
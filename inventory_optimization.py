@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+Inventory Optimization Engine for Flavi Dairy Forecasting AI
+Computes safety stock, reorder point, economic batch quantity and days of
+cover for every SKU in one vectorized NumPy pass, and stores the resulting
+production recommendations in the ``inventory_recommendations`` table.
+
+Inputs are per-SKU arrays: forecast mean daily demand and forecast error
+(standard deviation of daily demand), plus the SKU/inventory attributes
+``production_batch_size``, ``shelf_life_days`` and ``storage_capacity_units``.
+Without forecasts, demand statistics are estimated from recent sales.
+
+Usage:
+    python inventory_optimization.py                # plan and save
+    python inventory_optimization.py --dry-run
+    python inventory_optimization.py --benchmark 10000
+"""
+
+import os
+import sys
+import time
+import argparse
+import logging
+from datetime import datetime, timedelta
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import Column, DateTime, Float, MetaData, String, Table, text
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from config import Config
+from typed_loader import load_table
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+metadata = MetaData()
+
+recommendations_table = Table(
+    'inventory_recommendations', metadata,
+    Column('sku_id', String(50), primary_key=True),
+    Column('generated_at', DateTime, nullable=False),
+    Column('mean_daily_demand', Float, nullable=False),
+    Column('demand_std', Float, nullable=False),
+    Column('lead_time_days', Float, nullable=False),
+    Column('current_level', Float, nullable=False),
+    Column('safety_stock', Float, nullable=False),
+    Column('reorder_point', Float, nullable=False),
+    Column('batch_quantity', Float, nullable=False),
+    Column('days_of_cover', Float),
+    Column('recommended_quantity', Float, nullable=False),
+    Column('action', String(20), nullable=False),
+)
+
+# Current stock per SKU (see current_stock.py) joined to the SKU's planning attributes
+PLANNING_INPUTS_SQL = """
+    SELECT s.sku_id,
+           s.processing_time_hours,
+           s.packaging_time_hours,
+           s.min_threshold,
+           COALESCE(c.current_level, 0) AS current_level,
+           c.production_batch_size,
+           c.shelf_life_days,
+           c.storage_capacity_units
+      FROM sku s
+      LEFT JOIN current_stock c ON c.sku_id = s.sku_id
+     ORDER BY s.sku_id
+"""
+
+
+def optimize_inventory(mean_demand, demand_std, lead_time_days, current_level,
+                       batch_size, shelf_life_days, storage_capacity_units,
+                       service_level=None, setup_cost=None, holding_cost_per_day=None):
+    """Plan every SKU at once; all arguments are equal-length arrays (or scalars).
+
+    - safety stock = z(service level) * demand_std * sqrt(lead time)
+    - reorder point = mean demand over the lead time + safety stock
+    - batch quantity = economic batch quantity sqrt(2 * D * S / H), rounded up
+      to whole production batches and capped by what can be sold before the
+      shelf life runs out and by the free storage capacity
+    - days of cover = current level / mean daily demand
+    - recommended quantity = enough batch quantities to get back above the
+      reorder point, in whole batches that fit the free storage
+
+    Returns a dict of arrays, including ``recommended_quantity`` and ``action``
+    (``produce``, ``ok`` or ``overstock``).
+    """
+    service_level = Config.INVENTORY_SERVICE_LEVEL if service_level is None else service_level
+    setup_cost = Config.PRODUCTION_SETUP_COST if setup_cost is None else setup_cost
+    holding_cost_per_day = Config.HOLDING_COST_PER_UNIT_DAY if holding_cost_per_day is None else holding_cost_per_day
+
+    mean_demand = np.maximum(np.asarray(mean_demand, dtype=np.float64), 0.0)
+    demand_std = np.maximum(np.asarray(demand_std, dtype=np.float64), 0.0)
+    lead_time_days = np.maximum(np.asarray(lead_time_days, dtype=np.float64), 0.0)
+    current_level = np.asarray(current_level, dtype=np.float64)
+    batch_size = np.maximum(np.nan_to_num(np.asarray(batch_size, dtype=np.float64), nan=1.0), 1.0)
+    shelf_life_days = np.nan_to_num(np.asarray(shelf_life_days, dtype=np.float64), nan=np.inf)
+    storage_capacity_units = np.nan_to_num(np.asarray(storage_capacity_units, dtype=np.float64), nan=np.inf)
+
+    z = np.vectorize(NormalDist().inv_cdf, otypes=[np.float64])(service_level)
+    safety_stock = z * demand_std * np.sqrt(lead_time_days)
+    reorder_point = mean_demand * lead_time_days + safety_stock
+
+    # Economic batch quantity on daily rates: sqrt(2 * daily demand * setup cost / holding cost per day)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ebq = np.sqrt(2.0 * mean_demand * setup_cost / holding_cost_per_day)
+    ebq = np.nan_to_num(ebq, nan=0.0, posinf=0.0)
+
+    # Stock beyond what sells before expiry, or beyond free storage, is waste
+    with np.errstate(invalid='ignore'):
+        # No shelf life means no expiry, even for SKUs without demand (0 * inf)
+        sellable = np.where(np.isinf(shelf_life_days), np.inf, mean_demand * shelf_life_days - safety_stock)
+    storable = storage_capacity_units - safety_stock
+    cap = np.minimum(sellable, storable)
+    max_batches = np.floor(np.maximum(cap, 0.0) / batch_size)
+    batches = np.clip(np.ceil(ebq / batch_size), 1.0, np.maximum(max_batches, 1.0))
+    batch_quantity = np.where(mean_demand > 0, batches * batch_size, 0.0)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        days_of_cover = np.where(mean_demand > 0, current_level / mean_demand, np.inf)
+        runs = np.ceil((reorder_point - current_level) / batch_quantity)
+    produce = (current_level <= reorder_point) & (batch_quantity > 0)
+    recommended_quantity = np.where(produce, np.maximum(np.nan_to_num(runs, nan=1.0), 1.0) * batch_quantity, 0.0)
+    free_storage = np.maximum(storage_capacity_units - current_level, 0.0)
+    recommended_quantity = np.minimum(recommended_quantity, np.floor(free_storage / batch_size) * batch_size)
+
+    overstock = ~produce & ((current_level > reorder_point + batch_quantity) |
+                            (current_level > storage_capacity_units) |
+                            (days_of_cover > shelf_life_days))
+    action = np.where(produce, 'produce', np.where(overstock, 'overstock', 'ok'))
+
+    return {
+        'safety_stock': safety_stock,
+        'reorder_point': reorder_point,
+        'batch_quantity': batch_quantity,
+        'days_of_cover': days_of_cover,
+        'recommended_quantity': recommended_quantity,
+        'action': action,
+    }
+
+
+def load_planning_inputs(engine):
+    """One row per SKU: planning attributes and the latest inventory level."""
+    with engine.connect() as conn:
+        frame = pd.read_sql_query(text(PLANNING_INPUTS_SQL), conn)
+    hours = frame['processing_time_hours'].fillna(0) + frame['packaging_time_hours'].fillna(0)
+    frame['lead_time_days'] = hours / 24.0 + Config.PLANNING_REVIEW_PERIOD_DAYS
+    return frame
+
+
+def daily_demand(engine, sku_ids, days=90, end_date=None):
+    """Units sold per SKU and day over the last ``days`` days, as an (SKUs x days) DataFrame.
+
+    Days without sales count as zero demand.
+    """
+    end_date = end_date or datetime.now().date()
+    start_date = end_date - timedelta(days=days - 1)
+    sales = load_table(
+        engine, 'sales', columns=['sku_id', 'quantity_sold', 'date'],
+        where='date >= :start AND date < :end',
+        params={'start': start_date, 'end': end_date + timedelta(days=1)},
+    )
+
+    daily = pd.DataFrame(0.0, index=pd.Index(sku_ids, name='sku_id'),
+                         columns=pd.date_range(start_date, end_date, freq='D'))
+    if not sales.empty:
+        sales['day'] = sales['date'].dt.normalize()
+        totals = sales.groupby([sales['sku_id'].astype(str), 'day'])['quantity_sold'].sum().unstack(fill_value=0)
+        daily = daily.add(totals.reindex(index=daily.index, columns=daily.columns, fill_value=0), fill_value=0)
+    return daily
+
+
+def demand_statistics(engine, sku_ids, days=90, end_date=None):
+    """Mean and standard deviation of daily units sold per SKU over ``days``.
+
+    Used when no forecast is given.
+    """
+    values = daily_demand(engine, sku_ids, days, end_date).to_numpy()
+    return values.mean(axis=1), values.std(axis=1, ddof=1) if values.shape[1] > 1 else np.zeros(len(sku_ids))
+
+
+def build_recommendations(engine, forecast_mean=None, forecast_error=None, history_days=90, **params):
+    """Plan all SKUs and return the recommendations as a DataFrame.
+
+    ``forecast_mean``/``forecast_error`` may be dicts keyed by SKU id or arrays
+    aligned with the SKUs ordered by id; missing values fall back to demand
+    statistics from the last ``history_days`` of sales.
+    """
+    inputs = load_planning_inputs(engine)
+    sku_ids = inputs['sku_id'].astype(str).tolist()
+
+    mean_demand, demand_std = demand_statistics(engine, sku_ids, days=history_days)
+    if forecast_mean is not None:
+        mean_demand = _align(forecast_mean, sku_ids, mean_demand)
+    if forecast_error is not None:
+        demand_std = _align(forecast_error, sku_ids, demand_std)
+
+    plan = optimize_inventory(
+        mean_demand, demand_std, inputs['lead_time_days'].to_numpy(),
+        inputs['current_level'].to_numpy(), inputs['production_batch_size'].to_numpy(),
+        inputs['shelf_life_days'].to_numpy(), inputs['storage_capacity_units'].to_numpy(),
+        **params,
+    )
+
+    return pd.DataFrame({
+        'sku_id': sku_ids,
+        'generated_at': datetime.now().replace(microsecond=0),
+        'mean_daily_demand': mean_demand,
+        'demand_std': demand_std,
+        'lead_time_days': inputs['lead_time_days'].to_numpy(),
+        'current_level': inputs['current_level'].to_numpy(dtype=np.float64),
+        **plan,
+    })
+
+
+def _align(values, sku_ids, fallback):
+    """Forecast values as an array in ``sku_ids`` order, gaps filled from ``fallback``."""
+    if isinstance(values, dict):
+        values = [values.get(sku_id, np.nan) for sku_id in sku_ids]
+    values = np.asarray(values, dtype=np.float64)
+    return np.where(np.isnan(values), fallback, values)
+
+
+def save_recommendations(engine, recommendations):
+    """Replace the stored recommendations with ``recommendations`` in one transaction."""
+    frame = recommendations.copy()
+    frame['days_of_cover'] = frame['days_of_cover'].replace([np.inf, -np.inf], np.nan)
+    frame = frame.astype(object).where(frame.notna(), None)
+    rows = frame.to_dict('records')
+
+    metadata.create_all(engine, tables=[recommendations_table])
+    with engine.begin() as conn:
+        conn.execute(recommendations_table.delete())
+        if rows:
+            conn.execute(recommendations_table.insert(), rows)
+    logger.info(f"Saved {len(rows)} inventory recommendations")
+    return len(rows)
+
+
+def benchmark(sku_count):
+    """Time ``optimize_inventory`` on ``sku_count`` random SKUs."""
+    rng = np.random.default_rng(42)
+    mean_demand = rng.uniform(10, 2000, sku_count)
+    args = (
+        mean_demand,
+        mean_demand * rng.uniform(0.05, 0.3, sku_count),
+        rng.uniform(1, 3, sku_count),
+        rng.uniform(0, 20000, sku_count),
+        rng.choice([100, 500, 1000], sku_count),
+        rng.integers(3, 365, sku_count),
+        rng.uniform(5000, 50000, sku_count),
+    )
+    start = time.perf_counter()
+    optimize_inventory(*args)
+    return time.perf_counter() - start
+
+
+def main():
+    """Main function to handle command line arguments."""
+    parser = argparse.ArgumentParser(description='Flavi Dairy inventory optimization')
+    parser.add_argument('--service-level', type=float, help=f'Target service level (default: {Config.INVENTORY_SERVICE_LEVEL})')
+    parser.add_argument('--history-days', type=int, default=90, help='Days of sales used for demand statistics')
+    parser.add_argument('--dry-run', action='store_true', help='Print recommendations without saving them')
+    parser.add_argument('--benchmark', type=int, metavar='SKUS', help='Time the engine on random SKUs and exit')
+
+    args = parser.parse_args()
+
+    if args.benchmark:
+        elapsed = benchmark(args.benchmark)
+        print(f"⏱️  Planned {args.benchmark} SKUs in {elapsed * 1000:.1f} ms")
+        return
+
+    from app import create_app, db
+
+    app = create_app()
+    with app.app_context():
+        print("📦 Inventory Optimization")
+        print("=" * 60)
+        try:
+            recommendations = build_recommendations(db.engine, history_days=args.history_days,
+                                                    service_level=args.service_level)
+            if not args.dry_run:
+                save_recommendations(db.engine, recommendations)
+        except Exception as e:
+            print(f"❌ Error building recommendations: {e}")
+            sys.exit(1)
+
+        columns = ['sku_id', 'current_level', 'safety_stock', 'reorder_point', 'batch_quantity',
+                   'days_of_cover', 'recommended_quantity', 'action']
+        print(recommendations[columns].round(1).to_string(index=False))
+        if not args.dry_run:
+            print(f"\n✅ Saved {len(recommendations)} recommendations to {recommendations_table.name}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+Concurrent HTTP Load Test for Flavi Dairy Forecasting AI
+Drives a realistic mix of admin and customer traffic against a running
+instance and reports latency percentiles, throughput and error rate per route.
+
+Each virtual user logs in with one of the seeded accounts (see init_db.py)
+and then keeps requesting routes picked by weight until the run ends.
+
+Usage:
+    python load_test.py --concurrency 50 --duration 60
+    python load_test.py --compare load_test_results/20250101_120000.json
+
+Sync vs async read API (async_api.py on port 8001; login still goes to --base-url):
+    python load_test.py --mix api --concurrency 200 --output sync_api.json
+    python load_test.py --mix api --concurrency 200 --api-base-url http://127.0.0.1:8001 --compare sync_api.json
+
+Requires aiohttp (pip install aiohttp).
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+from datetime import datetime
+from collections import defaultdict
+
+import aiohttp
+
+BASE_URL = "http://127.0.0.1:5000"
+RESULTS_DIR = "load_test_results"
+
+ADMIN_ACCOUNTS = [('admin', 'admin123'), ('manager', 'manager123')]
+CUSTOMER_ACCOUNTS = [(f'customer{i}', 'customer123') for i in range(1, 6)]
+DEFAULT_SKU_IDS = ['MILK-001', 'MILK-002', 'CURD-001', 'BUTTER-001', 'CHEESE-001', 'GHEE-001']
+
+# (route label, weight) per user type; <sku_id> is filled in per request
+ADMIN_MIX = [
+    ('/dashboard', 30),
+    ('/api/skus', 20),
+    ('/api/sales/<sku_id>', 25),
+    ('/api/inventory/<sku_id>', 20),
+    ('/login (admin)', 5),
+]
+CUSTOMER_MIX = [
+    ('/customer_dashboard', 60),
+    ('/api/skus', 30),
+    ('/login (customer)', 10),
+]
+# Read API only (ERP-style polling), for every user type
+API_MIX = [
+    ('/api/skus', 30),
+    ('/api/sales/<sku_id>', 40),
+    ('/api/inventory/<sku_id>', 30),
+]
+
+
+class RouteStats:
+    """Latencies and outcomes collected for one route."""
+
+    def __init__(self):
+        self.latencies = []
+        self.errors = 0
+        self.status_codes = defaultdict(int)
+
+    def record(self, latency, status):
+        self.latencies.append(latency)
+        self.status_codes[str(status)] += 1
+        if status == 'error' or status >= 400:
+            self.errors += 1
+
+    def summary(self, elapsed):
+        latencies = sorted(self.latencies)
+        count = len(latencies)
+
+        def percentile(p):
+            if not latencies:
+                return None
+            return latencies[min(count - 1, int(round(p / 100 * (count - 1))))] * 1000
+
+        return {
+            'requests': count,
+            'throughput_rps': count / elapsed if elapsed else 0,
+            'error_rate': self.errors / count if count else 0,
+            'p50_ms': percentile(50),
+            'p95_ms': percentile(95),
+            'p99_ms': percentile(99),
+            'status_codes': dict(self.status_codes),
+        }
+
+
+async def login(http, base_url, username, password, login_type):
+    """Log in through the form; True if we were redirected to a dashboard."""
+    data = {'username': username, 'password': password, 'login_type': login_type}
+    async with http.post(f"{base_url}/login", data=data, allow_redirects=False) as response:
+        await response.read()
+        location = response.headers.get('Location', '')
+        return response.status in (301, 302, 303) and 'login' not in location, response.status
+
+
+async def timed_request(http, stats, label, coro_factory):
+    """Run one request and record its latency under ``label``."""
+    start = time.perf_counter()
+    try:
+        status = await coro_factory()
+    except (aiohttp.ClientError, asyncio.TimeoutError):
+        status = 'error'
+    stats[label].record(time.perf_counter() - start, status)
+
+
+async def virtual_user(user_type, account, base_url, sku_ids, stats, deadline, think_time,
+                       mix_name='full', api_base_url=None):
+    """One logged-in user issuing weighted requests until ``deadline``.
+
+    ``/api/`` requests go to ``api_base_url`` when given; the session cookie
+    from logging in at ``base_url`` is sent there too (cookies ignore ports).
+    """
+    username, password = account
+    if mix_name == 'api':
+        mix = API_MIX
+    else:
+        mix = ADMIN_MIX if user_type == 'admin' else CUSTOMER_MIX
+    labels = [label for label, _ in mix]
+    weights = [weight for _, weight in mix]
+    timeout = aiohttp.ClientTimeout(total=30)
+
+    async with aiohttp.ClientSession(timeout=timeout, cookie_jar=aiohttp.CookieJar(unsafe=True)) as http:
+        async def do_login():
+            ok, status = await login(http, base_url, username, password, user_type)
+            return status if ok else 401
+
+        await timed_request(http, stats, f'/login ({user_type})', do_login)
+
+        while time.monotonic() < deadline:
+            label = random.choices(labels, weights)[0]
+            if label.startswith('/login'):
+                await timed_request(http, stats, label, do_login)
+            else:
+                path = label.replace('<sku_id>', random.choice(sku_ids))
+                target = api_base_url if api_base_url and path.startswith('/api/') else base_url
+
+                async def do_get(path=path, target=target):
+                    async with http.get(f"{target}{path}", allow_redirects=False) as response:
+                        await response.read()
+                        # A redirect here means the session was lost (sent back to /login)
+                        return 401 if response.status in (301, 302, 303) else response.status
+
+                await timed_request(http, stats, label, do_get)
+            if think_time:
+                await asyncio.sleep(random.uniform(0, think_time))
+
+
+async def discover_sku_ids(base_url):
+    """Read SKU ids from /api/skus as admin, falling back to the seeded ones."""
+    try:
+        async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=10),
+                                         cookie_jar=aiohttp.CookieJar(unsafe=True)) as http:
+            await login(http, base_url, *ADMIN_ACCOUNTS[0], 'admin')
+            async with http.get(f"{base_url}/api/skus") as response:
+                skus = await response.json(content_type=None)
+                sku_ids = [sku['sku_id'] for sku in skus if sku.get('sku_id')]
+                return sku_ids or DEFAULT_SKU_IDS
+    except aiohttp.ClientConnectionError:
+        raise
+    except Exception:
+        return DEFAULT_SKU_IDS
+
+
+async def run_load_test(base_url, concurrency, duration, admin_share, think_time, mix_name='full',
+                        api_base_url=None):
+    """Run the load test and return the results dict."""
+    sku_ids = await discover_sku_ids(base_url)
+    stats = defaultdict(RouteStats)
+    deadline = time.monotonic() + duration
+
+    users = []
+    for i in range(concurrency):
+        if random.random() < admin_share:
+            users.append(('admin', ADMIN_ACCOUNTS[i % len(ADMIN_ACCOUNTS)]))
+        else:
+            users.append(('customer', CUSTOMER_ACCOUNTS[i % len(CUSTOMER_ACCOUNTS)]))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        virtual_user(user_type, account, base_url, sku_ids, stats, deadline, think_time, mix_name, api_base_url)
+        for user_type, account in users
+    ))
+    elapsed = time.perf_counter() - start
+
+    total = RouteStats()
+    for route_stats in stats.values():
+        total.latencies.extend(route_stats.latencies)
+        total.errors += route_stats.errors
+        for code, count in route_stats.status_codes.items():
+            total.status_codes[code] += count
+
+    return {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'base_url': base_url,
+        'api_base_url': api_base_url or base_url,
+        'mix': mix_name,
+        'concurrency': concurrency,
+        'duration_seconds': round(elapsed, 2),
+        'admin_share': admin_share,
+        'routes': {label: route_stats.summary(elapsed) for label, route_stats in sorted(stats.items())},
+        'total': total.summary(elapsed),
+    }
+
+
+def _fmt(value, suffix=''):
+    return 'n/a' if value is None else f"{value:.1f}{suffix}"
+
+
+def print_report(results, baseline=None):
+    """Print per-route results, with deltas against ``baseline`` if given."""
+    print(f"\n📊 Results: {results['concurrency']} users for {results['duration_seconds']}s against {results['base_url']}")
+    print("-" * 96)
+    print(f"{'Route':<28}{'Requests':>10}{'RPS':>9}{'Errors':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'Δp95':>10}")
+    print("-" * 96)
+
+    rows = list(results['routes'].items()) + [('TOTAL', results['total'])]
+    for label, summary in rows:
+        delta = ''
+        if baseline:
+            previous = baseline['total'] if label == 'TOTAL' else baseline['routes'].get(label)
+            if previous and previous.get('p95_ms') and summary['p95_ms']:
+                delta = f"{(summary['p95_ms'] / previous['p95_ms'] - 1) * 100:+.0f}%"
+        print(f"{label:<28}{summary['requests']:>10}{summary['throughput_rps']:>9.1f}"
+              f"{summary['error_rate'] * 100:>8.1f}%{_fmt(summary['p50_ms']):>10}"
+              f"{_fmt(summary['p95_ms']):>10}{_fmt(summary['p99_ms']):>10}{delta:>10}")
+
+
+def main():
+    """Main function to handle command line arguments."""
+    parser = argparse.ArgumentParser(description='Flavi Dairy concurrent HTTP load test')
+    parser.add_argument('--base-url', default=BASE_URL, help=f'Application URL (default: {BASE_URL})')
+    parser.add_argument('--concurrency', type=int, default=20, help='Number of concurrent virtual users')
+    parser.add_argument('--duration', type=float, default=30, help='Test duration in seconds')
+    parser.add_argument('--admin-share', type=float, default=0.2, help='Fraction of users that are admins')
+    parser.add_argument('--think-time', type=float, default=0.0, help='Max random pause between requests (s)')
+    parser.add_argument('--output', help=f'Results file (default: {RESULTS_DIR}/<timestamp>.json)')
+    parser.add_argument('--compare', help='Previous results file to compare against')
+    parser.add_argument('--mix', choices=['full', 'api'], default='full',
+                        help='Traffic mix: full app, or the read API only')
+    parser.add_argument('--api-base-url', help='Send /api/ requests here instead (e.g. the async API)')
+
+    args = parser.parse_args()
+
+    print("🚀 Flavi Dairy Load Test")
+    print("=" * 50)
+    print(f"Target: {args.base_url}, users: {args.concurrency}, duration: {args.duration}s, mix: {args.mix}")
+    if args.api_base_url:
+        print(f"API target: {args.api_base_url}")
+
+    try:
+        results = asyncio.run(run_load_test(
+            args.base_url, args.concurrency, args.duration, args.admin_share, args.think_time,
+            args.mix, args.api_base_url
+        ))
+    except aiohttp.ClientConnectionError:
+        print(f"❌ Cannot connect to application. Make sure it's running on {args.base_url}")
+        sys.exit(1)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    print_report(results, baseline)
+
+    output = args.output
+    if not output:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        output = os.path.join(RESULTS_DIR, f"{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    with open(output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"\n💾 Results saved to {output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+"""
+Model Registry for Flavi Dairy Forecasting AI
+Keeps fitted forecast models on disk per SKU, so a forecast for a new horizon
+is a load plus predict instead of a refit.
+
+Layout:
+    <MODEL_REGISTRY_PATH>/<sku_id>/v<NNNN>/model.joblib   fitted model
+    <MODEL_REGISTRY_PATH>/<sku_id>/v<NNNN>/meta.json      version, training window,
+                                                         data fingerprint, metrics
+
+Models are written uncompressed with joblib, so their NumPy arrays are
+memory-mapped on load (read-only) and only the pages a prediction touches
+are read; ``meta.json`` can be read without loading the model at all. Each
+process keeps recently used models in a size-bounded LRU cache
+(``MODEL_CACHE_MAX_MB``); with the gunicorn master preloading it (see
+serve.py) workers share those pages copy-on-write.
+
+Usage:
+    python model_registry.py                 # list SKUs and versions
+    python model_registry.py --sku MILK-001
+    python model_registry.py --prune 3
+"""
+
+import os
+import re
+import sys
+import json
+import shutil
+import hashlib
+import argparse
+import logging
+import threading
+from collections import OrderedDict
+from datetime import datetime
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from config import Config
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+MODEL_FILE = 'model.joblib'
+META_FILE = 'meta.json'
+
+_VERSION_DIR = re.compile(r'^v(\d+)$')
+
+
+def data_fingerprint(frame, columns=('date', 'demand')):
+    """Short stable hash of the training data, to tell whether a refit is needed."""
+    import pandas as pd
+
+    hashed = pd.util.hash_pandas_object(frame[list(columns)], index=False).to_numpy()
+    return hashlib.sha256(hashed.tobytes()).hexdigest()[:16]
+
+
+class ModelRegistry:
+    """Versioned fitted models per SKU on disk, with an in-memory LRU in front."""
+
+    def __init__(self, root=None, max_cache_bytes=None, keep_versions=None):
+        self.root = root or Config.MODEL_REGISTRY_PATH
+        self.max_cache_bytes = max_cache_bytes if max_cache_bytes is not None else Config.MODEL_CACHE_MAX_MB * 1024 * 1024
+        self.keep_versions = keep_versions if keep_versions is not None else Config.MODEL_REGISTRY_KEEP_VERSIONS
+        self._cache = OrderedDict()
+        self._cache_bytes = 0
+        self._fingerprints = {}  # (sku_id, data fingerprint, model type) -> cache key
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+
+    def _sku_dir(self, sku_id):
+        return os.path.join(self.root, re.sub(r'[^A-Za-z0-9_.-]', '_', str(sku_id)))
+
+    def _version_dir(self, sku_id, version):
+        return os.path.join(self._sku_dir(sku_id), f'v{version:04d}')
+
+    def sku_ids(self):
+        """SKUs with at least one registered model."""
+        if not os.path.isdir(self.root):
+            return []
+        skus = []
+        for name in sorted(os.listdir(self.root)):
+            meta = self._read_meta(os.path.join(self.root, name))
+            if meta:
+                skus.append(meta['sku_id'])
+        return skus
+
+    def versions(self, sku_id):
+        """Registered versions of ``sku_id``, oldest first."""
+        sku_dir = self._sku_dir(sku_id)
+        if not os.path.isdir(sku_dir):
+            return []
+        matches = (_VERSION_DIR.match(name) for name in os.listdir(sku_dir))
+        return sorted(int(match.group(1)) for match in matches if match)
+
+    def _read_meta(self, sku_dir, version=None):
+        if not os.path.isdir(sku_dir):
+            return None
+        if version is None:
+            matches = [_VERSION_DIR.match(name) for name in os.listdir(sku_dir)]
+            numbers = [int(match.group(1)) for match in matches if match]
+            if not numbers:
+                return None
+            version = max(numbers)
+        path = os.path.join(sku_dir, f'v{version:04d}', META_FILE)
+        if not os.path.exists(path):
+            return None
+        with open(path) as f:
+            return json.load(f)
+
+    def metadata(self, sku_id, version=None):
+        """Metadata of one version (the latest by default), or None; the model is not loaded."""
+        return self._read_meta(self._sku_dir(sku_id), version)
+
+    def save(self, sku_id, model, training_frame, metrics=None, model_type=None, params=None):
+        """Register a fitted model and return its metadata.
+
+        ``training_frame`` is the ``date``/``demand`` frame the model was fitted
+        on. If the latest version was fitted on identical data with the same
+        model type, nothing is written and that version is returned.
+        """
+        import joblib
+
+        fingerprint = data_fingerprint(training_frame)
+        model_type = model_type or type(model).__name__
+        latest = self.metadata(sku_id)
+        if latest and latest['data_fingerprint'] == fingerprint and latest['model_type'] == model_type:
+            return latest
+
+        version = (latest['version'] if latest else 0) + 1
+        sku_dir = self._sku_dir(sku_id)
+        os.makedirs(sku_dir, exist_ok=True)
+        tmp_dir = os.path.join(sku_dir, f'.tmp-v{version:04d}-{os.getpid()}')
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        os.makedirs(tmp_dir)
+
+        # Uncompressed so arrays can be memory-mapped on load
+        joblib.dump(model, os.path.join(tmp_dir, MODEL_FILE), compress=0)
+        dates = training_frame['date']
+        meta = {
+            'sku_id': sku_id,
+            'version': version,
+            'model_type': model_type,
+            'trained_at': datetime.now().isoformat(timespec='seconds'),
+            'training_start': str(dates.min())[:10],
+            'training_end': str(dates.max())[:10],
+            'observations': int(len(training_frame)),
+            'data_fingerprint': fingerprint,
+            'metrics': metrics or {},
+            'params': params or {},
+            'size_bytes': os.path.getsize(os.path.join(tmp_dir, MODEL_FILE)),
+        }
+        with open(os.path.join(tmp_dir, META_FILE), 'w') as f:
+            json.dump(meta, f, indent=2, default=str)
+
+        try:
+            os.rename(tmp_dir, self._version_dir(sku_id, version))
+        except OSError:
+            # Another process registered this version first; keep theirs
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            return self.metadata(sku_id)
+
+        self.prune(sku_id, self.keep_versions)
+        logger.info(f"Registered {model_type} v{version} for {sku_id} ({meta['size_bytes'] / 1024:.0f} KB)")
+        return meta
+
+    def load(self, sku_id, version=None):
+        """Return ``(model, metadata)`` for a version (the latest by default).
+
+        Raises ``KeyError`` if the SKU has no such model. A cached version is
+        returned without touching the disk.
+        """
+        if version is not None:
+            with self._lock:
+                cached = self._cache.get((sku_id, version))
+                if cached is not None:
+                    self._cache.move_to_end((sku_id, version))
+                    self.hits += 1
+                    return cached[0], cached[1]
+
+        meta = self.metadata(sku_id, version)
+        if meta is None:
+            raise KeyError(f"No model registered for {sku_id}" + (f" v{version}" if version else ''))
+
+        key = (sku_id, meta['version'])
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return cached[0], cached[1]
+            self.misses += 1
+
+        import joblib
+
+        model = joblib.load(os.path.join(self._version_dir(sku_id, meta['version']), MODEL_FILE), mmap_mode='r')
+        self._remember(key, model, meta)
+        return model, meta
+
+    def get_or_fit(self, sku_id, training_frame, fit, model_type=None, evaluate=None):
+        """Return ``(model, metadata)``, fitting and registering only if the data changed.
+
+        ``fit(training_frame)`` returns a fitted model; ``evaluate(model,
+        training_frame)`` optionally returns a metrics dict to store with it.
+        Any kept version fitted on the same data is reused, not only the
+        latest, and models in the LRU are found without reading the disk.
+        """
+        fingerprint = data_fingerprint(training_frame)
+        with self._lock:
+            key = self._fingerprints.get((sku_id, fingerprint, model_type))
+        if key is not None:
+            try:
+                return self.load(*key)
+            except KeyError:
+                pass
+
+        for version in reversed(self.versions(sku_id)):
+            meta = self.metadata(sku_id, version)
+            if meta and meta['data_fingerprint'] == fingerprint \
+                    and (model_type is None or meta['model_type'] == model_type):
+                model, meta = self.load(sku_id, version)
+                with self._lock:
+                    self._fingerprints[(sku_id, fingerprint, model_type)] = (sku_id, version)
+                return model, meta
+
+        model = fit(training_frame)
+        metrics = evaluate(model, training_frame) if evaluate else None
+        meta = self.save(sku_id, model, training_frame, metrics=metrics, model_type=model_type)
+        self._remember((sku_id, meta['version']), model, meta)
+        with self._lock:
+            self._fingerprints[(sku_id, fingerprint, model_type)] = (sku_id, meta['version'])
+        return model, meta
+
+    def _remember(self, key, model, meta):
+        """Add a model to the LRU, evicting the least recently used ones to fit."""
+        size = meta.get('size_bytes', 0)
+        if size > self.max_cache_bytes:
+            return
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return
+            self._cache[key] = (model, meta, size)
+            self._cache_bytes += size
+            while self._cache_bytes > self.max_cache_bytes:
+                evicted, (_, _, evicted_size) = self._cache.popitem(last=False)
+                self._cache_bytes -= evicted_size
+                self._forget(evicted)
+
+    def _forget(self, key):
+        """Drop fingerprint lookups pointing at a cache key (the lock is held)."""
+        for fingerprint in [name for name, target in self._fingerprints.items() if target == key]:
+            del self._fingerprints[fingerprint]
+
+    def preload(self, sku_ids=None):
+        """Load the latest model of each SKU into the cache while it has room."""
+        loaded = 0
+        for sku_id in sku_ids or self.sku_ids():
+            meta = self.metadata(sku_id)
+            if meta is None or self._cache_bytes + meta.get('size_bytes', 0) > self.max_cache_bytes:
+                continue
+            self.load(sku_id, meta['version'])
+            loaded += 1
+        return loaded
+
+    def prune(self, sku_id, keep):
+        """Delete all but the newest ``keep`` versions of ``sku_id``; returns how many were removed."""
+        old = self.versions(sku_id)[:-keep] if keep else []
+        for version in old:
+            shutil.rmtree(self._version_dir(sku_id, version), ignore_errors=True)
+            with self._lock:
+                cached = self._cache.pop((sku_id, version), None)
+                if cached is not None:
+                    self._cache_bytes -= cached[2]
+                self._forget((sku_id, version))
+        return len(old)
+
+    def cache_info(self):
+        """Entries, bytes and hit/miss counts of this process's LRU."""
+        with self._lock:
+            return {
+                'entries': len(self._cache),
+                'bytes': self._cache_bytes,
+                'max_bytes': self.max_cache_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+            }
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_registry():
+    """The process-wide registry at ``MODEL_REGISTRY_PATH``."""
+    global _registry
+
+    with _registry_lock:
+        if _registry is None:
+            _registry = ModelRegistry()
+        return _registry
+
+
+def main():
+    """Main function to handle command line arguments."""
+    parser = argparse.ArgumentParser(description='Flavi Dairy forecast model registry')
+    parser.add_argument('--sku', help='Show every version of one SKU')
+    parser.add_argument('--prune', type=int, metavar='KEEP', help='Keep only the newest KEEP versions per SKU')
+    parser.add_argument('--root', help='Registry directory (default: MODEL_REGISTRY_PATH)')
+
+    args = parser.parse_args()
+    registry = ModelRegistry(root=args.root)
+
+    print("🗄️  Model Registry")
+    print("=" * 60)
+    print(f"📁 {registry.root}")
+
+    if args.prune is not None:
+        removed = sum(registry.prune(sku_id, args.prune) for sku_id in registry.sku_ids())
+        print(f"🧹 Removed {removed} old versions")
+
+    sku_ids = [args.sku] if args.sku else registry.sku_ids()
+    if not sku_ids:
+        print("No models registered yet")
+        return
+    for sku_id in sku_ids:
+        versions = registry.versions(sku_id) if args.sku else [None]
+        for version in versions:
+            meta = registry.metadata(sku_id, version)
+            if meta is None:
+                print(f"❌ No model registered for {sku_id}")
+                continue
+            metrics = ', '.join(f"{name}={value:.3g}" for name, value in meta['metrics'].items()
+                                if isinstance(value, (int, float)))
+            print(f"  {sku_id} v{meta['version']}: {meta['model_type']}, "
+                  f"{meta['training_start']}..{meta['training_end']} ({meta['observations']} days), "
+                  f"{meta['size_bytes'] / 1024:.0f} KB, trained {meta['trained_at']}"
+                  + (f", {metrics}" if metrics else ''))
+
+
+if __name__ == '__main__':
+    main()
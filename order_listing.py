@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Order Listing Service for Flavi Dairy Forecasting AI
+Paginated order listings that return customer and SKU names in the same
+query, instead of looking up the customer and SKU of every order separately
+(2N+1 queries for an N-row page).
+"""
+
+import os
+import sys
+import math
+
+from sqlalchemy import func
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from config import Config
+
+
+def _order_rows_query(customer_id=None, status=None):
+    """Orders joined to their customer and SKU, with optional filters."""
+    from app import db
+    from app.models.order import Order
+    from app.models.customer import Customer
+    from app.models.sku import SKU
+
+    query = (
+        db.session.query(
+            Order,
+            Customer.username.label('customer_username'),
+            SKU.name.label('sku_name'),
+        )
+        .outerjoin(Customer, Customer.id == Order.customer_id)
+        .outerjoin(SKU, SKU.sku_id == Order.sku_id)
+    )
+    if customer_id is not None:
+        query = query.filter(Order.customer_id == customer_id)
+    if status:
+        query = query.filter(Order.status == status)
+    return query
+
+
+def list_orders(page=1, per_page=None, customer_id=None, status=None):
+    """Return one page of orders, newest first, with customer and SKU names.
+
+    The result is a dict with ``items`` (dicts with the order fields plus
+    ``customer_username`` and ``sku_name``), ``page``, ``per_page``, ``total``
+    and ``pages``. Costs two queries (rows and count) regardless of page size.
+    """
+    from app import db
+    from app.models.order import Order
+
+    per_page = per_page or Config.ITEMS_PER_PAGE
+    page = max(page, 1)
+
+    count_query = db.session.query(func.count(Order.id))
+    if customer_id is not None:
+        count_query = count_query.filter(Order.customer_id == customer_id)
+    if status:
+        count_query = count_query.filter(Order.status == status)
+    total = count_query.scalar()
+
+    rows = (
+        _order_rows_query(customer_id, status)
+        .order_by(Order.created_at.desc(), Order.id.desc())
+        .limit(per_page)
+        .offset((page - 1) * per_page)
+        .all()
+    )
+
+    items = [
+        {
+            'id': order.id,
+            'customer_id': order.customer_id,
+            'customer_username': customer_username or order.customer_id,
+            'sku_id': order.sku_id,
+            'sku_name': sku_name or order.sku_id,
+            'quantity': order.quantity,
+            'status': order.status,
+            'created_at': order.created_at,
+        }
+        for order, customer_username, sku_name in rows
+    ]
+
+    return {
+        'items': items,
+        'page': page,
+        'per_page': per_page,
+        'total': total,
+        'pages': math.ceil(total / per_page) if total else 0,
+    }
+
+
+def customer_order_history(customer_id, page=1, per_page=None, status=None):
+    """One page of a customer's order history (see ``list_orders``)."""
+    return list_orders(page=page, per_page=per_page, customer_id=customer_id, status=status)
+
+
+def order_counts_by_customer():
+    """Return ``{customer_id: order_count}`` for every customer in one query."""
+    from app import db
+    from app.models.order import Order
+
+    rows = db.session.query(Order.customer_id, func.count(Order.id)).group_by(Order.customer_id).all()
+    return dict(rows)
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Password Hashing for Flavi Dairy Forecasting AI
+Deployment-tunable password hashing shared by ``User`` and ``Customer``.
+
+- ``PASSWORD_HASH_METHOD`` picks the Werkzeug algorithm and cost
+  (e.g. ``scrypt:32768:8:1`` or ``pbkdf2:sha256:600000``)
+- hashes made with other parameters are upgraded transparently on login
+- verification runs in a bounded thread pool so a login burst cannot tie
+  up every worker thread
+- seeding hashes many passwords in parallel
+"""
+
+import os
+import sys
+import logging
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+
+from werkzeug.security import check_password_hash, generate_password_hash
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from config import Config
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+_verify_pool = ThreadPoolExecutor(
+    max_workers=Config.PASSWORD_VERIFY_THREADS,
+    thread_name_prefix='password-verify',
+)
+
+
+class PasswordVerificationBusy(RuntimeError):
+    """Raised when a password could not be verified within the latency budget."""
+
+
+def hash_password(password, method=None):
+    """Hash ``password`` with the configured (or given) method."""
+    return generate_password_hash(password, method=method or Config.PASSWORD_HASH_METHOD)
+
+
+@lru_cache(maxsize=8)
+def _method_prefix(method):
+    """Full parameter string Werkzeug stores for ``method`` (defaults filled in)."""
+    return generate_password_hash('', method=method).split('$', 1)[0]
+
+
+def needs_rehash(password_hash, method=None):
+    """True if ``password_hash`` was not made with the configured algorithm and cost."""
+    if not password_hash or '$' not in password_hash:
+        return True
+    return password_hash.split('$', 1)[0] != _method_prefix(method or Config.PASSWORD_HASH_METHOD)
+
+
+def verify_password(password_hash, password, timeout=None):
+    """Check ``password`` against ``password_hash`` on the bounded verify pool.
+
+    Raises ``PasswordVerificationBusy`` if the check does not finish within
+    ``timeout`` seconds (default ``PASSWORD_VERIFY_TIMEOUT_SECONDS``), e.g.
+    because too many logins are queued.
+    """
+    if not password_hash:
+        return False
+    timeout = Config.PASSWORD_VERIFY_TIMEOUT_SECONDS if timeout is None else timeout
+    future = _verify_pool.submit(check_password_hash, password_hash, password)
+    try:
+        return future.result(timeout=timeout)
+    except FutureTimeoutError:
+        future.cancel()
+        logger.warning("Password verification timed out; verify pool saturated")
+        raise PasswordVerificationBusy("Login is busy, please try again")
+
+
+def check_and_upgrade(account, password):
+    """Verify a ``User``/``Customer`` password and rehash it if parameters changed.
+
+    On success with an outdated hash, ``account.password_hash`` is replaced;
+    the caller commits it along with the rest of the login.
+    """
+    if not verify_password(account.password_hash, password):
+        return False
+    if needs_rehash(account.password_hash):
+        account.password_hash = hash_password(password)
+        logger.info(f"Upgraded password hash for {getattr(account, 'username', account)}")
+    return True
+
+
+def hash_passwords_parallel(passwords, method=None, workers=None):
+    """Hash several passwords at once (hashlib releases the GIL), preserving order."""
+    workers = workers or os.cpu_count() or 1
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(lambda password: hash_password(password, method), passwords))
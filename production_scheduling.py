@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""
+Production Scheduling for Flavi Dairy Forecasting AI
+Turns forecast demand over a planning horizon into a daily production plan
+for every SKU, in whole production batches.
+
+Each SKU and day has a number of batches, a run (setup) flag, the
+end-of-day stock and the unmet demand. The plan minimizes setup cost per
+run (``PRODUCTION_SETUP_COST``) + holding + stock-out cost, subject to the
+daily stock balance, the line hours available per day
+(``processing_time_hours + packaging_time_hours`` per batch), storage
+capacity, and shelf life (stock never exceeds the demand of the next
+``shelf_life_days``).
+
+A setup-aware heuristic builds the plan: a SKU runs only when it would
+otherwise run short, and then makes an economic lot. It handles hundreds of
+SKUs x 30 days in milliseconds. An exact mixed-integer model is not used:
+with integer batches and shared line hours HiGHS could not beat the
+heuristic within 10 seconds even for 5 SKUs.
+
+Usage:
+    python production_scheduling.py --days 30
+    python production_scheduling.py --benchmark 300
+"""
+
+import os
+import sys
+import time
+import argparse
+import logging
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import Column, Date, DateTime, Float, Integer, MetaData, String, Table
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from config import Config
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+metadata = MetaData()
+
+production_plan_table = Table(
+    'production_plan', metadata,
+    Column('sku_id', String(50), primary_key=True),
+    Column('date', Date, primary_key=True),
+    Column('batches', Integer, nullable=False),
+    Column('quantity', Float, nullable=False),
+    Column('line_hours', Float, nullable=False),
+    Column('ending_stock', Float, nullable=False),
+    Column('shortage', Float, nullable=False),
+    Column('generated_at', DateTime, nullable=False),
+)
+
+
+def _stock_upper_bounds(demand, initial_stock, shelf_life_days, storage_capacity):
+    """Highest sellable end-of-day stock per SKU and day.
+
+    Stock above the demand of the next ``shelf_life_days`` would expire, and
+    stock above storage capacity does not fit. Opening stock that already
+    exceeds either limit is allowed to run down.
+    """
+    n_skus, days = demand.shape
+    # Demand beyond the horizon is assumed to continue at the horizon average
+    tail = np.repeat(demand.mean(axis=1, keepdims=True), days + 1, axis=1)
+    cumulative = np.concatenate([np.zeros((n_skus, 1)), np.cumsum(np.hstack([demand, tail]), axis=1)], axis=1)
+
+    t = np.arange(days)
+    life = np.clip(np.nan_to_num(shelf_life_days, nan=days), 0, days).astype(int)
+    window_end = t[None, :] + 1 + life[:, None]
+    rows = np.arange(n_skus)[:, None]
+    sellable = cumulative[rows, window_end] - cumulative[rows, t[None, :] + 1]
+
+    upper = np.minimum(sellable, np.nan_to_num(storage_capacity, nan=np.inf)[:, None])
+    run_down = initial_stock[:, None] - cumulative[:, 1:days + 1]
+    return np.maximum(upper, np.maximum(run_down, 0.0))
+
+
+def _solve_greedy(demand, initial_stock, batch_size, batch_hours, stock_upper, line_hours,
+                  setup_cost, holding_cost):
+    """Setup-aware heuristic: run a SKU only when it must, then make a full lot.
+
+    Each day, in order of earliest stock-out:
+
+    1. SKUs that cannot meet today's demand get the batches to cover it
+    2. if tomorrow's shortfalls need more line hours than a day has, SKUs
+       that run out tomorrow are started today
+    3. every SKU running today is topped up to its economic cover,
+       ``sqrt(2 * setup cost / (holding cost * mean daily demand))`` days
+       (the periodic order quantity), within spare hours, shelf life and storage
+    """
+    n_skus, days = demand.shape
+    batches = np.zeros((n_skus, days))
+    stock = initial_stock.astype(np.float64).copy()
+    has_batches = batch_size > 0
+    unit = np.where(has_batches, batch_size, 1.0)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cover_days = np.sqrt(2.0 * setup_cost / (holding_cost * demand.mean(axis=1)))
+    cover_days = np.clip(np.nan_to_num(np.round(cover_days), nan=1.0, posinf=days), 1, days).astype(int)
+    cumulative = np.concatenate([np.zeros((n_skus, 1)), np.cumsum(demand, axis=1)], axis=1)
+
+    for day in range(days):
+        hours_left = line_hours
+        after = stock - demand[:, day]
+        next_demand = demand[:, day + 1] if day + 1 < days else np.zeros(n_skus)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            cover = np.where(demand[:, day] > 0, after / demand[:, day], np.inf)
+        order = np.argsort(cover, kind='stable')
+
+        def produce(i, wanted):
+            nonlocal hours_left
+            by_hours = np.floor(hours_left / batch_hours[i]) if batch_hours[i] > 0 else wanted
+            by_stock = np.floor((stock_upper[i, day] - after[i]) / batch_size[i])
+            count = max(min(wanted, by_hours, by_stock), 0.0)
+            batches[i, day] += count
+            after[i] += count * batch_size[i]
+            hours_left -= count * batch_hours[i]
+
+        for i in order:
+            if has_batches[i] and after[i] < 0:
+                produce(i, np.ceil(-after[i] / batch_size[i]))
+
+        short_tomorrow = has_batches & (batches[:, day] == 0) & (after < next_demand)
+        hours_tomorrow = (np.ceil((next_demand - np.maximum(after, 0.0)) / unit) * batch_hours)[short_tomorrow].sum()
+        if hours_tomorrow > line_hours:
+            for i in order:
+                if short_tomorrow[i]:
+                    produce(i, np.ceil((next_demand[i] - after[i]) / batch_size[i]))
+
+        for i in order:
+            if batches[i, day] > 0:
+                target = cumulative[i, min(day + cover_days[i], days)] - cumulative[i, day + 1]
+                produce(i, max(np.ceil((target - after[i]) / batch_size[i]), 0.0))
+
+        stock = np.maximum(after, 0.0)
+    return batches
+
+
+def _simulate(batches, demand, initial_stock, batch_size):
+    """End-of-day stock and unmet demand for a batch plan."""
+    n_skus, days = demand.shape
+    stock = initial_stock.astype(np.float64).copy()
+    ending, shortage = np.empty((n_skus, days)), np.empty((n_skus, days))
+    for day in range(days):
+        available = stock + batches[:, day] * batch_size
+        shortage[:, day] = np.maximum(demand[:, day] - available, 0.0)
+        stock = np.maximum(available - demand[:, day], 0.0)
+        ending[:, day] = stock
+    return ending, shortage
+
+
+def schedule_production(demand, initial_stock, batch_size, processing_hours, packaging_hours,
+                        shelf_life_days, storage_capacity, line_hours=None,
+                        setup_cost=None, holding_cost=None, stockout_cost=None):
+    """Plan production for all SKUs; ``demand`` is an (SKUs x days) array.
+
+    Returns ``(batches, ending_stock, shortage, info)``. The first three are
+    (SKUs x days) arrays. ``info`` records the solve time, the total cost
+    and the number of runs.
+    """
+    line_hours = Config.PRODUCTION_LINE_HOURS_PER_DAY if line_hours is None else line_hours
+    setup_cost = Config.PRODUCTION_SETUP_COST if setup_cost is None else setup_cost
+    holding_cost = Config.HOLDING_COST_PER_UNIT_DAY if holding_cost is None else holding_cost
+    stockout_cost = Config.STOCKOUT_COST_PER_UNIT if stockout_cost is None else stockout_cost
+
+    demand = np.maximum(np.atleast_2d(np.asarray(demand, dtype=np.float64)), 0.0)
+    initial_stock = np.maximum(np.nan_to_num(np.asarray(initial_stock, dtype=np.float64)), 0.0)
+    batch_size = np.nan_to_num(np.asarray(batch_size, dtype=np.float64))
+    batch_hours = (np.nan_to_num(np.asarray(processing_hours, dtype=np.float64)) +
+                   np.nan_to_num(np.asarray(packaging_hours, dtype=np.float64)))
+    stock_upper = _stock_upper_bounds(
+        demand, initial_stock,
+        np.asarray(shelf_life_days, dtype=np.float64), np.asarray(storage_capacity, dtype=np.float64),
+    )
+
+    start = time.perf_counter()
+    batches = _solve_greedy(demand, initial_stock, batch_size, batch_hours, stock_upper, line_hours,
+                            setup_cost, holding_cost)
+    solve_seconds = time.perf_counter() - start
+
+    ending, shortage = _simulate(batches, demand, initial_stock, batch_size)
+    total_cost = setup_cost * (batches > 0).sum() + holding_cost * ending.sum() + stockout_cost * shortage.sum()
+    info = {
+        'solve_seconds': solve_seconds,
+        'total_cost': float(total_cost),
+        'runs': int((batches > 0).sum()),
+        'total_shortage': float(shortage.sum()),
+        'peak_line_hours': float((batches * batch_hours[:, None]).sum(axis=0).max()),
+    }
+    return batches, ending, shortage, info
+
+
+def build_production_plan(engine, days=30, forecast=None, **params):
+    """Plan all SKUs from the database for the next ``days`` days.
+
+    ``forecast`` maps SKU id to a daily demand forecast (a number or a
+    sequence of at least ``days`` values); other SKUs use their recent mean
+    daily sales. Returns ``(plan DataFrame, info)``.
+    """
+    from inventory_optimization import demand_statistics, load_planning_inputs
+
+    inputs = load_planning_inputs(engine)
+    sku_ids = inputs['sku_id'].astype(str).tolist()
+    mean_demand, _ = demand_statistics(engine, sku_ids)
+    demand = np.repeat(mean_demand[:, None], days, axis=1)
+    for row, sku_id in enumerate(sku_ids):
+        values = (forecast or {}).get(sku_id)
+        if values is not None:
+            values = np.atleast_1d(np.asarray(values, dtype=np.float64))
+            demand[row] = values[:days] if values.size > 1 else values[0]
+
+    batch_size = inputs['production_batch_size'].to_numpy(dtype=np.float64)
+    batch_hours = (inputs['processing_time_hours'].fillna(0) + inputs['packaging_time_hours'].fillna(0)).to_numpy()
+    batches, ending, shortage, info = schedule_production(
+        demand, inputs['current_level'].to_numpy(), batch_size,
+        inputs['processing_time_hours'].to_numpy(), inputs['packaging_time_hours'].to_numpy(),
+        inputs['shelf_life_days'].to_numpy(), inputs['storage_capacity_units'].to_numpy(),
+        **params,
+    )
+
+    first_day = datetime.now().date() + timedelta(days=1)
+    plan = pd.DataFrame({
+        'sku_id': np.repeat(sku_ids, days),
+        'date': np.tile([first_day + timedelta(days=d) for d in range(days)], len(sku_ids)),
+        'batches': batches.ravel().astype(int),
+        'quantity': (batches * np.nan_to_num(batch_size)[:, None]).ravel(),
+        'line_hours': (batches * batch_hours[:, None]).ravel(),
+        'ending_stock': ending.ravel(),
+        'shortage': shortage.ravel(),
+        'generated_at': datetime.now().replace(microsecond=0),
+    })
+    return plan, info
+
+
+def save_production_plan(engine, plan):
+    """Replace the stored production plan with ``plan``."""
+    metadata.create_all(engine, tables=[production_plan_table])
+    with engine.begin() as conn:
+        conn.execute(production_plan_table.delete())
+        if not plan.empty:
+            conn.execute(production_plan_table.insert(), plan.to_dict('records'))
+    logger.info(f"Saved production plan with {len(plan)} rows")
+
+
+def benchmark(sku_count, days=30):
+    """Schedule ``sku_count`` random SKUs and return the info dict."""
+    rng = np.random.default_rng(42)
+    mean = rng.uniform(20, 500, sku_count)
+    demand = np.maximum(rng.normal(mean[:, None], mean[:, None] * 0.2, (sku_count, days)), 0)
+    batch_size = np.round(mean * rng.uniform(1, 4, sku_count), -1)
+    processing = rng.uniform(0.02, 0.1, sku_count)
+    packaging = rng.uniform(0.01, 0.05, sku_count)
+    line_hours = float((mean / batch_size * (processing + packaging)).sum() * 1.2)
+    _, _, _, info = schedule_production(
+        demand, mean * rng.uniform(0, 3, sku_count), batch_size, processing, packaging,
+        rng.integers(3, 60, sku_count), mean * 10, line_hours=line_hours,
+    )
+    return info
+
+
+def main():
+    """Main function to handle command line arguments."""
+    parser = argparse.ArgumentParser(description='Flavi Dairy production scheduling')
+    parser.add_argument('--days', type=int, default=30, help='Planning horizon in days')
+    parser.add_argument('--line-hours', type=float, help=f'Line hours per day (default: {Config.PRODUCTION_LINE_HOURS_PER_DAY})')
+    parser.add_argument('--dry-run', action='store_true', help='Print the plan without saving it')
+    parser.add_argument('--benchmark', type=int, metavar='SKUS', help='Schedule random SKUs and exit')
+
+    args = parser.parse_args()
+
+    if args.benchmark:
+        info = benchmark(args.benchmark, args.days)
+        print(f"⏱️  {args.benchmark} SKUs x {args.days} days: {info['solve_seconds']:.2f}s, "
+              f"cost {info['total_cost']:.0f}, {info['runs']} runs, shortage {info['total_shortage']:.0f}")
+        return
+
+    from app import create_app, db
+
+    app = create_app()
+    with app.app_context():
+        print("🏭 Production Scheduling")
+        print("=" * 60)
+        try:
+            plan, info = build_production_plan(db.engine, days=args.days, line_hours=args.line_hours)
+            if not args.dry_run:
+                save_production_plan(db.engine, plan)
+        except Exception as e:
+            print(f"❌ Error building production plan: {e}")
+            sys.exit(1)
+
+        print(f"Planned in {info['solve_seconds']:.2f}s, cost {info['total_cost']:.0f}, "
+              f"{info['runs']} runs, unmet demand {info['total_shortage']:.0f}, peak line hours {info['peak_line_hours']:.1f}")
+        runs = plan[plan['batches'] > 0]
+        if runs.empty:
+            print("No production needed over the horizon")
+        else:
+            print(runs[['date', 'sku_id', 'batches', 'quantity', 'line_hours']].round(1).to_string(index=False))
+        if not args.dry_run:
+            print(f"\n✅ Saved plan to {production_plan_table.name}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Request Performance Metrics for Flavi Dairy Forecasting AI
+Records per-route latency, in-flight requests, response sizes and the SQL
+work done by each request, and exposes them at ``/metrics`` in Prometheus
+text format. Every response also carries a ``Server-Timing`` header
+(``app``, ``db`` and ``pool`` durations) that browser dev tools display.
+
+Pool metrics: how long each checkout blocked waiting for a connection (the
+``pool`` Server-Timing entry is this wait summed over the request), the time
+spent opening new connections, and checkouts split by whether the pool had
+to go into overflow (every pooled connection already in use).
+
+Metrics live in process memory: under gunicorn each worker reports its own
+numbers, so scrape every worker (or run one worker per target) and sum.
+"""
+
+import os
+import sys
+import time
+import threading
+from collections import defaultdict
+
+from flask import Response, g, has_request_context, request
+from sqlalchemy import event
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from database_config import db_manager, pop_start_on_error
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+POOL_CONNECT_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+POOL_WAIT_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+
+
+def _format_labels(names, values):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_value(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Monotonic counter with labels."""
+
+    kind = 'counter'
+
+    def __init__(self, name, help_text, labels=()):
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self._values = defaultdict(float)
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, *label_values):
+        with self._lock:
+            self._values[label_values] += amount
+
+    def render(self):
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labels, key)} {_format_value(value)}" for key, value in items]
+
+
+class Gauge(Counter):
+    """Value that can go up and down."""
+
+    kind = 'gauge'
+
+    def dec(self, amount=1, *label_values):
+        self.inc(-amount, *label_values)
+
+    def set(self, value, *label_values):
+        with self._lock:
+            self._values[label_values] = value
+
+
+class Histogram:
+    """Cumulative-bucket histogram with labels."""
+
+    kind = 'histogram'
+
+    def __init__(self, name, help_text, labels=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self.buckets = tuple(buckets)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, *label_values):
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[0][i] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self):
+        with self._lock:
+            items = sorted((key, (list(counts), total, count)) for key, (counts, total, count) in self._series.items())
+        lines = []
+        for key, (counts, total, count) in items:
+            for bound, bucket_count in zip(self.buckets, counts):
+                labels = _format_labels(self.labels + ('le',), key + (_format_value(bound),))
+                lines.append(f"{self.name}_bucket{labels} {bucket_count}")
+            labels = _format_labels(self.labels + ('le',), key + ('+Inf',))
+            lines.append(f"{self.name}_bucket{labels} {count}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labels, key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labels, key)} {count}")
+        return lines
+
+
+REQUESTS = Counter('flavi_http_requests_total', 'HTTP requests handled.', ('method', 'route', 'status'))
+REQUEST_LATENCY = Histogram('flavi_http_request_duration_seconds', 'HTTP request latency.', ('method', 'route'))
+IN_FLIGHT = Gauge('flavi_http_requests_in_flight', 'HTTP requests currently being handled.')
+RESPONSE_SIZE = Histogram('flavi_http_response_size_bytes', 'HTTP response body size.', ('route',), SIZE_BUCKETS)
+SQL_PER_REQUEST = Histogram('flavi_db_statements_per_request', 'SQL statements executed per request.',
+                            ('route',), COUNT_BUCKETS)
+SQL_TIME_PER_REQUEST = Histogram('flavi_db_time_per_request_seconds', 'Time spent in SQL per request.', ('route',))
+SQL_STATEMENTS = Counter('flavi_db_statements_total', 'SQL statements executed.', ('route',))
+SQL_SECONDS = Counter('flavi_db_statement_seconds_total', 'Time spent executing SQL.', ('route',))
+POOL_WAIT = Histogram('flavi_db_pool_wait_seconds', 'Time a checkout waited for a pooled connection.',
+                      buckets=POOL_WAIT_BUCKETS)
+POOL_CONNECT = Histogram('flavi_db_pool_connect_seconds', 'Time to open a new pooled connection.',
+                         buckets=POOL_CONNECT_BUCKETS)
+POOL_CHECKOUTS = Counter('flavi_db_pool_checkouts_total', 'Pooled connection checkouts.', ('overflow',))
+POOL_CONNECTIONS = Gauge('flavi_db_pool_connections', 'Connection pool occupancy.', ('state',))
+
+METRICS = [REQUESTS, REQUEST_LATENCY, IN_FLIGHT, RESPONSE_SIZE, SQL_PER_REQUEST, SQL_TIME_PER_REQUEST,
+           SQL_STATEMENTS, SQL_SECONDS, POOL_WAIT, POOL_CONNECT, POOL_CHECKOUTS, POOL_CONNECTIONS]
+
+_engine = None
+
+
+def _route_label():
+    """Route template (``/api/sales/<sku_id>``) rather than the raw path."""
+    rule = request.url_rule
+    return rule.rule if rule is not None else 'unmatched'
+
+
+def render_metrics():
+    """All metrics in Prometheus text exposition format."""
+    lines = []
+    for metric in METRICS:
+        lines.append(f"# HELP {metric.name} {metric.help_text}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        lines.extend(metric.render())
+    return '\n'.join(lines) + '\n'
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('metrics_query_start', []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get('metrics_query_start')
+    if not starts:
+        return
+    elapsed = time.perf_counter() - starts.pop()
+    if has_request_context() and hasattr(g, '_metrics_start'):
+        g._metrics_sql_count += 1
+        g._metrics_sql_seconds += elapsed
+
+
+def _observe_pool_wait(seconds):
+    POOL_WAIT.observe(seconds)
+    if has_request_context() and hasattr(g, '_metrics_start'):
+        g._metrics_pool_seconds += seconds
+
+
+def _observe_pool_checkout(status):
+    overflow = status.get('checkedout', 0) > status.get('size', float('inf'))
+    POOL_CHECKOUTS.inc(1, 'true' if overflow else 'false')
+
+
+def _before_request():
+    g._metrics_start = time.perf_counter()
+    g._metrics_sql_count = 0
+    g._metrics_sql_seconds = 0.0
+    g._metrics_pool_seconds = 0.0
+    IN_FLIGHT.inc()
+
+
+def _after_request(response):
+    if not hasattr(g, '_metrics_start'):
+        return response
+
+    elapsed = time.perf_counter() - g._metrics_start
+    route = _route_label()
+    REQUESTS.inc(1, request.method, route, str(response.status_code))
+    REQUEST_LATENCY.observe(elapsed, request.method, route)
+    if not response.is_streamed and response.content_length is not None:
+        RESPONSE_SIZE.observe(response.content_length, route)
+    SQL_PER_REQUEST.observe(g._metrics_sql_count, route)
+    SQL_TIME_PER_REQUEST.observe(g._metrics_sql_seconds, route)
+    SQL_STATEMENTS.inc(g._metrics_sql_count, route)
+    SQL_SECONDS.inc(g._metrics_sql_seconds, route)
+
+    response.headers.add(
+        'Server-Timing',
+        f'app;dur={elapsed * 1000:.1f}, '
+        f'db;dur={g._metrics_sql_seconds * 1000:.1f};desc="{g._metrics_sql_count} queries", '
+        f'pool;dur={g._metrics_pool_seconds * 1000:.1f};desc="checkout wait"'
+    )
+    return response
+
+
+def _teardown_request(exc):
+    # Runs even when the view raised, so the gauge never drifts upwards
+    if hasattr(g, '_metrics_start'):
+        IN_FLIGHT.dec()
+
+
+def metrics_view():
+    """Prometheus scrape endpoint."""
+    for state, value in db_manager.get_pool_status(_engine).items():
+        POOL_CONNECTIONS.set(value, state)
+    return Response(render_metrics(), mimetype='text/plain; version=0.0.4')
+
+
+def init_app(app):
+    """Install the request hooks, SQL listeners and ``/metrics`` on ``app``."""
+    global _engine
+
+    with app.app_context():
+        _engine = app.extensions['sqlalchemy'].engine
+
+    event.listen(_engine, 'before_cursor_execute', _before_cursor_execute)
+    event.listen(_engine, 'after_cursor_execute', _after_cursor_execute)
+    pop_start_on_error(_engine, 'metrics_query_start')
+    db_manager.instrument_pool(_engine, on_checkout=_observe_pool_checkout, on_connect=POOL_CONNECT.observe,
+                               on_wait=_observe_pool_wait)
+
+    app.before_request(_before_request)
+    app.after_request(_after_request)
+    app.teardown_request(_teardown_request)
+    app.add_url_rule('/metrics', 'metrics', metrics_view)
@@ -9,4 +9,4 @@ echo Initializing database...
 python init_db.py
 
 echo Starting Flask application...
-python run.py 
\ No newline at end of file
+python serve.py --bind 127.0.0.1:5000 
\ No newline at end of file
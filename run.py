@@ -1,16 +1,10 @@
 import os
 import click
 from app import create_app, db
-from flask_migrate import Migrate
-from app.models.sku import SKU
-from app.models.sales import Sales
-from app.models.inventory import Inventory
-from datetime import datetime, timedelta
-import random
-import numpy as np
-import pandas as pd
 import logging
-from app.models.user import User
+
+# numpy, pandas and Flask-Migrate are imported where they are used, so web
+# workers and short CLI commands do not pay for them (see benchmark_import_time.py)
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -29,11 +23,27 @@ if not os.environ.get('SECRET_KEY'):
 
 # Create Flask app
 app = create_app()
-migrate = Migrate(app, db)
+
+if os.environ.get('FLASK_RUN_FROM_CLI') == 'true':
+    # Only the ``flask`` command line needs the ``flask db`` migration commands
+    from flask_migrate import Migrate
+
+    migrate = Migrate(app, db)
 
 @app.cli.command("init-db")
 def init_db_command():
     """Clear existing data and create new tables and sample data."""
+    from datetime import datetime, timedelta
+
+    import numpy as np
+    import pandas as pd
+    from app.models.sku import SKU
+    from app.models.sales import Sales
+    from app.models.inventory import Inventory
+    from app.models.user import User
+    from password_hashing import hash_password
+    from inventory_ledger import seed_sample_inventory
+
     try:
         db.drop_all()
         db.create_all()
@@ -55,7 +65,8 @@ def init_db_command():
         # Create admin user
         if not User.query.filter_by(username='admin').first():
             admin = User(username='admin', email='admin@flavi.com', role='admin')
-            admin.set_password('admin123')
+            # Same hashing parameters as init_db.py / setup_database.py
+            admin.password_hash = hash_password('admin123')
             db.session.add(admin)
             db.session.commit()
             click.echo("Created admin user.")
@@ -82,17 +93,18 @@ def init_db_command():
         db.session.commit()
         click.echo("Added sample sales data.")
 
-        # Generate sample inventory data
-        for sku in SKU.query.all():
-            current_level = random.uniform(500, 2000)
-            for date in dates:
-                inventory = Inventory(
-                    sku_id=sku.id,
-                    date=date.date(),
-                    quantity=int(current_level)
-                )
-                db.session.add(inventory)
-                current_level = max(0, current_level + random.uniform(-200, 200))
+        # Inventory history goes into the movement ledger; only the current level is an inventory row
+        skus = SKU.query.all()
+        current_stock = seed_sample_inventory(
+            db.session.connection(), [str(sku.id) for sku in skus], start_date, end_date
+        )
+        for sku in skus:
+            inventory = Inventory(
+                sku_id=sku.id,
+                date=end_date,
+                quantity=int(current_stock[str(sku.id)]['current_level'])
+            )
+            db.session.add(inventory)
         db.session.commit()
         click.echo("Added sample inventory data.")
         
@@ -108,6 +120,9 @@ if __name__ == '__main__':
     # To initialize the database, run from your terminal:
     # flask init-db
     #
-    # Then, to run the application:
+    # Then, to run the development server:
     # python run.py
+    #
+    # For production (gunicorn with a preloaded app and warmed-up workers):
+    # python serve.py
     app.run(debug=True, host='127.0.0.1', port=5000)
\ No newline at end of file
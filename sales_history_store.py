@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Sales History Store for Flavi Dairy Forecasting AI
+Keeps Sales and Inventory history in Parquet files partitioned by SKU and month,
+so model training reads columnar files instead of querying the live database.
+Inventory history is the end-of-day stock and settings per SKU from the
+inventory ledger (``inventory_ledger.daily_inventory``).
+
+Layout:
+    <HISTORY_STORE_PATH>/<table>/sku_id=<SKU>/month=<YYYY-MM>/data.parquet
+"""
+
+import os
+import sys
+import json
+import argparse
+import logging
+from datetime import date, datetime, timedelta
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from pyarrow import fs
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from config import Config
+from typed_loader import load_table
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Columns kept per table; ``sku_id`` is stored in the partition path only
+HISTORY_TABLES = {
+    'sales': ['id', 'sku_id', 'customer_id', 'quantity_sold', 'amount', 'date'],
+    'inventory': ['sku_id', 'current_level', 'production_batch_size',
+                  'shelf_life_days', 'storage_capacity_units', 'date'],
+}
+
+# Date range of each table's history
+DATE_RANGE_SQL = {
+    'sales': "SELECT MIN(date), MAX(date) FROM sales",
+    'inventory': "SELECT MIN(movement_date), MAX(movement_date) FROM inventory_movements",
+}
+
+PARTITIONING = ds.partitioning(
+    pa.schema([('sku_id', pa.string()), ('month', pa.string())]),
+    flavor='hive'
+)
+
+STATE_FILE = '_sync_state.json'
+
+
+def get_store_root(root=None):
+    """Return the history store directory, creating it if needed."""
+    root = root or Config.HISTORY_STORE_PATH
+    os.makedirs(root, exist_ok=True)
+    return root
+
+
+def _month_start(value):
+    """First day of the month containing ``value``."""
+    return date(value.year, value.month, 1)
+
+
+def _next_month(value):
+    """First day of the month after ``value``."""
+    if value.month == 12:
+        return date(value.year + 1, 1, 1)
+    return date(value.year, value.month + 1, 1)
+
+
+def _to_date(value):
+    """Normalise strings/datetimes coming back from the database to ``date``."""
+    if value is None or (isinstance(value, date) and not isinstance(value, datetime)):
+        return value
+    if isinstance(value, datetime):
+        return value.date()
+    return datetime.strptime(str(value)[:10], '%Y-%m-%d').date()
+
+
+def _load_state(root):
+    path = os.path.join(root, STATE_FILE)
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def _save_state(root, state):
+    path = os.path.join(root, STATE_FILE)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(state, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def _read_month(engine, table_name, month):
+    """Read one calendar month of a history table from the database."""
+    if table_name == 'inventory':
+        from inventory_ledger import daily_inventory
+
+        frame = daily_inventory(engine, month, min(_next_month(month) - timedelta(days=1), date.today()))
+        return frame[HISTORY_TABLES[table_name]]
+    return load_table(
+        engine,
+        table_name,
+        columns=HISTORY_TABLES[table_name],
+        where="date >= :start AND date < :end",
+        params={'start': month.isoformat(), 'end': _next_month(month).isoformat()},
+        order_by='sku_id, date',
+    )
+
+
+def _write_partition(root, table_name, sku_id, month, frame):
+    """Atomically replace the Parquet file for one SKU/month partition."""
+    partition_dir = os.path.join(root, table_name, f'sku_id={sku_id}', f'month={month:%Y-%m}')
+    os.makedirs(partition_dir, exist_ok=True)
+
+    table = pa.Table.from_pandas(frame.drop(columns=['sku_id']), preserve_index=False)
+    date_index = table.schema.get_field_index('date')
+    table = table.set_column(date_index, 'date', table['date'].cast(pa.date32()))
+    path = os.path.join(partition_dir, 'data.parquet')
+    tmp_path = path + '.tmp'
+    pq.write_table(table, tmp_path)
+    os.replace(tmp_path, path)
+
+
+def sync_table(engine, table_name, root=None, full=False):
+    """Export new or changed months of ``table_name`` into the store.
+
+    Incremental runs rewrite every month from the last synced month onwards,
+    because rows may have been added to that month since the previous run.
+    Returns the number of rows written.
+    """
+    from sqlalchemy import text
+
+    root = get_store_root(root)
+    state = _load_state(root)
+
+    with engine.connect() as conn:
+        first, last = conn.execute(text(DATE_RANGE_SQL[table_name])).one()
+    first, last = _to_date(first), _to_date(last)
+    if first is None:
+        logger.info(f"No rows in {table_name}; nothing to sync")
+        return 0
+
+    watermark = state.get(table_name, {}).get('last_date')
+    if watermark and not full:
+        first = max(first, _to_date(watermark))
+
+    rows_written = 0
+    month = _month_start(first)
+    while month <= last:
+        frame = _read_month(engine, table_name, month)
+        for sku_id, sku_frame in frame.groupby('sku_id', sort=False, observed=True):
+            _write_partition(root, table_name, sku_id, month, sku_frame)
+        rows_written += len(frame)
+        month = _next_month(month)
+
+    state[table_name] = {
+        'last_date': last.isoformat(),
+        'synced_at': datetime.now().isoformat(timespec='seconds'),
+    }
+    _save_state(root, state)
+    logger.info(f"Synced {rows_written} {table_name} rows up to {last}")
+    return rows_written
+
+
+def sync_history_store(engine, root=None, tables=None, full=False):
+    """Sync every history table (or the given subset) into the store."""
+    return {
+        table_name: sync_table(engine, table_name, root=root, full=full)
+        for table_name in (tables or HISTORY_TABLES)
+    }
+
+
+def open_dataset(table_name, root=None):
+    """Open a partitioned history table with memory-mapped file access."""
+    path = os.path.join(get_store_root(root), table_name)
+    return ds.dataset(
+        path,
+        format='parquet',
+        partitioning=PARTITIONING,
+        filesystem=fs.LocalFileSystem(use_mmap=True),
+    )
+
+
+def load_history(table_name, sku_ids=None, start_date=None, end_date=None, columns=None, root=None):
+    """Load a window of history as a DataFrame.
+
+    Only the requested ``columns`` are read, and SKU/month filters prune whole
+    partitions before any file is opened.
+    """
+    if not os.path.isdir(os.path.join(get_store_root(root), table_name)):
+        return pd.DataFrame(columns=columns or HISTORY_TABLES[table_name])
+
+    dataset = open_dataset(table_name, root)
+
+    expr = None
+    filters = []
+    if sku_ids is not None:
+        filters.append(ds.field('sku_id').isin(list(sku_ids)))
+    if start_date is not None:
+        filters.append(ds.field('month') >= f'{start_date:%Y-%m}')
+        filters.append(ds.field('date') >= pa.scalar(start_date, pa.date32()))
+    if end_date is not None:
+        filters.append(ds.field('month') <= f'{end_date:%Y-%m}')
+        filters.append(ds.field('date') <= pa.scalar(end_date, pa.date32()))
+    for condition in filters:
+        expr = condition if expr is None else expr & condition
+
+    table = dataset.to_table(columns=columns, filter=expr)
+    return table.to_pandas()
+
+
+def load_training_frame(sku_id, days=None, end_date=None, root=None):
+    """Daily demand for one SKU, shaped for ``forecast_with_features``.
+
+    Returns a DataFrame with ``date`` and ``demand`` columns covering the last
+    ``days`` days (``Config.TRAINING_DATA_DAYS`` by default), with missing days
+    filled with zero demand.
+    """
+    days = days or Config.TRAINING_DATA_DAYS
+    end_date = end_date or date.today()
+    start_date = end_date - timedelta(days=days - 1)
+
+    sales = load_history('sales', [sku_id], start_date, end_date,
+                         columns=['date', 'quantity_sold'], root=root)
+    daily = sales.groupby('date')['quantity_sold'].sum()
+    daily.index = pd.to_datetime(daily.index)
+    daily = daily.reindex(pd.date_range(start_date, end_date, freq='D'), fill_value=0)
+
+    return pd.DataFrame({'date': daily.index, 'demand': daily.values})
+
+
+def main():
+    """Main function to handle command line arguments."""
+    parser = argparse.ArgumentParser(description='Flavi Dairy sales history store (Parquet)')
+    parser.add_argument('--table', choices=sorted(HISTORY_TABLES), action='append',
+                        help='Table to sync (default: all)')
+    parser.add_argument('--full', action='store_true', help='Rebuild every partition from scratch')
+    parser.add_argument('--root', help='Store directory (default: HISTORY_STORE_PATH)')
+
+    args = parser.parse_args()
+
+    from app import create_app, db
+
+    app = create_app()
+    with app.app_context():
+        print("📦 Syncing sales history store")
+        print("=" * 50)
+        try:
+            results = sync_history_store(db.engine, root=args.root, tables=args.table, full=args.full)
+        except Exception as e:
+            print(f"❌ Error syncing history store: {e}")
+            sys.exit(1)
+
+        for table_name, rows in results.items():
+            print(f"✅ {table_name}: {rows} rows written")
+        print(f"📁 Store: {get_store_root(args.root)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Production Server for Flavi Dairy Forecasting AI
+Runs the app under gunicorn with the settings in ``gunicorn.conf.py``:
+the app is preloaded once in the master so imported libraries, forecasting
+code and calendar features are shared copy-on-write by every worker, and
+each worker warms its own caches and database connection before it accepts
+traffic.
+
+Usage:
+    python serve.py                                  # 2 x CPU + 1 sync workers on 0.0.0.0:8000
+    python serve.py --workers 4 --worker-class gthread --threads 8
+    python serve.py --max-requests 2000 --max-requests-jitter 200
+
+Settings can also come from the environment (``GUNICORN_BIND``,
+``WEB_CONCURRENCY``, ``GUNICORN_WORKER_CLASS``, ``GUNICORN_THREADS``, ...),
+or run gunicorn directly: ``gunicorn -c gunicorn.conf.py run:app``.
+gunicorn does not run on Windows; there ``serve.py`` falls back to the
+threaded Werkzeug server without the debugger.
+"""
+
+import os
+import gc
+import sys
+import time
+import argparse
+import importlib
+import logging
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+APP_MODULE = 'run:app'
+PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+CONFIG_FILE = os.path.join(PROJECT_ROOT, 'gunicorn.conf.py')
+
+# Imported in the master so their code and module-level data are shared by all workers
+SHARED_MODULES = [
+    'numpy',
+    'pandas',
+    'app.forecasting.advanced_forecasting',
+]
+
+# Requested through the test client in every worker before it accepts traffic
+WARMUP_PATHS = ['/', '/login']
+
+
+def warm_up_shared(app):
+    """Load everything workers can share, in the master before forking.
+
+    Imports the heavy modules and the latest registered forecast models,
+    then closes pooled database connections (a socket must never be shared
+    between processes) and moves the surviving
+    objects out of the garbage collector's reach so workers do not touch
+    (and copy) their pages.
+    """
+    start = time.perf_counter()
+    for module_name in SHARED_MODULES:
+        try:
+            importlib.import_module(module_name)
+        except ImportError as e:
+            logger.warning(f"Warm-up: cannot import {module_name}: {e}")
+
+    try:
+        from model_registry import get_registry
+
+        loaded = get_registry().preload()
+        logger.info(f"Warm-up: preloaded {loaded} forecast models")
+    except Exception as e:
+        logger.warning(f"Warm-up: cannot preload forecast models: {e}")
+
+    engine = _engine(app)
+    if engine is not None:
+        engine.dispose()
+    gc.collect()
+    gc.freeze()
+    logger.info(f"Shared warm-up done in {time.perf_counter() - start:.2f}s")
+
+
+def after_fork(app):
+    """Drop pool connections inherited from the master without closing them."""
+    engine = _engine(app)
+    if engine is not None:
+        engine.dispose(close=False)
+
+
+def warm_up_worker(app):
+    """Open a database connection, fill caches and run first requests in one worker."""
+    start = time.perf_counter()
+    with app.app_context():
+        try:
+            from sqlalchemy import text
+
+            with _engine(app).connect() as conn:
+                conn.execute(text('SELECT 1'))
+        except Exception as e:
+            logger.warning(f"Warm-up: database not reachable: {e}")
+
+        try:
+            from dashboard_metrics import get_dashboard_metrics
+
+            get_dashboard_metrics()
+        except Exception as e:
+            logger.warning(f"Warm-up: dashboard metrics not primed: {e}")
+
+    client = app.test_client()
+    for path in WARMUP_PATHS:
+        try:
+            client.get(path)
+        except Exception as e:
+            logger.warning(f"Warm-up: GET {path} failed: {e}")
+    logger.info(f"Worker {os.getpid()} warmed up in {time.perf_counter() - start:.2f}s")
+
+
+def _engine(app):
+    sqlalchemy = getattr(app, 'extensions', {}).get('sqlalchemy')
+    if sqlalchemy is None:
+        return None
+    with app.app_context():
+        return sqlalchemy.engine
+
+
+def gunicorn_command(args):
+    """The gunicorn command line for ``args``; unset options fall back to gunicorn.conf.py."""
+    command = [sys.executable, '-m', 'gunicorn', '--config', CONFIG_FILE, '--chdir', PROJECT_ROOT]
+    options = {
+        '--bind': args.bind,
+        '--workers': args.workers,
+        '--worker-class': args.worker_class,
+        '--threads': args.threads,
+        '--max-requests': args.max_requests,
+        '--max-requests-jitter': args.max_requests_jitter,
+        '--timeout': args.timeout,
+    }
+    for option, value in options.items():
+        if value is not None:
+            command += [option, str(value)]
+    if args.no_preload:
+        # Config files cannot be overridden back to False from the command line
+        os.environ['GUNICORN_PRELOAD'] = '0'
+    command.append(args.app)
+    return command
+
+
+def main():
+    """Main function to handle command line arguments."""
+    parser = argparse.ArgumentParser(description='Flavi Dairy production server (gunicorn)')
+    parser.add_argument('--bind', help='Address to listen on (default: 0.0.0.0:8000)')
+    parser.add_argument('--workers', type=int, help='Worker processes (default: 2 x CPU + 1)')
+    parser.add_argument('--worker-class', choices=['sync', 'gthread', 'gevent'], help='Worker type')
+    parser.add_argument('--threads', type=int, help='Threads per worker (gthread)')
+    parser.add_argument('--max-requests', type=int, help='Restart a worker after this many requests')
+    parser.add_argument('--max-requests-jitter', type=int, help='Random extra requests before a restart')
+    parser.add_argument('--timeout', type=int, help='Worker timeout in seconds')
+    parser.add_argument('--no-preload', action='store_true', help='Load the app in each worker instead')
+    parser.add_argument('--app', default=APP_MODULE, help=f'WSGI app (default: {APP_MODULE})')
+
+    args = parser.parse_args()
+
+    print("🚀 Flavi Dairy Production Server")
+    print("=" * 50)
+
+    if os.name == 'nt':
+        print("⚠️  gunicorn is not available on Windows; using the threaded development server")
+        module_name, app_name = args.app.split(':')
+        app = getattr(importlib.import_module(module_name), app_name)
+        warm_up_worker(app)
+        host, _, port = (args.bind or '127.0.0.1:5000').rpartition(':')
+        app.run(host=host or '127.0.0.1', port=int(port), debug=False, threaded=True)
+        return
+
+    command = gunicorn_command(args)
+    print(f"▶️  {' '.join(command[1:])}")
+    os.execv(sys.executable, command)
+
+
+if __name__ == '__main__':
+    main()
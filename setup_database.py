@@ -18,6 +18,8 @@ from app.models.customer import Customer
 from app.models.sku import SKU
 from app.models.sales import Sales
 from app.models.inventory import Inventory
+from password_hashing import hash_passwords_parallel
+from inventory_ledger import seed_sample_inventory
 
 def setup_database(force=False, seed_data=True):
     """Set up the database with tables and optional sample data."""
@@ -74,15 +76,20 @@ def add_sample_data():
         }
     ]
     
-    for admin_data in admin_users:
-        if not User.query.filter_by(username=admin_data['username']).first():
-            admin = User(
-                username=admin_data['username'],
-                email=admin_data['email'],
-                role=admin_data['role']
-            )
-            admin.set_password(admin_data['password'])
-            db.session.add(admin)
+    # Hash the passwords of the missing admins in parallel
+    new_admins = [
+        admin_data for admin_data in admin_users
+        if not User.query.filter_by(username=admin_data['username']).first()
+    ]
+    password_hashes = hash_passwords_parallel([admin_data['password'] for admin_data in new_admins])
+    for admin_data, password_hash in zip(new_admins, password_hashes):
+        admin = User(
+            username=admin_data['username'],
+            email=admin_data['email'],
+            role=admin_data['role']
+        )
+        admin.password_hash = password_hash
+        db.session.add(admin)
     
     print("👥 Admin users created")
     
@@ -179,24 +186,16 @@ def add_sample_inventory_and_sales():
     import random
     from datetime import timedelta
     
-    # Create inventory records for the last 30 days
-    for sku in SKU.query.all():
-        for i in range(30):
-            date = datetime.now().date() - timedelta(days=i)
-            
-            # Generate realistic inventory levels
-            base_level = random.uniform(50, 200)
-            current_level = max(0, base_level + random.uniform(-20, 20))
-            
-            inventory = Inventory(
-                sku_id=sku.sku_id,
-                current_level=current_level,
-                production_batch_size=random.uniform(100, 500),
-                shelf_life_days=random.randint(7, 30),
-                storage_capacity_units=random.uniform(500, 1000),
-                date=date
-            )
-            db.session.add(inventory)
+    # Inventory history for the last 30 days goes into the movement ledger;
+    # the inventory table only keeps the current row per SKU
+    today = datetime.now().date()
+    current_stock = seed_sample_inventory(
+        db.session.connection(), [sku.sku_id for sku in SKU.query.all()],
+        today - timedelta(days=29), today
+    )
+    for sku_id, current in current_stock.items():
+        inventory = Inventory(sku_id=sku_id, date=today, **current)
+        db.session.add(inventory)
     
     # Create sales records for the last 90 days
     customers = Customer.query.all()
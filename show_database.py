@@ -3,17 +3,25 @@
 Simple database viewer for Flavi Dairy Forecasting AI
 """
 
-import sqlite3
 import os
+import sys
+import argparse
 from datetime import datetime
 
-def show_database():
+# Add the project root to the Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from db_access import fetch_all, format_records, format_size, quote_identifier, table_columns, table_overview
+
+def show_database(exact=False):
     db_path = 'instance/app.db'
     
     if not os.path.exists(db_path):
         print(f"❌ Database file not found: {db_path}")
         return
     
+    database_url = f'sqlite:///{db_path}'
+    
     # Get file size
     file_size = os.path.getsize(db_path)
     file_size_mb = file_size / (1024 * 1024)
@@ -23,41 +31,33 @@ def show_database():
     print("=" * 60)
     
     try:
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-        
-        # Get all tables
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")
-        tables = cursor.fetchall()
+        # Get all tables with their record counts (estimates unless exact)
+        tables = table_overview(database_url, exact=exact)
+        counts = {table['table_name']: format_records(table) for table in tables}
         
         print(f"📋 Found {len(tables)} tables:")
         print()
         
         for table in tables:
-            table_name = table[0]
+            table_name = table['table_name']
             print(f"🔹 Table: {table_name}")
             
             # Get table info
-            cursor.execute(f"PRAGMA table_info({table_name});")
-            columns = cursor.fetchall()
+            columns = table_columns(table_name, database_url)
             
             print(f"   Columns: {len(columns)}")
             for col in columns:
-                col_name, col_type = col[1], col[2]
-                print(f"     - {col_name} ({col_type})")
+                print(f"     - {col['column_name']} ({col['data_type']})")
             
-            # Get record count
-            cursor.execute(f"SELECT COUNT(*) FROM {table_name};")
-            count = cursor.fetchone()[0]
-            print(f"   Records: {count}")
+            print(f"   Records: {format_records(table)}")
+            print(f"   Size: {format_size(table['table_bytes'])} (indexes {format_size(table['index_bytes'])})")
             
             # Show sample data
-            if count > 0:
-                cursor.execute(f"SELECT * FROM {table_name} LIMIT 3;")
-                sample_data = cursor.fetchall()
+            if table['records']:
+                sample_data = fetch_all(f"SELECT * FROM {quote_identifier(table_name)} LIMIT 3;", database_url=database_url)
                 print(f"   Sample data:")
                 for i, row in enumerate(sample_data, 1):
-                    print(f"     {i}. {row}")
+                    print(f"     {i}. {tuple(row.values())}")
             
             print()
         
@@ -65,40 +65,19 @@ def show_database():
         print("📊 Detailed Data Summary:")
         print("-" * 40)
         
-        # Users
-        cursor.execute("SELECT COUNT(*) FROM user;")
-        user_count = cursor.fetchone()[0]
-        print(f"👥 Users: {user_count}")
-        
-        # Customers
-        cursor.execute("SELECT COUNT(*) FROM customer;")
-        customer_count = cursor.fetchone()[0]
-        print(f"👤 Customers: {customer_count}")
-        
-        # SKUs
-        cursor.execute("SELECT COUNT(*) FROM sku;")
-        sku_count = cursor.fetchone()[0]
-        print(f"📦 SKUs: {sku_count}")
-        
-        # Orders
-        cursor.execute("SELECT COUNT(*) FROM 'order';")
-        order_count = cursor.fetchone()[0]
-        print(f"📋 Orders: {order_count}")
-        
-        # Sales
-        cursor.execute("SELECT COUNT(*) FROM sales;")
-        sales_count = cursor.fetchone()[0]
-        print(f"💰 Sales Records: {sales_count}")
-        
-        # Inventory
-        cursor.execute("SELECT COUNT(*) FROM inventory;")
-        inventory_count = cursor.fetchone()[0]
-        print(f"📦 Inventory Records: {inventory_count}")
-        
-        conn.close()
+        print(f"👥 Users: {counts.get('user', 0)}")
+        print(f"👤 Customers: {counts.get('customer', 0)}")
+        print(f"📦 SKUs: {counts.get('sku', 0)}")
+        print(f"📋 Orders: {counts.get('order', 0)}")
+        print(f"💰 Sales Records: {counts.get('sales', 0)}")
+        print(f"📦 Inventory Records: {counts.get('inventory', 0)}")
         
     except Exception as e:
         print(f"❌ Error reading database: {str(e)}")
 
 if __name__ == "__main__":
-    show_database() 
\ No newline at end of file
+    parser = argparse.ArgumentParser(description='Simple database viewer')
+    parser.add_argument('--exact', action='store_true', help='Use exact COUNT(*) instead of estimates')
+    args = parser.parse_args()
+    
+    show_database(exact=args.exact) 
\ No newline at end of file
@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Slow Query Log for Flavi Dairy Forecasting AI
+Records SQL statements slower than ``SLOW_QUERY_THRESHOLD_MS`` together with
+their parameters, the route that ran them and an ``EXPLAIN`` plan captured
+in a background thread.
+
+Entries are kept in a bounded in-memory ring buffer and appended as JSON
+lines to a rotating file (``SLOW_QUERY_LOG_PATH``). Plans are only captured
+for read statements; ``EXPLAIN ANALYZE`` (PostgreSQL) is opt-in via
+``SLOW_QUERY_EXPLAIN_ANALYZE=1`` because it runs the query again.
+
+Usage:
+    python slow_query_log.py            # top offenders by total time
+    python slow_query_log.py --top 20 --plans
+"""
+
+import os
+import sys
+import glob
+import json
+import time
+import logging
+import argparse
+import threading
+from collections import deque
+from datetime import datetime
+from logging.handlers import RotatingFileHandler
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import has_request_context, request
+from sqlalchemy import event
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from config import Config
+from cache_utils import TTLCache
+from database_config import pop_start_on_error
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+MAX_PARAMETER_CHARS = 500
+MAX_PENDING_EXPLAINS = 20
+PLAN_CACHE_TTL_SECONDS = 300
+
+_buffer = deque(maxlen=Config.SLOW_QUERY_BUFFER_SIZE)
+_buffer_lock = threading.Lock()
+_plans = TTLCache(ttl_seconds=PLAN_CACHE_TTL_SECONDS, max_entries=256)
+_explain_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix='slow-query-explain')
+_pending = threading.BoundedSemaphore(MAX_PENDING_EXPLAINS)
+_file_logger = logging.getLogger('flavi.slow_queries')
+_settings = {}
+
+
+def _normalize(statement):
+    """Collapse whitespace so the same statement always groups together."""
+    return ' '.join(statement.split())
+
+
+def _current_route():
+    if not has_request_context():
+        return None
+    rule = request.url_rule
+    return f"{request.method} {rule.rule if rule is not None else request.path}"
+
+
+def _explainable(statement):
+    return statement.lstrip().split(None, 1)[0].upper() in ('SELECT', 'WITH')
+
+
+def _explain(engine, statement, parameters):
+    """Return the plan for ``statement`` as text, run on its own connection."""
+    if engine.dialect.name == 'postgresql':
+        prefix = 'EXPLAIN (ANALYZE, BUFFERS) ' if _settings.get('explain_analyze') else 'EXPLAIN '
+    elif engine.dialect.name == 'sqlite':
+        prefix = 'EXPLAIN QUERY PLAN '
+    else:
+        prefix = 'EXPLAIN '
+
+    with engine.connect() as conn:
+        conn.info['slow_query_skip'] = True
+        try:
+            rows = conn.exec_driver_sql(prefix + statement, parameters).fetchall()
+        finally:
+            conn.info.pop('slow_query_skip', None)
+            conn.rollback()
+    return '\n'.join(' '.join(str(value) for value in row) for row in rows)
+
+
+def _finish(engine, entry, parameters):
+    """Attach a plan to ``entry`` (background thread) and write it to the log file."""
+    try:
+        if _explainable(entry['statement']):
+            plan = _plans.get(entry['statement'])
+            if plan is None:
+                plan = _explain(engine, entry['statement'], parameters)
+                _plans.set(entry['statement'], plan)
+            entry['plan'] = plan
+    except Exception as e:
+        entry['plan'] = f"EXPLAIN failed: {e}"
+    finally:
+        _pending.release()
+    _file_logger.info(json.dumps(entry, default=str))
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('slow_query_start', []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get('slow_query_start')
+    if not starts:
+        return
+    duration_ms = (time.perf_counter() - starts.pop()) * 1000
+    if duration_ms < _settings['threshold_ms'] or conn.info.get('slow_query_skip'):
+        return
+
+    entry = {
+        'timestamp': datetime.now().isoformat(timespec='milliseconds'),
+        'duration_ms': round(duration_ms, 2),
+        'statement': _normalize(statement),
+        'parameters': repr(parameters)[:MAX_PARAMETER_CHARS],
+        'route': _current_route(),
+        'plan': None,
+    }
+    with _buffer_lock:
+        _buffer.append(entry)
+
+    # executemany batches have no single plan; a full explain queue drops the plan
+    if not executemany and _pending.acquire(blocking=False):
+        _explain_pool.submit(_finish, conn.engine, entry, parameters)
+    else:
+        _file_logger.info(json.dumps(entry, default=str))
+
+
+def _configure_file_log(log_path):
+    if _file_logger.handlers:
+        return
+    os.makedirs(os.path.dirname(os.path.abspath(log_path)), exist_ok=True)
+    handler = RotatingFileHandler(log_path, maxBytes=10 * 1024 * 1024, backupCount=5, encoding='utf-8')
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    _file_logger.addHandler(handler)
+    _file_logger.setLevel(logging.INFO)
+    _file_logger.propagate = False
+
+
+def install(engine, threshold_ms=None, explain_analyze=None, log_path=None):
+    """Start logging slow statements executed on ``engine``."""
+    _settings['threshold_ms'] = Config.SLOW_QUERY_THRESHOLD_MS if threshold_ms is None else threshold_ms
+    _settings['explain_analyze'] = (Config.SLOW_QUERY_EXPLAIN_ANALYZE if explain_analyze is None
+                                    else explain_analyze)
+    _configure_file_log(log_path or Config.SLOW_QUERY_LOG_PATH)
+
+    if not event.contains(engine, 'before_cursor_execute', _before_cursor_execute):
+        event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(engine, 'after_cursor_execute', _after_cursor_execute)
+        pop_start_on_error(engine, 'slow_query_start')
+    logger.info(f"Slow query log enabled (threshold {_settings['threshold_ms']:.0f} ms)")
+
+
+def init_app(app):
+    """Install the slow query log on the app's engine."""
+    with app.app_context():
+        install(app.extensions['sqlalchemy'].engine)
+
+
+def recent_slow_queries(limit=None):
+    """Most recent slow statements from this process, newest first."""
+    with _buffer_lock:
+        entries = list(_buffer)
+    entries.reverse()
+    return entries[:limit] if limit else entries
+
+
+def load_log_entries(log_path=None):
+    """Read every entry from the log file and its rotated backups."""
+    log_path = log_path or Config.SLOW_QUERY_LOG_PATH
+    entries = []
+    for path in sorted(glob.glob(glob.escape(log_path) + '*')):
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entries.append(json.loads(line))
+                except ValueError:
+                    continue
+    return entries
+
+
+def top_offenders(entries, limit=10):
+    """Group entries by statement and rank them by total time spent."""
+    groups = {}
+    for entry in entries:
+        group = groups.setdefault(entry['statement'], {
+            'statement': entry['statement'],
+            'count': 0,
+            'total_ms': 0.0,
+            'max_ms': 0.0,
+            'routes': set(),
+            'plan': None,
+        })
+        group['count'] += 1
+        group['total_ms'] += entry['duration_ms']
+        if entry.get('route'):
+            group['routes'].add(entry['route'])
+        if entry['duration_ms'] >= group['max_ms']:
+            group['max_ms'] = entry['duration_ms']
+            group['plan'] = entry.get('plan') or group['plan']
+
+    ranked = sorted(groups.values(), key=lambda group: group['total_ms'], reverse=True)[:limit]
+    for group in ranked:
+        group['mean_ms'] = group['total_ms'] / group['count']
+        group['routes'] = sorted(group['routes'])
+    return ranked
+
+
+def show_top_offenders(limit=10, log_path=None, show_plans=False):
+    """Print the slowest statements by total time."""
+    entries = load_log_entries(log_path)
+
+    print("🐢 Slow Query Report")
+    print("=" * 60)
+    if not entries:
+        print(f"No slow queries logged in {log_path or Config.SLOW_QUERY_LOG_PATH}")
+        return
+
+    print(f"Slow statements logged: {len(entries)}")
+    for rank, group in enumerate(top_offenders(entries, limit), 1):
+        print(f"\n{rank}. total {group['total_ms']:.0f} ms | {group['count']} calls | "
+              f"mean {group['mean_ms']:.1f} ms | max {group['max_ms']:.1f} ms")
+        print(f"   Routes: {', '.join(group['routes']) or '(none)'}")
+        print(f"   SQL: {group['statement'][:300]}")
+        if show_plans and group['plan']:
+            print("   Plan:")
+            for line in group['plan'].splitlines():
+                print(f"     {line}")
+
+
+def main():
+    """Main function to handle command line arguments."""
+    parser = argparse.ArgumentParser(description='Flavi Dairy slow query report')
+    parser.add_argument('--top', type=int, default=10, help='Number of statements to show')
+    parser.add_argument('--log', help=f'Slow query log file (default: {Config.SLOW_QUERY_LOG_PATH})')
+    parser.add_argument('--plans', action='store_true', help='Show the EXPLAIN plan of each statement')
+
+    args = parser.parse_args()
+    show_top_offenders(args.top, args.log, args.plans)
+
+
+if __name__ == '__main__':
+    main()
@@ -12,7 +12,8 @@ def initialize_database():
 
 def run_app():
     print("Starting Flask application...")
-    subprocess.call([sys.executable, "run.py"])
+    # Production server (gunicorn, preloaded app); see serve.py for tuning options
+    subprocess.call([sys.executable, "serve.py", "--bind", "127.0.0.1:5000"])
 
 if __name__ == "__main__":
     install_requirements()
@@ -0,0 +1,415 @@
+#!/usr/bin/env python3
+"""
+Table Partitioning for Flavi Dairy Forecasting AI
+Monthly range partitioning of the ``sales`` and ``order`` tables on
+PostgreSQL, with cold archival of old months to compressed Parquet.
+
+- ``convert_table`` turns an existing table into a table partitioned by
+  month on ``sales.date`` / ``order.created_at`` (one-time, in a single
+  transaction), with a partition for every month that has rows. The primary
+  key becomes ``(id, <date column>)``.
+- ``ensure_partitions`` creates the partitions for the coming months; it runs
+  on app start-up and should also run from a daily job.
+- Rows outside every monthly range (e.g. far-future dates, or a month whose
+  partition was not created in time) land in the ``<table>_default``
+  partition instead of failing. Creating a month's partition later moves its
+  rows out of the default partition.
+- ``archive_partitions`` writes every month older than the retention window
+  to ``<ARCHIVE_STORE_PATH>/<table>/month=<YYYY-MM>/data.parquet`` (zstd),
+  checks the row count, then detaches and drops the partition.
+
+Queries that filter on the date column only scan the matching months
+(partition pruning), so keep a date range in the WHERE clause of reports.
+
+Usage:
+    python table_partitioning.py --convert sales --convert order
+    python table_partitioning.py --ensure
+    python table_partitioning.py --archive --retention-months 24 --dry-run
+"""
+
+import os
+import re
+import sys
+import argparse
+import logging
+from datetime import date, datetime
+
+from sqlalchemy import text
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from config import Config
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Partitioned table -> partition key column
+PARTITIONED_TABLES = {
+    'sales': 'date',
+    'order': 'created_at',
+}
+
+PARQUET_COMPRESSION = 'zstd'
+
+_BOUND = re.compile(r"FROM \('(\d{4}-\d{2}-\d{2})[^']*'\) TO \('(\d{4}-\d{2}-\d{2})[^']*'\)")
+
+PARTITIONS_SQL = """
+    SELECT c.relname, pg_get_expr(c.relpartbound, c.oid) AS bound
+      FROM pg_inherits i
+      JOIN pg_class c ON c.oid = i.inhrelid
+     WHERE i.inhparent = CAST(:parent AS regclass)
+     ORDER BY c.relname
+"""
+
+
+def _month_start(value):
+    """First day of the month containing ``value``."""
+    return date(value.year, value.month, 1)
+
+
+def _add_months(value, months):
+    """First day of the month ``months`` after the month of ``value``."""
+    index = value.year * 12 + value.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _quote(engine, name):
+    return engine.dialect.identifier_preparer.quote(name)
+
+
+def partition_name(table_name, month):
+    """Name of the partition holding ``month``, e.g. ``sales_p2025_01``."""
+    return f'{table_name}_p{month:%Y_%m}'
+
+
+def _require_postgresql(engine):
+    if engine.dialect.name != 'postgresql':
+        raise RuntimeError('Table partitioning requires PostgreSQL')
+
+
+def is_partitioned(conn, table_name):
+    """True if ``table_name`` is already a partitioned table."""
+    return conn.execute(text(
+        "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table p JOIN pg_class c ON c.oid = p.partrelid "
+        "WHERE c.relname = :name AND c.relnamespace = CAST(current_schema() AS regnamespace))"
+    ), {'name': table_name}).scalar()
+
+
+def list_partitions(conn, table_name):
+    """Partitions of ``table_name`` as ``[(name, first_day, next_month_first_day)]``."""
+    quoted = _quote(conn.engine, table_name)
+    partitions = []
+    for name, bound in conn.execute(text(PARTITIONS_SQL), {'parent': quoted}):
+        match = _BOUND.search(bound or '')
+        if match:
+            partitions.append((name, date.fromisoformat(match.group(1)), date.fromisoformat(match.group(2))))
+    return partitions
+
+
+def default_partition_name(table_name):
+    """Name of the DEFAULT partition catching rows outside every month, e.g. ``sales_default``."""
+    return f'{table_name}_default'
+
+
+def _exists(conn, name):
+    return conn.execute(text("SELECT to_regclass(:name) IS NOT NULL"), {'name': _quote(conn.engine, name)}).scalar()
+
+
+def _create_default_partition(conn, table_name):
+    """Create the DEFAULT partition of ``table_name`` if it does not exist yet."""
+    quote = conn.engine.dialect.identifier_preparer.quote
+    conn.execute(text(
+        f"CREATE TABLE IF NOT EXISTS {quote(default_partition_name(table_name))} "
+        f"PARTITION OF {quote(table_name)} DEFAULT"
+    ))
+
+
+def _create_partition(conn, table_name, month):
+    """Create the partition for ``month`` if it does not exist yet.
+
+    PostgreSQL refuses a new partition while the DEFAULT partition holds rows
+    in its range, so those rows are moved: the default partition is detached,
+    the month created, its rows moved across and the default reattached.
+    """
+    name = partition_name(table_name, month)
+    if _exists(conn, name):
+        return
+    quote = conn.engine.dialect.identifier_preparer.quote
+    table, default = quote(table_name), quote(default_partition_name(table_name))
+    column = quote(PARTITIONED_TABLES[table_name])
+    start, end = month.isoformat(), _add_months(month, 1).isoformat()
+    in_month = f"{column} >= '{start}' AND {column} < '{end}'"
+
+    stray = _exists(conn, default_partition_name(table_name)) and \
+        conn.execute(text(f"SELECT EXISTS (SELECT 1 FROM {default} WHERE {in_month})")).scalar()
+    if stray:
+        conn.execute(text(f"ALTER TABLE {table} DETACH PARTITION {default}"))
+    conn.execute(text(f"CREATE TABLE {quote(name)} PARTITION OF {table} FOR VALUES FROM ('{start}') TO ('{end}')"))
+    if stray:
+        moved = conn.execute(text(
+            f"WITH moved AS (DELETE FROM {default} WHERE {in_month} RETURNING *) "
+            f"INSERT INTO {quote(name)} OVERRIDING SYSTEM VALUE SELECT * FROM moved"
+        )).rowcount
+        conn.execute(text(f"ALTER TABLE {table} ATTACH PARTITION {default} DEFAULT"))
+        logger.info(f"Moved {moved} rows of {month:%Y-%m} from {default_partition_name(table_name)} to {name}")
+
+
+def ensure_partitions(engine, months_ahead=None, tables=None):
+    """Create partitions from the current month to ``months_ahead`` months out.
+
+    Also creates the DEFAULT partition if it is missing. Tables that are not
+    partitioned yet are skipped. Returns the number of monthly partitions
+    checked per table.
+    """
+    _require_postgresql(engine)
+    months_ahead = Config.PARTITION_MONTHS_AHEAD if months_ahead is None else months_ahead
+    this_month = _month_start(datetime.now().date())
+    checked = {}
+    with engine.begin() as conn:
+        for table_name in tables or PARTITIONED_TABLES:
+            if not is_partitioned(conn, table_name):
+                continue
+            _create_default_partition(conn, table_name)
+            for offset in range(months_ahead + 1):
+                _create_partition(conn, table_name, _add_months(this_month, offset))
+            checked[table_name] = months_ahead + 1
+    return checked
+
+
+def convert_table(engine, table_name, months_ahead=None):
+    """Convert a plain table into a monthly range-partitioned table.
+
+    The table is renamed, recreated with the same columns, defaults, CHECK
+    constraints, foreign keys and indexes and ``PARTITION BY RANGE (<date
+    column>)``, refilled and the old copy dropped, all in one transaction. Every month with existing rows gets
+    a partition, as do the current month and ``months_ahead`` months after
+    it, plus the DEFAULT partition. Foreign keys pointing at the table
+    are not supported by the conversion (they must include the partition key)
+    and abort it.
+    """
+    _require_postgresql(engine)
+    months_ahead = Config.PARTITION_MONTHS_AHEAD if months_ahead is None else months_ahead
+    column = PARTITIONED_TABLES[table_name]
+    quote = engine.dialect.identifier_preparer.quote
+    table, old_name = quote(table_name), f'{table_name}_unpartitioned'
+    old = quote(old_name)
+
+    with engine.begin() as conn:
+        if is_partitioned(conn, table_name):
+            logger.info(f"{table_name} is already partitioned")
+            return 0
+
+        references = conn.execute(text(
+            "SELECT conname FROM pg_constraint WHERE contype = 'f' AND confrelid = CAST(:table AS regclass)"
+        ), {'table': table}).scalars().all()
+        if references:
+            raise RuntimeError(f"Foreign keys reference {table_name}: {', '.join(references)}")
+
+        # Secondary indexes are recreated on the new parent under their original names
+        indexes = conn.execute(text(
+            "SELECT i.relname, pg_get_indexdef(x.indexrelid) FROM pg_index x "
+            "JOIN pg_class i ON i.oid = x.indexrelid "
+            "WHERE x.indrelid = CAST(:table AS regclass) AND NOT x.indisprimary"
+        ), {'table': table}).all()
+        primary_key = conn.execute(text(
+            "SELECT conname FROM pg_constraint WHERE contype = 'p' AND conrelid = CAST(:table AS regclass)"
+        ), {'table': table}).scalar()
+        identity = conn.execute(text(
+            "SELECT attidentity <> '' FROM pg_attribute WHERE attrelid = CAST(:table AS regclass) AND attname = 'id'"
+        ), {'table': table}).scalar()
+        sequence = conn.execute(text("SELECT pg_get_serial_sequence(:table, 'id')"), {'table': table}).scalar()
+        # LIKE copies no foreign keys; they are re-created on the new parent once it is filled
+        foreign_keys = conn.execute(text(
+            "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+            "WHERE contype = 'f' AND conrelid = CAST(:table AS regclass) ORDER BY conname"
+        ), {'table': table}).all()
+
+        conn.execute(text(f"ALTER TABLE {table} RENAME TO {old}"))
+        if primary_key:
+            conn.execute(text(f"ALTER TABLE {old} RENAME CONSTRAINT {quote(primary_key)} "
+                              f"TO {quote(primary_key + '_unpartitioned')}"))
+        for index_name, _ in indexes:
+            conn.execute(text(f"ALTER INDEX {quote(index_name)} RENAME TO {quote(index_name + '_unpartitioned')}"))
+
+        conn.execute(text(
+            f"CREATE TABLE {table} (LIKE {old} INCLUDING DEFAULTS INCLUDING IDENTITY INCLUDING CONSTRAINTS "
+            f"INCLUDING STORAGE INCLUDING COMMENTS) PARTITION BY RANGE ({quote(column)})"
+        ))
+        conn.execute(text(f"ALTER TABLE {table} ADD PRIMARY KEY (id, {quote(column)})"))
+        for _, definition in indexes:
+            conn.execute(text(definition))
+
+        months = {_month_start(value) for value in conn.execute(text(
+            f"SELECT DISTINCT CAST(date_trunc('month', {quote(column)}) AS date) FROM {old} "
+            f"WHERE {quote(column)} IS NOT NULL"
+        )).scalars()}
+        this_month = _month_start(datetime.now().date())
+        months.update(_add_months(this_month, offset) for offset in range(months_ahead + 1))
+        for month in sorted(months):
+            _create_partition(conn, table_name, month)
+        _create_default_partition(conn, table_name)
+
+        overriding = 'OVERRIDING SYSTEM VALUE ' if identity else ''
+        rows = conn.execute(text(f"INSERT INTO {table} {overriding}SELECT * FROM {old}")).rowcount
+        if identity:
+            # LIKE ... INCLUDING IDENTITY gave the new table its own sequence
+            sequence = conn.execute(text("SELECT pg_get_serial_sequence(:table, 'id')"), {'table': table}).scalar()
+        elif sequence:
+            # Keep the serial sequence alive when the old table is dropped
+            conn.execute(text(f"ALTER SEQUENCE {sequence} OWNED BY {table}.id"))
+        if sequence:
+            conn.execute(text(f"SELECT setval('{sequence}', COALESCE((SELECT MAX(id) FROM {table}), 0) + 1, false)"))
+        for name, definition in foreign_keys:
+            conn.execute(text(f"ALTER TABLE {table} ADD CONSTRAINT {quote(name)} {definition}"))
+        conn.execute(text(f"DROP TABLE {old}"))
+
+    logger.info(f"Partitioned {table_name} by month on {column}: {rows} rows")
+    return rows
+
+
+def archive_path(table_name, month, root=None):
+    """Parquet file holding one archived month."""
+    root = root or Config.ARCHIVE_STORE_PATH
+    return os.path.join(root, table_name, f'month={month:%Y-%m}', 'data.parquet')
+
+
+def _write_archive(frame, path):
+    """Atomically write ``frame`` as zstd Parquet and return the stored row count."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + '.tmp'
+    pq.write_table(pa.Table.from_pandas(frame, preserve_index=False), tmp_path, compression=PARQUET_COMPRESSION)
+    os.replace(tmp_path, path)
+    return pq.ParquetFile(path).metadata.num_rows
+
+
+def archive_partitions(engine, retention_months=None, root=None, tables=None, dry_run=False):
+    """Archive and drop partitions that end before the retention window.
+
+    Keeps the current month plus ``retention_months`` full months in the
+    database. Each older partition is exported, the Parquet row count is
+    checked, and only then is the partition detached and
+    dropped. Returns ``[(table, month, rows)]`` (``rows`` is None on a dry run).
+    """
+    import pandas as pd
+
+    _require_postgresql(engine)
+    retention_months = Config.PARTITION_RETENTION_MONTHS if retention_months is None else retention_months
+    cutoff = _add_months(datetime.now().date(), -retention_months)
+    quote = engine.dialect.identifier_preparer.quote
+
+    archived = []
+    for table_name in tables or PARTITIONED_TABLES:
+        with engine.connect() as conn:
+            if not is_partitioned(conn, table_name):
+                logger.info(f"{table_name} is not partitioned; skipping")
+                continue
+            expired = [(name, start, end) for name, start, end in list_partitions(conn, table_name) if end <= cutoff]
+
+        for name, start, end in expired:
+            if dry_run:
+                archived.append((table_name, start, None))
+                continue
+            # Read the partition itself, untyped, so the archive keeps the exact stored values
+            frame = pd.read_sql_query(text(f"SELECT * FROM {quote(name)} ORDER BY id"), engine)
+            stored = _write_archive(frame, archive_path(table_name, start, root))
+            if stored != len(frame):
+                raise RuntimeError(f"Archive of {name} holds {stored} rows, expected {len(frame)}")
+            with engine.begin() as conn:
+                conn.execute(text(f"ALTER TABLE {quote(table_name)} DETACH PARTITION {quote(name)}"))
+                conn.execute(text(f"DROP TABLE {quote(name)}"))
+            logger.info(f"Archived {name}: {stored} rows")
+            archived.append((table_name, start, stored))
+    return archived
+
+
+def load_archive(table_name, start_date=None, end_date=None, columns=None, root=None):
+    """Read archived months of ``table_name`` back as a DataFrame."""
+    import pandas as pd
+    import pyarrow.dataset as ds
+
+    root = root or Config.ARCHIVE_STORE_PATH
+    path = os.path.join(root, table_name)
+    if not os.path.isdir(path):
+        return pd.DataFrame(columns=columns)
+
+    dataset = ds.dataset(path, format='parquet', partitioning='hive')
+    expr = None
+    if start_date is not None:
+        expr = ds.field('month') >= f'{start_date:%Y-%m}'
+    if end_date is not None:
+        condition = ds.field('month') <= f'{end_date:%Y-%m}'
+        expr = condition if expr is None else expr & condition
+    frame = dataset.to_table(columns=columns, filter=expr).to_pandas()
+    return frame.drop(columns=['month'], errors='ignore')
+
+
+def init_app(app):
+    """Create upcoming partitions at start-up (PostgreSQL only)."""
+    with app.app_context():
+        engine = app.extensions['sqlalchemy'].engine
+        if engine.dialect.name != 'postgresql':
+            return
+        try:
+            ensure_partitions(engine)
+        except Exception as e:
+            logger.warning(f"Could not create upcoming partitions: {e}")
+
+
+def main():
+    """Main function to handle command line arguments."""
+    parser = argparse.ArgumentParser(description='Flavi Dairy monthly partitioning and archival (PostgreSQL)')
+    parser.add_argument('--convert', choices=sorted(PARTITIONED_TABLES), action='append',
+                        help='Convert a table to monthly partitions (one-time)')
+    parser.add_argument('--ensure', action='store_true', help='Create partitions for the coming months')
+    parser.add_argument('--months-ahead', type=int, default=Config.PARTITION_MONTHS_AHEAD,
+                        help='Future months to keep partitions for')
+    parser.add_argument('--archive', action='store_true', help='Archive and drop partitions past retention')
+    parser.add_argument('--retention-months', type=int, default=Config.PARTITION_RETENTION_MONTHS,
+                        help='Full months kept in the database')
+    parser.add_argument('--root', help='Archive directory (default: ARCHIVE_STORE_PATH)')
+    parser.add_argument('--dry-run', action='store_true', help='List partitions that would be archived')
+
+    args = parser.parse_args()
+
+    from app import create_app, db
+
+    app = create_app()
+    with app.app_context():
+        print("🗂️  Table Partitioning")
+        print("=" * 50)
+        try:
+            _require_postgresql(db.engine)
+            for table_name in args.convert or []:
+                rows = convert_table(db.engine, table_name, args.months_ahead)
+                print(f"✅ {table_name} partitioned ({rows} rows moved)")
+            if args.ensure:
+                for table_name, count in ensure_partitions(db.engine, args.months_ahead).items():
+                    print(f"✅ {table_name}: partitions present for the next {count} months")
+            if args.archive:
+                archived = archive_partitions(db.engine, args.retention_months, args.root, dry_run=args.dry_run)
+                for table_name, month, rows in archived:
+                    detail = 'would be archived' if rows is None else f'{rows} rows archived'
+                    print(f"📦 {table_name} {month:%Y-%m}: {detail}")
+                if not archived:
+                    print("✅ Nothing older than the retention window")
+
+            with db.engine.connect() as conn:
+                for table_name in PARTITIONED_TABLES:
+                    if is_partitioned(conn, table_name):
+                        partitions = list_partitions(conn, table_name)
+                        print(f"\n📅 {table_name}: {len(partitions)} partitions"
+                              + (f" ({partitions[0][1]:%Y-%m} to {partitions[-1][1]:%Y-%m})" if partitions else ''))
+                    else:
+                        print(f"\n📅 {table_name}: not partitioned")
+        except Exception as e:
+            print(f"❌ Error: {e}")
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -9,8 +9,8 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from app import create_app, db
 from app.models.customer import Customer
-from app.models.order import Order
 from app.models.sku import SKU
+from customer_order_stats import get_order_counts, get_recent_orders
 
 def test_customer_dashboard():
     """Test the customer dashboard functionality"""
@@ -35,15 +35,15 @@ def test_customer_dashboard():
         # Test 2: Check customer orders
         print("\n2. Checking Customer Orders:")
         test_customer = customers[0]
-        orders = Order.query.filter_by(customer_id=test_customer.id).all()
+        stats = get_order_counts(test_customer.id)
         print(f"   Customer: {test_customer.username}")
-        print(f"   Total Orders: {len(orders)}")
+        print(f"   Total Orders: {stats['total_orders']}")
         
-        # Calculate statistics
-        total_orders = len(orders)
-        completed_orders = len([o for o in orders if o.status == 'completed'])
-        pending_orders = len([o for o in orders if o.status == 'pending'])
-        cancelled_orders = len([o for o in orders if o.status == 'cancelled'])
+        # Statistics come from one GROUP BY status query
+        total_orders = stats['total_orders']
+        completed_orders = stats['completed_orders']
+        pending_orders = stats['pending_orders']
+        cancelled_orders = stats['cancelled_orders']
         
         print(f"   - Completed: {completed_orders}")
         print(f"   - Pending: {pending_orders}")
@@ -72,7 +72,7 @@ def test_customer_dashboard():
             'cancelled_orders': cancelled_orders
         }
         
-        recent_orders = orders[:5]  # Last 5 orders
+        recent_orders = get_recent_orders(test_customer.id)  # Last 5 orders
         
         print(f"   Customer Info: {customer_info}")
         print(f"   Statistics: {stats}")
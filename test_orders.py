@@ -11,6 +11,7 @@ from app import create_app, db
 from app.models.order import Order
 from app.models.customer import Customer
 from app.models.sku import SKU
+from order_listing import list_orders, order_counts_by_customer
 
 def test_orders():
     app = create_app()
@@ -32,18 +33,17 @@ def test_orders():
         # List all orders
         if total_orders > 0:
             print("\n=== All Orders ===")
-            orders = Order.query.all()
+            orders = list_orders(per_page=total_orders)['items']
             for order in orders:
-                customer = Customer.query.get(order.customer_id)
-                sku = SKU.query.filter_by(sku_id=order.sku_id).first()
-                print(f"Order ID: {order.id}, Customer: {customer.username if customer else order.customer_id}, SKU: {sku.name if sku else order.sku_id}, Quantity: {order.quantity}, Status: {order.status}, Date: {order.created_at}")
+                print(f"Order ID: {order['id']}, Customer: {order['customer_username']}, SKU: {order['sku_name']}, Quantity: {order['quantity']}, Status: {order['status']}, Date: {order['created_at']}")
         
         # List all customers
         if total_customers > 0:
             print("\n=== All Customers ===")
             customers = Customer.query.all()
+            order_counts = order_counts_by_customer()
             for customer in customers:
-                customer_orders = Order.query.filter_by(customer_id=customer.id).count()
+                customer_orders = order_counts.get(customer.id, 0)
                 print(f"Customer ID: {customer.id}, Username: {customer.username}, Email: {customer.email}, Orders: {customer_orders}")
 
 if __name__ == "__main__":
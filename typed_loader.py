@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Typed Table Loader for Flavi Dairy Forecasting AI
+Loads database tables straight into typed pandas/NumPy columns without building
+a Python object per row.
+
+- PostgreSQL: streams ``COPY (SELECT ...) TO STDOUT`` through a pipe into the
+  pandas C CSV parser with explicit dtypes.
+- SQLite: reads with ``fetchmany`` into preallocated NumPy arrays.
+"""
+
+import os
+import re
+import threading
+import logging
+
+import numpy as np
+import pandas as pd
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Column kinds per table. Kinds map to the dtypes in KIND_DTYPES below;
+# columns not listed here are loaded as plain Python objects.
+COLUMN_TYPES = {
+    'sales': {
+        'id': 'int',
+        'sku_id': 'category',
+        'customer_id': 'nullable_int',
+        'quantity_sold': 'float32',
+        'amount': 'float64',
+        'date': 'date',
+    },
+    'inventory': {
+        'id': 'int',
+        'sku_id': 'category',
+        'current_level': 'float32',
+        'production_batch_size': 'float32',
+        'shelf_life_days': 'nullable_int',
+        'storage_capacity_units': 'float32',
+        'date': 'date',
+    },
+    'sku': {
+        'id': 'int',
+        'sku_id': 'str',
+        'name': 'str',
+        'category': 'category',
+        'packaging_type': 'category',
+        'unit_of_measure': 'category',
+        'processing_time_hours': 'float32',
+        'packaging_time_hours': 'float32',
+        'storage_requirement_cubic_meters': 'float32',
+        'min_threshold': 'float32',
+    },
+    'order': {
+        'id': 'int',
+        'customer_id': 'int',
+        'sku_id': 'category',
+        'quantity': 'float32',
+        'status': 'category',
+        'created_at': 'datetime',
+    },
+    'inventory_movements': {
+        'id': 'int',
+        'sku_id': 'category',
+        'movement_date': 'date',
+        'movement_type': 'category',
+        # Running sums over long histories: keep full precision
+        'quantity': 'float64',
+    },
+}
+
+# dtype used by the CSV parser on the PostgreSQL path
+KIND_DTYPES = {
+    'int': 'int64',
+    'nullable_int': 'Int64',
+    'float32': 'float32',
+    'float64': 'float64',
+    'category': 'category',
+    'str': 'object',
+}
+
+# NumPy dtype of the preallocated array on the SQLite path
+KIND_ARRAYS = {
+    'int': np.int64,
+    'nullable_int': np.int64,
+    'float32': np.float32,
+    'float64': np.float64,
+    'date': 'datetime64[D]',
+    'datetime': 'datetime64[us]',
+    'str': object,
+}
+
+FETCH_SIZE = 10000
+
+_NAMED_PARAM = re.compile(r'(?<![:\w]):(\w+)')
+
+
+def _column_kinds(table_name, columns):
+    """Return ``(column, kind)`` pairs for the requested columns."""
+    known = COLUMN_TYPES.get(table_name, {})
+    return [(name, known.get(name, 'object')) for name in columns]
+
+
+def _build_select(engine, table_name, columns, where=None, order_by=None):
+    """Build a SELECT using ``:name`` style parameters."""
+    quote = engine.dialect.identifier_preparer.quote
+    sql = f"SELECT {', '.join(quote(c) for c in columns)} FROM {quote(table_name)}"
+    if where:
+        sql += f" WHERE {where}"
+    if order_by:
+        sql += f" ORDER BY {order_by}"
+    return sql
+
+
+def _table_columns(engine, table_name):
+    """List a table's columns from the database catalog."""
+    from sqlalchemy import inspect
+
+    return [col['name'] for col in inspect(engine).get_columns(table_name)]
+
+
+def _load_postgresql(raw_conn, sql, params, kinds):
+    """Stream ``COPY ... TO STDOUT`` through a pipe into ``pd.read_csv``."""
+    with raw_conn.cursor() as cursor:
+        select = cursor.mogrify(_NAMED_PARAM.sub(r'%(\1)s', sql), params or {}).decode()
+
+    read_fd, write_fd = os.pipe()
+    reader = os.fdopen(read_fd, 'rb')
+    writer = os.fdopen(write_fd, 'wb')
+    errors = []
+
+    def produce():
+        try:
+            with raw_conn.cursor() as cursor:
+                cursor.copy_expert(f"COPY ({select}) TO STDOUT WITH (FORMAT csv)", writer)
+        except Exception as e:
+            errors.append(e)
+        finally:
+            writer.close()
+
+    producer = threading.Thread(target=produce, daemon=True)
+    producer.start()
+    try:
+        frame = pd.read_csv(
+            reader,
+            header=None,
+            names=[name for name, _ in kinds],
+            dtype={name: KIND_DTYPES[kind] for name, kind in kinds if kind in KIND_DTYPES},
+            parse_dates=[name for name, kind in kinds if kind in ('date', 'datetime')],
+        )
+    finally:
+        reader.close()
+        producer.join()
+
+    if errors:
+        raise errors[0]
+    return frame
+
+
+def _load_sqlite(raw_conn, sql, params, kinds, fetch_size=FETCH_SIZE):
+    """Read with ``fetchmany`` into preallocated NumPy arrays."""
+    cursor = raw_conn.cursor()
+    try:
+        cursor.execute(f"SELECT COUNT(*) FROM ({sql})", params or {})
+        capacity = max(cursor.fetchone()[0], 1)
+
+        arrays = []
+        masks = []
+        categories = []
+        for _, kind in kinds:
+            if kind == 'category':
+                arrays.append(np.empty(capacity, dtype=np.int32))
+                categories.append({})
+            else:
+                arrays.append(np.empty(capacity, dtype=KIND_ARRAYS.get(kind, object)))
+                categories.append(None)
+            masks.append(np.zeros(capacity, dtype=bool) if kind in ('int', 'nullable_int') else None)
+
+        cursor.execute(sql, params or {})
+        size = 0
+        while True:
+            rows = cursor.fetchmany(fetch_size)
+            if not rows:
+                break
+            end = size + len(rows)
+            if end > capacity:
+                # Rows were inserted between the count and the read
+                capacity = max(end, capacity * 2)
+                arrays = [np.resize(a, capacity) for a in arrays]
+                masks = [None if m is None else np.resize(m, capacity) for m in masks]
+
+            for i, column in enumerate(zip(*rows)):
+                lookup = categories[i]
+                if lookup is not None:
+                    arrays[i][size:end] = [
+                        -1 if value is None else lookup.setdefault(value, len(lookup))
+                        for value in column
+                    ]
+                elif masks[i] is not None:
+                    missing = np.fromiter((value is None for value in column), dtype=bool, count=len(rows))
+                    masks[i][size:end] = missing
+                    arrays[i][size:end] = [0 if value is None else value for value in column]
+                else:
+                    arrays[i][size:end] = column
+            size = end
+    finally:
+        cursor.close()
+
+    data = {}
+    for i, (name, kind) in enumerate(kinds):
+        values = arrays[i][:size]
+        if kind == 'category':
+            data[name] = pd.Categorical.from_codes(values, categories=list(categories[i]))
+        elif kind in ('int', 'nullable_int') and (kind == 'nullable_int' or masks[i][:size].any()):
+            data[name] = pd.arrays.IntegerArray(values, masks[i][:size])
+        elif kind in ('date', 'datetime'):
+            data[name] = values.astype('datetime64[ns]')
+        else:
+            data[name] = values
+    return pd.DataFrame(data)
+
+
+def load_table(engine, table_name, columns=None, where=None, params=None, order_by=None):
+    """Load a table (or a filtered slice of it) into a typed DataFrame.
+
+    ``where`` is a SQL fragment using ``:name`` parameters taken from
+    ``params``. Dates come back as ``datetime64``, code-like text columns as
+    ``category`` and quantities as ``float32`` (see ``COLUMN_TYPES``).
+    """
+    columns = list(columns or _table_columns(engine, table_name))
+    kinds = _column_kinds(table_name, columns)
+    sql = _build_select(engine, table_name, columns, where=where, order_by=order_by)
+
+    if engine.dialect.name not in ('postgresql', 'sqlite'):
+        from sqlalchemy import text
+
+        return pd.read_sql_query(text(sql), engine, params=params)
+
+    raw_conn = engine.raw_connection()
+    try:
+        if engine.dialect.name == 'postgresql':
+            frame = _load_postgresql(raw_conn, sql, params, kinds)
+        else:
+            frame = _load_sqlite(raw_conn, sql, params, kinds)
+    finally:
+        raw_conn.close()
+
+    logger.debug(f"Loaded {len(frame)} rows from {table_name}")
+    return frame
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Cached Flask-Login User Loader for Flavi Dairy Forecasting AI
+Keeps a small in-process TTL/LRU cache of user identity records keyed by
+``(user_type, id)`` so authenticated requests do not query the database just
+to identify the user.
+
+Cached records hold only identity and authorization columns
+(``IDENTITY_COLUMNS``); the password hash is never cached. On a hit the
+``User``/``Customer`` instance is rebuilt and attached to the session without
+a SELECT, so ``isinstance(current_user, Customer)`` checks keep working. Any
+other attribute (e.g. ``password_hash``) is loaded from the database the
+first time it is accessed.
+
+Entries are dropped when the account is committed (profile edit, role or
+password change) and on logout.
+"""
+
+import os
+import sys
+
+from flask import session
+from flask_login import user_logged_out
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy.orm import make_transient_to_detached
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from config import Config
+from cache_utils import TTLCache, invalidate_on_commit
+
+# Columns kept in the cache; whichever of these a model has
+IDENTITY_COLUMNS = ('id', 'username', 'email', 'role', 'is_active', 'full_name')
+
+_cache = TTLCache(ttl_seconds=Config.USER_CACHE_TTL_SECONDS, max_entries=Config.USER_CACHE_MAX_ENTRIES)
+
+
+def _models():
+    """``user_type`` -> model class, as stored in ``session['user_type']``."""
+    from app.models.user import User
+    from app.models.customer import Customer
+
+    return {'admin': User, 'customer': Customer}
+
+
+def _user_type_of(account):
+    """Cache key type for a ``User`` or ``Customer`` instance."""
+    return 'customer' if account.__tablename__ == 'customer' else 'admin'
+
+
+def _snapshot(account):
+    """Identity column values of an account, safe to share between requests."""
+    mapper = sa_inspect(account).mapper
+    return {
+        attr.key: getattr(account, attr.key)
+        for attr in mapper.column_attrs if attr.key in IDENTITY_COLUMNS
+    }
+
+
+def _attach(model, values):
+    """Rebuild a persistent instance from cached values without querying."""
+    from app import db
+
+    account = model(**values)
+    make_transient_to_detached(account)
+    return db.session.merge(account, load=False)
+
+
+def load_user(user_id):
+    """Flask-Login ``user_loader`` backed by the identity cache."""
+    from app import db
+
+    models = _models()
+    user_type = session.get('user_type')
+    # Sessions without a user type fall back to the old lookup order
+    user_types = [user_type] if user_type in models else ['admin', 'customer']
+
+    for user_type in user_types:
+        key = (user_type, int(user_id))
+        values = _cache.get(key)
+        if values is not None:
+            return _attach(models[user_type], values)
+
+        account = db.session.get(models[user_type], int(user_id))
+        if account is not None:
+            _cache.set(key, _snapshot(account))
+            return account
+    return None
+
+
+def invalidate_user(user_type, user_id):
+    """Drop one cached identity, e.g. after an out-of-band account change."""
+    _cache.invalidate((user_type, int(user_id)))
+
+
+def _invalidate_keys(keys):
+    for key in keys:
+        _cache.invalidate(key)
+
+
+def _on_logout(sender, user, **extra):
+    if getattr(user, 'id', None) is not None:
+        invalidate_user(_user_type_of(user), user.id)
+
+
+def init_app(app):
+    """Install the cached loader and its invalidation hooks on ``app``."""
+    app.login_manager.user_loader(load_user)
+    invalidate_on_commit(
+        ('user', 'customer'),
+        _invalidate_keys,
+        key=lambda account: (_user_type_of(account), account.id),
+    )
+    user_logged_out.connect(_on_logout, app)
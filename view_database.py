@@ -7,13 +7,19 @@ This script allows you to view the contents of your database.
 import os
 import sys
 import sqlite3
+import argparse
 from datetime import datetime
 
 # Add the project root to the Python path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-def view_database():
-    """View the database contents."""
+from db_access import format_records, table_overview
+
+def view_database(exact=False):
+    """View the database contents.
+    
+    Record counts are estimates from ``sqlite_stat1`` unless ``exact`` is set.
+    """
     db_path = 'instance/app.db'
     
     if not os.path.exists(db_path):
@@ -28,27 +34,24 @@ def view_database():
         conn = sqlite3.connect(db_path)
         cursor = conn.cursor()
         
-        # Get all tables
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
-        tables = cursor.fetchall()
+        # Get all tables with their record counts (estimates unless exact)
+        overview = table_overview(f'sqlite:///{db_path}', exact=exact)
+        tables = [(table['table_name'],) for table in overview]
         
         print("📋 Tables in database:")
-        for table in tables:
-            table_name = table[0]
+        for table in overview:
+            table_name = table['table_name']
             print(f"  - {table_name}")
             
-            # Get row count for each table
-            cursor.execute(f"SELECT COUNT(*) FROM {table_name}")
-            count = cursor.fetchone()[0]
-            print(f"    Records: {count}")
+            print(f"    Records: {format_records(table)}")
             
             # Show sample data for each table
-            if count > 0:
-                cursor.execute(f"SELECT * FROM {table_name} LIMIT 2")
+            if table['records']:
+                cursor.execute(f'SELECT * FROM "{table_name}" LIMIT 2')
                 sample_data = cursor.fetchall()
                 
                 # Get column names
-                cursor.execute(f"PRAGMA table_info({table_name})")
+                cursor.execute(f'PRAGMA table_info("{table_name}")')
                 columns = [col[1] for col in cursor.fetchall()]
                 
                 print(f"    Columns: {', '.join(columns)}")
@@ -134,4 +137,8 @@ def view_database():
         print(f"❌ Error reading database: {str(e)}")
 
 if __name__ == '__main__':
-    view_database() 
\ No newline at end of file
+    parser = argparse.ArgumentParser(description='Database Viewer')
+    parser.add_argument('--exact', action='store_true', help='Use exact COUNT(*) instead of estimates')
+    args = parser.parse_args()
+    
+    view_database(exact=args.exact) 
\ No newline at end of file
@@ -6,49 +6,33 @@ This script provides different methods to view your PostgreSQL data.
 
 import os
 import sys
-import psycopg2
-from psycopg2.extras import RealDictCursor
-from datetime import datetime
-import pandas as pd
+import argparse
 
 # Add the project root to the Python path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-def view_all_tables():
-    """View all tables and their record counts."""
+from db_access import (fetch_all, fetch_one, format_records, format_size, get_database_url,
+                       quote_identifier, table_columns, table_overview)
+
+def view_all_tables(exact=False):
+    """View all tables with their record counts and sizes.
+    
+    Counts are planner estimates unless ``exact`` is set.
+    """
     print("📋 ALL TABLES OVERVIEW")
     print("=" * 50)
     
     try:
-        from dotenv import load_dotenv
-        load_dotenv()
-        
-        database_url = os.environ.get('DATABASE_URL')
-        if not database_url:
-            print("❌ DATABASE_URL not found in .env file")
-            return
-        
-        conn = psycopg2.connect(database_url)
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-        
-        # Get all tables
-        cursor.execute("""
-            SELECT table_name 
-            FROM information_schema.tables 
-            WHERE table_schema = 'public' 
-            ORDER BY table_name
-        """)
-        tables = cursor.fetchall()
+        tables = table_overview(exact=exact)
         
         print(f"Found {len(tables)} tables in your database:\n")
         
         for table in tables:
-            table_name = table['table_name']
-            cursor.execute(f"SELECT COUNT(*) FROM {table_name}")
-            count = cursor.fetchone()['count']
-            print(f"📊 {table_name}: {count} records")
+            print(f"📊 {table['table_name']}: {format_records(table)} records "
+                  f"(table {format_size(table['table_bytes'])}, indexes {format_size(table['index_bytes'])})")
         
-        conn.close()
+        if not exact:
+            print("\n~ = estimate from database statistics (run with --exact for true counts)")
         
     except Exception as e:
         print(f"❌ Error: {e}")
@@ -59,39 +43,23 @@ def view_table_data(table_name, limit=10):
     print("=" * 50)
     
     try:
-        from dotenv import load_dotenv
-        load_dotenv()
-        
-        database_url = os.environ.get('DATABASE_URL')
-        if not database_url:
-            print("❌ DATABASE_URL not found in .env file")
-            return
-        
-        conn = psycopg2.connect(database_url)
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-        
         # Get table structure
-        cursor.execute(f"""
-            SELECT column_name, data_type 
-            FROM information_schema.columns 
-            WHERE table_name = '{table_name}' 
-            ORDER BY ordinal_position
-        """)
-        columns = cursor.fetchall()
+        columns = table_columns(table_name)
+        if not columns:
+            print(f"❌ Table {table_name} not found")
+            return
         
         print("📋 Table Structure:")
         for col in columns:
             print(f"  - {col['column_name']} ({col['data_type']})")
         
         # Get total count
-        cursor.execute(f"SELECT COUNT(*) FROM {table_name}")
-        total_count = cursor.fetchone()['count']
+        total_count = fetch_one(f"SELECT COUNT(*) AS count FROM {quote_identifier(table_name)}")['count']
         print(f"\n📊 Total Records: {total_count}")
         
         if total_count > 0:
             # Get sample data
-            cursor.execute(f"SELECT * FROM {table_name} LIMIT {limit}")
-            rows = cursor.fetchall()
+            rows = fetch_all(f"SELECT * FROM {quote_identifier(table_name)} LIMIT %s", (limit,))
             
             print(f"\n📋 Sample Data (showing {len(rows)} records):")
             print("-" * 80)
@@ -102,8 +70,6 @@ def view_table_data(table_name, limit=10):
                     print(f"  {key}: {value}")
                 print()
         
-        conn.close()
-        
     except Exception as e:
         print(f"❌ Error viewing table {table_name}: {e}")
 
@@ -113,19 +79,7 @@ def view_users():
     print("=" * 30)
     
     try:
-        from dotenv import load_dotenv
-        load_dotenv()
-        
-        database_url = os.environ.get('DATABASE_URL')
-        if not database_url:
-            print("❌ DATABASE_URL not found in .env file")
-            return
-        
-        conn = psycopg2.connect(database_url)
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-        
-        cursor.execute("SELECT username, email, role FROM \"user\" ORDER BY username")
-        users = cursor.fetchall()
+        users = fetch_all("SELECT username, email, role FROM \"user\" ORDER BY username")
         
         if users:
             print(f"Found {len(users)} users:\n")
@@ -137,8 +91,6 @@ def view_users():
         else:
             print("No users found in the database.")
         
-        conn.close()
-        
     except Exception as e:
         print(f"❌ Error viewing users: {e}")
 
@@ -148,19 +100,7 @@ def view_customers():
     print("=" * 30)
     
     try:
-        from dotenv import load_dotenv
-        load_dotenv()
-        
-        database_url = os.environ.get('DATABASE_URL')
-        if not database_url:
-            print("❌ DATABASE_URL not found in .env file")
-            return
-        
-        conn = psycopg2.connect(database_url)
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-        
-        cursor.execute("SELECT username, email FROM customer ORDER BY username")
-        customers = cursor.fetchall()
+        customers = fetch_all("SELECT username, email FROM customer ORDER BY username")
         
         if customers:
             print(f"Found {len(customers)} customers:\n")
@@ -171,8 +111,6 @@ def view_customers():
         else:
             print("No customers found in the database.")
         
-        conn.close()
-        
     except Exception as e:
         print(f"❌ Error viewing customers: {e}")
 
@@ -182,19 +120,7 @@ def view_skus():
     print("=" * 30)
     
     try:
-        from dotenv import load_dotenv
-        load_dotenv()
-        
-        database_url = os.environ.get('DATABASE_URL')
-        if not database_url:
-            print("❌ DATABASE_URL not found in .env file")
-            return
-        
-        conn = psycopg2.connect(database_url)
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-        
-        cursor.execute("SELECT sku_id, name, category, unit_price FROM sku ORDER BY sku_id")
-        skus = cursor.fetchall()
+        skus = fetch_all("SELECT sku_id, name, category, unit_price FROM sku ORDER BY sku_id")
         
         if skus:
             print(f"Found {len(skus)} SKUs:\n")
@@ -207,8 +133,6 @@ def view_skus():
         else:
             print("No SKUs found in the database.")
         
-        conn.close()
-        
     except Exception as e:
         print(f"❌ Error viewing SKUs: {e}")
 
@@ -218,28 +142,11 @@ def view_recent_sales():
     print("=" * 30)
     
     try:
-        from dotenv import load_dotenv
-        load_dotenv()
-        
-        database_url = os.environ.get('DATABASE_URL')
-        if not database_url:
-            print("❌ DATABASE_URL not found in .env file")
-            return
-        
-        conn = psycopg2.connect(database_url)
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-        
         # Check if amount column exists
-        cursor.execute("""
-            SELECT column_name 
-            FROM information_schema.columns 
-            WHERE table_name = 'sales' 
-            AND column_name = 'amount'
-        """)
-        has_amount = cursor.fetchone() is not None
+        has_amount = any(col['column_name'] == 'amount' for col in table_columns('sales'))
         
         if has_amount:
-            cursor.execute("""
+            sales = fetch_all("""
                 SELECT s.sku_id, sk.name, s.quantity_sold, s.amount, s.date 
                 FROM sales s 
                 LEFT JOIN sku sk ON s.sku_id = sk.sku_id 
@@ -247,7 +154,7 @@ def view_recent_sales():
                 LIMIT 10
             """)
         else:
-            cursor.execute("""
+            sales = fetch_all("""
                 SELECT s.sku_id, sk.name, s.quantity_sold, s.date 
                 FROM sales s 
                 LEFT JOIN sku sk ON s.sku_id = sk.sku_id 
@@ -255,8 +162,6 @@ def view_recent_sales():
                 LIMIT 10
             """)
         
-        sales = cursor.fetchall()
-        
         if sales:
             print(f"Found {len(sales)} recent sales:\n")
             for sale in sales:
@@ -269,8 +174,6 @@ def view_recent_sales():
         else:
             print("No sales found in the database.")
         
-        conn.close()
-        
     except Exception as e:
         print(f"❌ Error viewing sales: {e}")
 
@@ -280,18 +183,7 @@ def view_inventory():
     print("=" * 30)
     
     try:
-        from dotenv import load_dotenv
-        load_dotenv()
-        
-        database_url = os.environ.get('DATABASE_URL')
-        if not database_url:
-            print("❌ DATABASE_URL not found in .env file")
-            return
-        
-        conn = psycopg2.connect(database_url)
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-        
-        cursor.execute("""
+        inventory = fetch_all("""
             SELECT i.sku_id, sk.name, i.current_level, i.date 
             FROM inventory i 
             LEFT JOIN sku sk ON i.sku_id = sk.sku_id 
@@ -299,8 +191,6 @@ def view_inventory():
             LIMIT 10
         """)
         
-        inventory = cursor.fetchall()
-        
         if inventory:
             print(f"Found {len(inventory)} inventory records:\n")
             for inv in inventory:
@@ -311,8 +201,6 @@ def view_inventory():
         else:
             print("No inventory records found in the database.")
         
-        conn.close()
-        
     except Exception as e:
         print(f"❌ Error viewing inventory: {e}")
 
@@ -322,28 +210,32 @@ def export_to_csv(table_name):
     print("=" * 50)
     
     try:
-        from dotenv import load_dotenv
-        load_dotenv()
-        
-        database_url = os.environ.get('DATABASE_URL')
+        database_url = get_database_url()
         if not database_url:
             print("❌ DATABASE_URL not found in .env file")
             return
         
-        # Use pandas to read and export
-        df = pd.read_sql_query(f"SELECT * FROM {table_name}", database_url)
+        # Stream the export in chunks (COPY on PostgreSQL)
+        from sqlalchemy import create_engine
+        from csv_export import export_to_file
         
-        filename = f"{table_name}_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-        df.to_csv(filename, index=False)
+        engine = create_engine(database_url)
+        try:
+            filename, size = export_to_file(engine, table_name)
+        finally:
+            engine.dispose()
         
-        print(f"✅ Exported {len(df)} records to {filename}")
-        print(f"📊 Columns: {', '.join(df.columns.tolist())}")
+        print(f"✅ Exported {table_name} to {filename} ({size / 1024:.1f} KB)")
         
     except Exception as e:
         print(f"❌ Error exporting {table_name}: {e}")
 
 def main():
     """Main function with menu."""
+    parser = argparse.ArgumentParser(description='PostgreSQL Data Viewer')
+    parser.add_argument('--exact', action='store_true', help='Use exact COUNT(*) in the tables overview')
+    args = parser.parse_args()
+    
     print("🗄️  PostgreSQL Data Viewer")
     print("=" * 50)
     print("Choose an option:")
@@ -365,7 +257,7 @@ def main():
             print("👋 Goodbye!")
             break
         elif choice == '1':
-            view_all_tables()
+            view_all_tables(exact=args.exact)
         elif choice == '2':
             view_users()
         elif choice == '3':
@@ -385,7 +277,7 @@ def main():
             table_name = input("Enter table name to export: ").strip()
             export_to_csv(table_name)
         elif choice == '9':
-            view_all_tables()
+            view_all_tables(exact=args.exact)
             view_users()
             view_customers()
             view_skus()
@@ -6,80 +6,60 @@ This script allows you to view the contents of your PostgreSQL database.
 
 import os
 import sys
-import psycopg2
-from psycopg2.extras import RealDictCursor
+import argparse
 from datetime import datetime
 
 # Add the project root to the Python path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-def view_postgresql_database():
-    """View the PostgreSQL database contents."""
+from db_access import (fetch_all, fetch_one, format_records, format_size, get_database_url,
+                       quote_identifier, table_columns, table_overview)
+
+def view_postgresql_database(exact=False):
+    """View the PostgreSQL database contents.
+    
+    Record counts are planner estimates unless ``exact`` is set.
+    """
     print("🗄️  PostgreSQL Database Viewer")
     print("=" * 50)
     
-    # Load environment variables
-    from dotenv import load_dotenv
-    load_dotenv()
-    
-    database_url = os.environ.get('DATABASE_URL')
+    database_url = get_database_url()
     if not database_url:
         print("❌ DATABASE_URL not found in .env file")
         print("Please make sure you have set up PostgreSQL and created a .env file")
         return
     
     try:
-        # Connect to PostgreSQL
-        conn = psycopg2.connect(database_url)
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-        
         # Get database info
-        cursor.execute("SELECT current_database(), current_user, version()")
-        db_info = cursor.fetchone()
+        db_info = fetch_one("SELECT current_database(), current_user, version()")
         
         print(f"🗄️  Database: {db_info['current_database']}")
         print(f"👤 User: {db_info['current_user']}")
         print(f"🐘 PostgreSQL Version: {db_info['version'].split(',')[0]}")
         print("=" * 60)
         
-        # Get all tables
-        cursor.execute("""
-            SELECT table_name 
-            FROM information_schema.tables 
-            WHERE table_schema = 'public' 
-            ORDER BY table_name
-        """)
-        tables = cursor.fetchall()
+        # Get all tables with their row counts and sizes from the catalog
+        tables = table_overview(exact=exact)
         
         print("📋 Tables in database:")
         for table in tables:
             table_name = table['table_name']
             print(f"  - {table_name}")
             
-            # Get row count for each table
-            cursor.execute(f"SELECT COUNT(*) FROM {table_name}")
-            count = cursor.fetchone()['count']
-            print(f"    Records: {count}")
+            print(f"    Records: {format_records(table)}")
             
             # Show sample data for each table
-            if count > 0:
-                cursor.execute(f"SELECT * FROM {table_name} LIMIT 2")
-                sample_data = cursor.fetchall()
+            if table['records']:
+                sample_data = fetch_all(f"SELECT * FROM {quote_identifier(table_name)} LIMIT 2")
                 
                 # Get column names
-                cursor.execute(f"""
-                    SELECT column_name, data_type 
-                    FROM information_schema.columns 
-                    WHERE table_name = '{table_name}' 
-                    ORDER BY ordinal_position
-                """)
-                columns = cursor.fetchall()
+                columns = table_columns(table_name)
                 
                 column_names = [col['column_name'] for col in columns]
                 print(f"    Columns: {', '.join(column_names)}")
                 print("    Sample data:")
                 for row in sample_data:
-                    print(f"      {dict(row)}")
+                    print(f"      {row}")
             print()
         
         # Show detailed information for specific tables
@@ -90,8 +70,7 @@ def view_postgresql_database():
         if any(table['table_name'] == 'user' for table in tables):
             print("\n👥 Users:")
             try:
-                cursor.execute("SELECT username, email, role FROM \"user\" LIMIT 5")
-                users = cursor.fetchall()
+                users = fetch_all("SELECT username, email, role FROM \"user\" LIMIT 5")
                 for user in users:
                     print(f"  {user['username']} ({user['email']}) - {user['role']}")
             except Exception as e:
@@ -101,8 +80,7 @@ def view_postgresql_database():
         if any(table['table_name'] == 'customer' for table in tables):
             print("\n👤 Customers:")
             try:
-                cursor.execute("SELECT username, email FROM customer LIMIT 5")
-                customers = cursor.fetchall()
+                customers = fetch_all("SELECT username, email FROM customer LIMIT 5")
                 for customer in customers:
                     print(f"  {customer['username']} ({customer['email']})")
             except Exception as e:
@@ -112,8 +90,7 @@ def view_postgresql_database():
         if any(table['table_name'] == 'sku' for table in tables):
             print("\n🏷️  SKUs:")
             try:
-                cursor.execute("SELECT sku_id, name, category FROM sku LIMIT 5")
-                skus = cursor.fetchall()
+                skus = fetch_all("SELECT sku_id, name, category FROM sku LIMIT 5")
                 for sku in skus:
                     print(f"  {sku['sku_id']} - {sku['name']} ({sku['category']})")
             except Exception as e:
@@ -124,31 +101,24 @@ def view_postgresql_database():
             print("\n💰 Recent Sales:")
             try:
                 # First check what columns exist in sales table
-                cursor.execute("""
-                    SELECT column_name 
-                    FROM information_schema.columns 
-                    WHERE table_name = 'sales' 
-                    ORDER BY ordinal_position
-                """)
-                sales_columns = [col['column_name'] for col in cursor.fetchall()]
+                sales_columns = [col['column_name'] for col in table_columns('sales')]
                 print(f"  Sales table columns: {sales_columns}")
                 
                 if 'amount' in sales_columns:
-                    cursor.execute("""
+                    sales = fetch_all("""
                         SELECT sku_id, quantity_sold, amount, date 
                         FROM sales 
                         ORDER BY date DESC 
                         LIMIT 5
                     """)
                 else:
-                    cursor.execute("""
+                    sales = fetch_all("""
                         SELECT sku_id, quantity_sold, date 
                         FROM sales 
                         ORDER BY date DESC 
                         LIMIT 5
                     """)
                 
-                sales = cursor.fetchall()
                 for sale in sales:
                     if 'amount' in sale:
                         print(f"  {sale['sku_id']} - Qty: {sale['quantity_sold']}, Amount: ₹{sale['amount']:.2f}, Date: {sale['date']}")
@@ -161,13 +131,12 @@ def view_postgresql_database():
         if any(table['table_name'] == 'inventory' for table in tables):
             print("\n📦 Recent Inventory:")
             try:
-                cursor.execute("""
+                inventory = fetch_all("""
                     SELECT sku_id, current_level, date 
                     FROM inventory 
                     ORDER BY date DESC 
                     LIMIT 5
                 """)
-                inventory = cursor.fetchall()
                 for inv in inventory:
                     print(f"  {inv['sku_id']} - Level: {inv['current_level']:.2f}, Date: {inv['date']}")
             except Exception as e:
@@ -178,20 +147,19 @@ def view_postgresql_database():
         print("-" * 30)
         
         total_tables = len(tables)
-        total_records = 0
+        total_records = sum(table['records'] or 0 for table in tables)
+        total_bytes = sum((table['table_bytes'] or 0) + (table['index_bytes'] or 0) for table in tables)
         
         for table in tables:
-            table_name = table['table_name']
-            cursor.execute(f"SELECT COUNT(*) FROM {table_name}")
-            count = cursor.fetchone()['count']
-            total_records += count
-            print(f"  {table_name}: {count} records")
+            print(f"  {table['table_name']}: {format_records(table)} records, "
+                  f"table {format_size(table['table_bytes'])}, indexes {format_size(table['index_bytes'])}")
         
         print(f"\n📈 Summary:")
         print(f"  Total tables: {total_tables}")
-        print(f"  Total records: {total_records}")
-        
-        conn.close()
+        print(f"  Total records: {'' if exact else '~'}{total_records}")
+        print(f"  Total size: {format_size(total_bytes)}")
+        if not exact:
+            print("  (~ = estimate from database statistics; use --exact for true counts)")
         
     except Exception as e:
         print(f"❌ Error reading PostgreSQL database: {str(e)}")
@@ -202,4 +170,8 @@ def view_postgresql_database():
         print("4. Ensure the user has proper permissions")
 
 if __name__ == '__main__':
-    view_postgresql_database() 
\ No newline at end of file
+    parser = argparse.ArgumentParser(description='PostgreSQL Database Viewer')
+    parser.add_argument('--exact', action='store_true', help='Use exact COUNT(*) instead of estimates')
+    args = parser.parse_args()
+    
+    view_postgresql_database(exact=args.exact) 
\ No newline at end of file